@@ -1,11 +1,112 @@
 import numpy as np
 import random
+import time
+from collections import namedtuple
+from greedy import greedy_assign
+from taskset import TaskSet, Assignment
+
+# Laporan solver yang dilampirkan ke Assignment.search: makespan prediksi (termasuk initial_loads),
+# batas bawah, gap relatif (makespan / batas bawah - 1), jumlah iterasi, waktu, dan alasan berhenti
+# ("converged": gap <= toleransi, "time_budget", "iterations", atau "constructive" untuk rr/fcfs).
+SearchReport = namedtuple('SearchReport', ['algorithm', 'makespan', 'lower_bound', 'gap', 'iterations', 'elapsed',
+                                           'stop_reason'])
+# Pencarian berhenti begitu makespan terbaik berada dalam toleransi ini dari batas bawah.
+DEFAULT_GAP_TOLERANCE = 0.01
+# Laju penyusutan d_max ErWCA saat iterasi tidak dibatasi (iterations=None).
+ERWCA_DMAX_DECAY_ITERATIONS = 100
+# Jumlah VM dengan beban terbesar yang dilacak LoadState; skor perpindahan hanya memakai tiga teratas,
+# sisanya cadangan agar beban VM teratas yang turun jarang memaksa pemindaian ulang semua VM.
+TOP_BUFFER = 8
+
+class LoadState:
+    # State SHC berbasis array: vektor task -> indeks VM dan total beban per VM.
+    # TOP_BUFFER VM dengan beban terbesar disimpan terurut agar skor satu perpindahan O(1); setelah
+    # perpindahan, buffer diperbarui secara inkremental dan pemindaian O(m) hanya dilakukan jika
+    # beban VM di buffer turun di bawah batas atas beban VM di luar buffer.
+    def __init__(self, vm_indices, task_classes, cost_table, base_loads=None):
+        self.assign = vm_indices
+        self.classes = task_classes
+        self.cost_table = cost_table
+        self.num_vms = cost_table.shape[1]
+        self.loads = np.bincount(vm_indices, weights=cost_table[task_classes, vm_indices],
+                                 minlength=self.num_vms).astype(float)
+        # Beban yang sudah ada sebelumnya (mis. jendela task sebelumnya pada mode streaming).
+        if base_loads is not None: self.loads += base_loads
+        self.refreshes = 0
+        self._refresh_top()
+
+    def _refresh_top(self):
+        k = min(TOP_BUFFER, self.num_vms)
+        top = np.argpartition(-self.loads, k - 1)[:k]
+        self._set_top(top[np.argsort(-self.loads[top], kind='stable')])
+        self.refreshes += 1
+
+    def _set_top(self, top):
+        self.top = top; self.top_loads = self.loads[top]
+        self.makespan = self.top_loads[0]
+
+    def _update_top(self, vm, outside_bound) -> bool:
+        # Beban `vm` baru saja berubah; outside_bound = batas atas beban VM di luar buffer sebelum
+        # perubahan. Mengembalikan False jika buffer tidak lagi pasti berisi VM terberat.
+        hit = np.flatnonzero(self.top == vm)
+        load = self.loads[vm]
+        if len(hit) > 0:
+            if len(self.top) < self.num_vms and load < outside_bound: return False
+            top = self.top
+        elif len(self.top) < self.num_vms and load > self.top_loads[-1]:
+            top = self.top.copy(); top[-1] = vm
+        else:
+            return True
+        self._set_top(top[np.argsort(-self.loads[top], kind='stable')])
+        return True
+
+    def move_makespan(self, task, to_vm):
+        from_vm = self.assign[task]
+        if from_vm == to_vm: return self.makespan
+        task_class = self.classes[task]
+        new_from = self.loads[from_vm] - self.cost_table[task_class, from_vm]
+        new_to = self.loads[to_vm] + self.cost_table[task_class, to_vm]
+        other = 0.0
+        for vm, load in zip(self.top, self.top_loads):
+            if vm != from_vm and vm != to_vm:
+                other = load; break
+        return max(new_from, new_to, other)
+
+    def batch_move_makespan(self, tasks, to_vms):
+        from_vms = self.assign[tasks]; task_classes = self.classes[tasks]
+        new_from = self.loads[from_vms] - self.cost_table[task_classes, from_vms]
+        new_to = self.loads[to_vms] + self.cost_table[task_classes, to_vms]
+        other = np.zeros(len(tasks))
+        resolved = np.zeros(len(tasks), dtype=bool)
+        for vm, load in zip(self.top[:3], self.top_loads[:3]):
+            hit = ~resolved & (from_vms != vm) & (to_vms != vm)
+            other[hit] = load; resolved |= hit
+        result = np.maximum(np.maximum(new_from, new_to), other)
+        result[from_vms == to_vms] = self.makespan
+        return result
+
+    def apply(self, task, to_vm):
+        from_vm = self.assign[task]; task_class = self.classes[task]
+        self.loads[from_vm] -= self.cost_table[task_class, from_vm]
+        self.loads[to_vm] += self.cost_table[task_class, to_vm]
+        self.assign[task] = to_vm
+        outside_bound = self.top_loads[-1]
+        if not (self._update_top(from_vm, outside_bound) and self._update_top(to_vm, outside_bound)):
+            self._refresh_top()
 
 class SchedulerAlgorithms:
-    def __init__(self, vms_config):
+    def __init__(self, vms_config, cost_model=None, seed=None):
         self.vms = vms_config
         self.num_vms = len(vms_config)
         self.rr_counter = 0
+        self.vm_cores = np.array([vm.cpu_cores for vm in self.vms])
+        # Semua keacakan solver berasal dari dua generator ini, sehingga seed yang sama
+        # menghasilkan penugasan yang sama (seed=None: acak seperti sebelumnya).
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.py_rng = random.Random(seed)
+        self.cost_model = cost_model
+        self._cost_table = None
 
     def _get_task_load(self, task_index):
         return (task_index ** 2) * 10000
@@ -15,67 +116,260 @@ class SchedulerAlgorithms:
         SCALE_FACTOR = 10000
         return (task_load / SCALE_FACTOR) * (BASE_EXECUTION_TIME / vm_cpu_cores)
 
-    def _calculate_makespan_for_shc(self, assignment, tasks_dict):
-        vm_loads = np.zeros(self.num_vms)
-        vm_map = {vm.name: i for i, vm in enumerate(self.vms)}
-        vm_cores = np.array([vm.cpu_cores for vm in self.vms])
-        for task_id, vm_name in assignment.items():
-            task = tasks_dict[task_id]
-            task_load = self._get_task_load(task.index)
-            vm_index = vm_map[vm_name]
-            exec_time = self._estimate_execution_time(task_load, vm_cores[vm_index])
-            vm_loads[vm_index] += exec_time
-        return np.max(vm_loads)
+    def _class_cost_table(self):
+        # Estimasi waktu eksekusi per (task index 0-10, VM); baris 0 tidak dipakai. Jika ada
+        # cost_model, tabel hasil belajar dari run sebelumnya menggantikan rumus analitik.
+        if self._cost_table is None:
+            task_loads = self._get_task_load(np.arange(11))
+            table = self._estimate_execution_time(task_loads[:, None], self.vm_cores[None, :])
+            if self.cost_model is not None:
+                table = self.cost_model.cost_table(self.vms, table)
+            self._cost_table = table
+        return self._cost_table
+
+    def predicted_makespan(self, assignment: Assignment):
+        return assignment.makespan(self._class_cost_table())
+
+    def makespan_lower_bound(self, tasks, initial_loads=None):
+        # Batas bawah makespan: total kerja (biaya x core, minimum antar VM) dibagi total core,
+        # atau task terbesar di VM tercepatnya, mana yang lebih besar. Dengan initial_loads, kerja
+        # yang sudah ada ikut dihitung dan task terbesar ditambahkan ke beban awal VM-nya.
+        tasks = TaskSet.from_tasks(tasks)
+        base = np.zeros(self.num_vms) if initial_loads is None else np.asarray(initial_loads, dtype=float)
+        if len(tasks) == 0: return float(base.max()) if self.num_vms else 0.0
+        cost_table = self._class_cost_table()
+        counts = tasks.class_counts()
+        present = np.flatnonzero(counts)
+        work = (cost_table[present] * self.vm_cores[None, :]).min(axis=1)
+        total = (counts[present] @ work + base @ self.vm_cores) / self.vm_cores.sum()
+        return float(max(total, (base[None, :] + cost_table[present]).min(axis=1).max(), base.max()))
+
+    def _search_report(self, algorithm, makespan, lower_bound, iterations, started, stop_reason):
+        gap = makespan / lower_bound - 1.0 if lower_bound > 0 else 0.0
+        return SearchReport(algorithm, float(makespan), float(lower_bound), float(gap), int(iterations),
+                            time.monotonic() - started, stop_reason)
+
+    def _constructive_result(self, algorithm, tasks, vm_indices, initial_loads, started):
+        assignment = Assignment(tasks, vm_indices, self.vms)
+        loads = assignment.vm_loads(self._class_cost_table())
+        if initial_loads is not None: loads = loads + np.asarray(initial_loads, dtype=float)
+        makespan = loads.max() if len(loads) else 0.0
+        assignment.search = self._search_report(algorithm, makespan, self.makespan_lower_bound(tasks, initial_loads),
+                                                0, started, "constructive")
+        return assignment
 
     def schedule_round_robin(self, tasks):
-        assignment = {}
-        for task in tasks:
-            vm_name = self.vms[self.rr_counter].name
-            assignment[task.id] = vm_name
-            self.rr_counter = (self.rr_counter + 1) % self.num_vms
+        started = time.monotonic()
+        tasks = TaskSet.from_tasks(tasks)
+        vm_indices = (self.rr_counter + np.arange(len(tasks))) % self.num_vms
+        self.rr_counter = (self.rr_counter + len(tasks)) % self.num_vms
+        return self._constructive_result('rr', tasks, vm_indices, None, started)
+
+    # initial_loads (opsional) pada fcfs/shc/erwca: beban prediksi per VM yang sudah ada
+    # sebelum task ini dijadwalkan, dipakai oleh WindowedScheduler.
+    def schedule_fcfs(self, tasks, initial_loads=None):
+        started = time.monotonic()
+        tasks = TaskSet.from_tasks(tasks)
+        vm_indices, _ = greedy_assign(tasks.indices, np.arange(len(tasks)), self._class_cost_table(),
+                                      initial_loads=initial_loads)
+        return self._constructive_result('fcfs', tasks, vm_indices, initial_loads, started)
+
+    # Solver pencarian (shc, erwca) bersifat anytime: time_budget (detik) mengembalikan solusi terbaik
+    # saat waktu habis, iterations=None berarti tanpa batas iterasi (wajib dengan time_budget), dan
+    # pencarian berhenti lebih awal jika makespan <= batas bawah x (1 + gap_tolerance).
+    # initial_assignment (opsional): vektor indeks VM rencana sebelumnya sebagai titik awal (warm start).
+    @staticmethod
+    def _check_search_limits(iterations, time_budget):
+        if iterations is None and time_budget is None:
+            raise ValueError("iterations=None membutuhkan time_budget")
+
+    def schedule_stochastic_hill_climbing(self, tasks, iterations=500, batch_size=1, time_budget=None,
+                                          initial_loads=None, gap_tolerance=DEFAULT_GAP_TOLERANCE,
+                                          initial_assignment=None):
+        # batch_size > 1: setiap iterasi menilai banyak kandidat sekaligus dengan NumPy lalu menerima
+        # kandidat terbaik (biaya per iterasi sebanding batch_size; iterations tetap menghitung iterasi).
+        self._check_search_limits(iterations, time_budget)
+        started = time.monotonic()
+        tasks = TaskSet.from_tasks(tasks)
+        num_tasks = len(tasks)
+        if num_tasks == 0: return self._constructive_result('shc', tasks, [], initial_loads, started)
+        start = self.rng.integers(0, self.num_vms, num_tasks) if initial_assignment is None \
+            else np.array(initial_assignment, dtype=np.int64)
+        state = LoadState(start, tasks.indices, self._class_cost_table(), initial_loads)
+        lower_bound = self.makespan_lower_bound(tasks, initial_loads)
+        target = lower_bound * (1 + gap_tolerance)
+        deadline = started + time_budget if time_budget is not None else None
+        i = 0; stop_reason = "iterations"
+        while iterations is None or i < iterations:
+            # Pemeriksaan batas dilakukan per 64 iterasi agar biaya per langkah tetap O(1).
+            if i % 64 == 0:
+                if state.makespan <= target: stop_reason = "converged"; break
+                if deadline is not None and time.monotonic() >= deadline: stop_reason = "time_budget"; break
+            i += 1
+            if batch_size > 1:
+                task_batch = self.rng.integers(0, num_tasks, batch_size)
+                vm_batch = self.rng.integers(0, self.num_vms, batch_size)
+                scores = state.batch_move_makespan(task_batch, vm_batch)
+                best = np.argmin(scores)
+                if scores[best] < state.makespan:
+                    state.apply(task_batch[best], vm_batch[best])
+            else:
+                task_to_move = self.py_rng.randrange(num_tasks)
+                new_vm = self.py_rng.randrange(self.num_vms)
+                if state.move_makespan(task_to_move, new_vm) < state.makespan:
+                    state.apply(task_to_move, new_vm)
+        assignment = Assignment(tasks, state.assign, self.vms)
+        assignment.search = self._search_report('shc', state.makespan, lower_bound, i, started, stop_reason)
         return assignment
 
-    def schedule_fcfs(self, tasks):
-        vm_loads = np.zeros(self.num_vms)
-        vm_cores = np.array([vm.cpu_cores for vm in self.vms])
-        assignment = {}
-        for task in tasks:
-            task_load = self._get_task_load(task.index)
-            estimated_times = self._estimate_execution_time(task_load, vm_cores)
-            potential_finish_times = vm_loads + estimated_times
-            best_vm_index = np.argmin(potential_finish_times)
-            assignment[task.id] = self.vms[best_vm_index].name
-            vm_loads[best_vm_index] += estimated_times[best_vm_index]
+    def schedule(self, algorithm: str, tasks, **params) -> Assignment:
+        if algorithm == 'rr': return self.schedule_round_robin(tasks)
+        if algorithm == 'fcfs': return self.schedule_fcfs(tasks, **params)
+        if algorithm == 'shc': return self.schedule_stochastic_hill_climbing(tasks, **params)
+        if algorithm == 'erwca': return self.schedule_erwca(tasks, **params)
+        raise ValueError(f"Algoritma tidak dikenal: {algorithm}")
+
+    def _population_makespans(self, population, class_runs, cost_table, base_loads=None):
+        # Makespan seluruh populasi dalam satu pass. Kolom populasi terurut per kelas (lihat
+        # TaskSet.class_runs), jadi beban = jumlah task per (kandidat, VM) tiap blok kelas dikali
+        # baris biaya kelas itu, tanpa gather biaya per task.
+        population_size = population.shape[0]
+        offsets = (np.arange(population_size) * self.num_vms)[:, None]
+        flat = population + offsets
+        loads = np.zeros((population_size, self.num_vms))
+        start = 0
+        for task_class, length in zip(*class_runs):
+            block = flat[:, start:start + length].ravel()
+            loads += np.bincount(block, minlength=population_size * self.num_vms).reshape(
+                population_size, self.num_vms) * cost_table[task_class]
+            start += length
+        if base_loads is not None: loads += base_loads[None, :]
+        return loads.max(axis=1)
+
+    def _mutate(self, population, rates):
+        mask = self.rng.random(population.shape) < np.asarray(rates).reshape(-1, 1)
+        population[mask] = self.rng.integers(0, self.num_vms, np.count_nonzero(mask))
+        return population
+
+    def _flow(self, followers, guides, flow_rate, mutation_rate):
+        # Aliran diskrit: setiap task mengikuti VM milik guide (sea/river) dengan peluang acak C*rand.
+        strengths = self.rng.uniform(0, flow_rate, (followers.shape[0], 1))
+        moved = np.where(self.rng.random(followers.shape) < strengths, guides, followers)
+        return self._mutate(moved, mutation_rate)
+
+    def _erwca_greedy_seed(self, task_classes, cpu_loads, cost_table, k_best, initial_loads=None):
+        # Greedy top-k: task terbesar lebih dulu, VM dipilih acak dari k_best finish time terkecil.
+        order = np.argsort(-cpu_loads, kind='stable')
+        seed, _ = greedy_assign(task_classes, order, cost_table, k_best=k_best, choice=self.py_rng.choice,
+                                initial_loads=initial_loads)
+        return seed
+
+    def schedule_erwca(self, tasks, k_best=2, population_size=30, iterations=100, time_budget=None,
+                       num_rivers=4, d_max=0.01, flow_rate=0.5, mutation_rate=None, initial_loads=None,
+                       gap_tolerance=DEFAULT_GAP_TOLERANCE, initial_assignment=None):
+        # Enhanced Water Cycle Algorithm: greedy top-k menjadi benih populasi, lalu
+        # stream -> river -> sea, evaporasi dan hujan dijalankan atas matriks penugasan 2-D.
+        # Dengan initial_assignment, benih adalah yang lebih baik antara greedy dan rencana tersebut.
+        self._check_search_limits(iterations, time_budget)
+        started = time.monotonic()
+        tasks = TaskSet.from_tasks(tasks)
+        if len(tasks) == 0: return self._constructive_result('erwca', tasks, [], initial_loads, started)
+        task_classes = tasks.indices
+        cost_table = self._class_cost_table()
+        base_loads = np.asarray(initial_loads, dtype=float) if initial_loads is not None else None
+        seed = self._erwca_greedy_seed(task_classes, tasks.cpu_loads, cost_table, k_best, base_loads)
+        lower_bound = self.makespan_lower_bound(tasks, initial_loads)
+        target = lower_bound * (1 + gap_tolerance)
+        # Pencarian berjalan atas kolom yang dikelompokkan per kelas; hasil dikembalikan ke urutan task.
+        grouped = np.argsort(task_classes, kind='stable')
+        class_runs = tasks.take(grouped).class_runs()
+        seed = seed[grouped]
+        seed_makespan = self._population_makespans(seed[None, :], class_runs, cost_table, base_loads)[0]
+        if initial_assignment is not None:
+            warm = np.asarray(initial_assignment, dtype=seed.dtype)[grouped]
+            warm_makespan = self._population_makespans(warm[None, :], class_runs, cost_table, base_loads)[0]
+            if warm_makespan < seed_makespan: seed, seed_makespan = warm, warm_makespan
+        best, best_makespan, done, stop_reason = seed, seed_makespan, 0, "iterations"
+        if seed_makespan <= target:
+            stop_reason = "converged"
+        elif population_size > 1 and (iterations is None or iterations > 0):
+            best, best_makespan, done, stop_reason = self._erwca_search(
+                seed, class_runs, cost_table, population_size, iterations, started, time_budget, target,
+                num_rivers, d_max, flow_rate, mutation_rate, base_loads)
+        vm_indices = np.empty_like(best); vm_indices[grouped] = best
+        assignment = Assignment(tasks, vm_indices, self.vms)
+        assignment.search = self._search_report('erwca', best_makespan, lower_bound, done, started, stop_reason)
         return assignment
 
-    def schedule_stochastic_hill_climbing(self, tasks, iterations=500):
-        tasks_dict = {task.id: task for task in tasks}
-        current_solution = {task.id: random.choice(self.vms).name for task in tasks}
-        current_makespan = self._calculate_makespan_for_shc(current_solution, tasks_dict)
-        for _ in range(iterations):
-            neighbor_solution = current_solution.copy()
-            task_to_move = random.choice(tasks)
-            new_vm = random.choice(self.vms)
-            neighbor_solution[task_to_move.id] = new_vm.name
-            neighbor_makespan = self._calculate_makespan_for_shc(neighbor_solution, tasks_dict)
-            if neighbor_makespan < current_makespan:
-                current_solution = neighbor_solution
-                current_makespan = neighbor_makespan
-        return current_solution
-
-    def schedule_erwca(self, tasks, k_best=2):
-        vm_loads = np.zeros(self.num_vms)
-        vm_cores = np.array([vm.cpu_cores for vm in self.vms])
-        assignment = {}
-        sorted_tasks = sorted(tasks, key=lambda t: t.cpu_load, reverse=True)
-        for task in sorted_tasks:
-            task_load = self._get_task_load(task.index)
-            estimated_times = self._estimate_execution_time(task_load, vm_cores)
-            potential_finish_times = vm_loads + estimated_times
-            sorted_vm_indices = np.argsort(potential_finish_times)
-            num_choices = min(k_best, self.num_vms)
-            top_k_indices = sorted_vm_indices[:num_choices]
-            chosen_vm_index = random.choice(top_k_indices)
-            assignment[task.id] = self.vms[chosen_vm_index].name
-            vm_loads[chosen_vm_index] += estimated_times[chosen_vm_index]
-        return assignment
\ No newline at end of file
+    def _erwca_search(self, seed, class_runs, cost_table, population_size, iterations, started, time_budget,
+                      target, num_rivers, d_max, flow_rate, mutation_rate, base_loads=None):
+        # Mengembalikan (penugasan terbaik, makespan-nya, jumlah iterasi, alasan berhenti).
+        num_tasks = len(seed)
+        if mutation_rate is None: mutation_rate = min(0.1, 2.0 / num_tasks)
+        deadline = started + time_budget if time_budget is not None else None
+        population = np.tile(seed, (population_size, 1))
+        self._mutate(population[1:], np.linspace(mutation_rate, 10 * mutation_rate, population_size - 1))
+        fitness = self._population_makespans(population, class_runs, cost_table, base_loads)
+        # Benih greedy tetap ada di populasi[0] dan hanya diganti oleh kandidat yang lebih baik.
+        num_rivers = max(0, min(num_rivers, population_size - 2))
+        num_guides = num_rivers + 1
+        decay = iterations or ERWCA_DMAX_DECAY_ITERATIONS
+        i = 0; stop_reason = "iterations"
+        while iterations is None or i < iterations:
+            if fitness.min() <= target: stop_reason = "converged"; break
+            if deadline is not None and time.monotonic() >= deadline: stop_reason = "time_budget"; break
+            i += 1
+            # Sea = kandidat terbaik, river = num_rivers berikutnya, sisanya stream.
+            order = np.argsort(fitness, kind='stable')
+            population = population[order]; fitness = fitness[order]
+            num_streams = population_size - num_guides
+            if num_streams > 0:
+                # Jumlah stream per guide sebanding dengan intensitasnya (1 / makespan).
+                intensity = 1.0 / np.maximum(fitness[:num_guides], 1e-12)
+                guide_of = self.rng.choice(num_guides, size=num_streams, p=intensity / intensity.sum())
+                streams = self._flow(population[num_guides:], population[guide_of], flow_rate, mutation_rate)
+                population[num_guides:] = streams
+                fitness[num_guides:] = self._population_makespans(streams, class_runs, cost_table, base_loads)
+            if num_rivers > 0:
+                rivers = self._flow(population[1:num_guides], population[0][None, :], flow_rate, mutation_rate)
+                population[1:num_guides] = rivers
+                fitness[1:num_guides] = self._population_makespans(rivers, class_runs, cost_table, base_loads)
+                # Evaporasi: river yang sudah dekat dengan sea (atau terpilih acak, ciri ErWCA)
+                # menguap, lalu stream-nya diganti hujan baru di sekitar sea.
+                distance = np.mean(population[1:num_guides] != population[0], axis=1)
+                evaporated = np.flatnonzero((distance < d_max) | (self.rng.random(num_rivers) < 0.1)) + 1
+                if num_streams > 0 and len(evaporated) > 0:
+                    raining = num_guides + np.flatnonzero(np.isin(guide_of, evaporated))
+                    if len(raining) > 0:
+                        rain = self._mutate(np.tile(population[0], (len(raining), 1)), 10 * mutation_rate)
+                        population[raining] = rain
+                        fitness[raining] = self._population_makespans(rain, class_runs, cost_table, base_loads)
+                d_max -= d_max / decay
+        best = np.argmin(fitness)
+        if stop_reason == "iterations" and fitness[best] <= target: stop_reason = "converged"
+        return population[best], float(fitness[best]), i, stop_reason
+
+
+class WindowedScheduler:
+    # Penjadwalan inkremental per jendela task (mode streaming): setiap jendela dijadwalkan
+    # dengan algoritma yang sama terhadap beban prediksi per VM dari jendela-jendela sebelumnya,
+    # sehingga dispatch jendela awal bisa dimulai sebelum dataset selesai dibaca.
+    def __init__(self, scheduler: SchedulerAlgorithms, algorithm: str, **params):
+        self.scheduler = scheduler
+        self.algorithm = algorithm
+        self.params = params
+        self.vm_loads = np.zeros(scheduler.num_vms)
+        # Laporan solver jendela terakhir: makespan dan batas bawahnya mencakup beban semua jendela.
+        self.last_search = None
+
+    def schedule(self, window) -> Assignment:
+        scheduler = self.scheduler; loads = self.vm_loads.copy()
+        if self.algorithm == 'rr': assignment = scheduler.schedule_round_robin(window)
+        elif self.algorithm == 'fcfs': assignment = scheduler.schedule_fcfs(window, initial_loads=loads)
+        elif self.algorithm == 'shc':
+            assignment = scheduler.schedule_stochastic_hill_climbing(window, initial_loads=loads, **self.params)
+        elif self.algorithm == 'erwca': assignment = scheduler.schedule_erwca(window, initial_loads=loads, **self.params)
+        else: raise ValueError(f"Algoritma tidak dikenal: {self.algorithm}")
+        self.vm_loads += assignment.vm_loads(scheduler._class_cost_table())
+        self.last_search = assignment.search
+        return assignment
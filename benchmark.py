@@ -0,0 +1,181 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime
+import numpy as np
+from algorithms import SchedulerAlgorithms
+from taskset import DATASET_FILES, TaskSet
+
+# Micro-benchmark solver di algorithms.py: waktu solver, memori puncak dan kualitas makespan
+# prediksi (rasio terhadap batas bawah) untuk setiap kombinasi algoritma x distribusi x jumlah
+# task x jumlah VM. Hasil ditulis sebagai JSON Lines dan dibandingkan dengan baseline JSON.
+
+BENCH_RESULTS_FILE = "bench_results.jsonl"
+BENCH_BASELINE_FILE = "bench_baseline.json"
+ALGORITHMS = ['rr', 'fcfs', 'shc', 'erwca']
+DEFAULT_TASKS = [100, 1000, 10000]
+DEFAULT_VMS = [4, 64, 1024]
+FULL_TASKS = [100, 1000, 10000, 100000, 1000000]
+FULL_VMS = [4, 16, 100, 1000, 10000]
+# Jumlah core VM diulang bergiliran seperti VM_SPECS di test_harness (1, 2, 4, 8).
+CORE_PATTERN = [1, 2, 4, 8]
+# Toleransi regresi relatif terhadap baseline. Waktu di bawah MIN_TIME detik tidak dibandingkan
+# karena didominasi noise timer.
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.2
+QUALITY_TOLERANCE = 0.05
+MIN_TIME = 0.01
+
+VM = namedtuple('VM', ['name', 'ip', 'cpu_cores'])
+
+def make_vms(num_vms: int) -> list:
+    return [VM(f"vm{i + 1}", None, CORE_PATTERN[i % len(CORE_PATTERN)]) for i in range(num_vms)]
+
+def class_distribution(dataset: str) -> np.ndarray:
+    # Frekuensi relatif task index 1-10 pada file dataset_*.txt.
+    with open(DATASET_FILES[dataset], 'r') as f:
+        indices = np.array([int(line) for line in f if line.strip()])
+    counts = np.bincount(indices[(indices >= 1) & (indices <= 10)], minlength=11)[1:]
+    return counts / counts.sum()
+
+def seed_streams(seed: int):
+    # Stream independen untuk pembangkitan task dan solver dari satu seed, agar titik awal acak
+    # SHC/ErWCA tidak berkorelasi dengan urutan kelas task. Seed solver berupa int (random.Random).
+    task_stream, solver_stream = np.random.SeedSequence(seed).spawn(2)
+    return task_stream, int(solver_stream.generate_state(1)[0])
+
+def make_tasks(dataset: str, num_tasks: int, seed) -> TaskSet:
+    rng = np.random.default_rng(seed)
+    return TaskSet(np.arange(num_tasks), rng.choice(np.arange(1, 11), size=num_tasks, p=class_distribution(dataset)))
+
+def run_solver(algorithm: str, tasks: TaskSet, vms: list, seed: int, params: dict):
+    scheduler = SchedulerAlgorithms(vms, seed=seed)
+    scheduler._class_cost_table()
+    start = time.perf_counter()
+    if algorithm == 'rr': assignment = scheduler.schedule_round_robin(tasks)
+    elif algorithm == 'fcfs': assignment = scheduler.schedule_fcfs(tasks)
+    elif algorithm == 'shc': assignment = scheduler.schedule_stochastic_hill_climbing(tasks, iterations=params['shc_iterations'])
+    else: assignment = scheduler.schedule_erwca(tasks, k_best=2, population_size=params['population'],
+                                                iterations=params['erwca_iterations'])
+    return time.perf_counter() - start, scheduler, assignment
+
+def bench_cell(algorithm: str, dataset: str, num_tasks: int, num_vms: int, seed: int, params: dict,
+               repeat: int = 1, measure_memory: bool = True) -> dict:
+    task_seed, solver_seed = seed_streams(seed)
+    tasks = make_tasks(dataset, num_tasks, task_seed); vms = make_vms(num_vms)
+    # Waktu diukur tanpa tracemalloc (overhead-nya besar untuk loop Python); memori diukur
+    # pada eksekusi terpisah dengan seed yang sama.
+    times = []
+    for _ in range(repeat):
+        elapsed, scheduler, assignment = run_solver(algorithm, tasks, vms, solver_seed, params)
+        times.append(elapsed)
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        run_solver(algorithm, tasks, vms, solver_seed, params)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    makespan = scheduler.predicted_makespan(assignment)
+    lower_bound = scheduler.makespan_lower_bound(tasks)
+    return {"algorithm": algorithm, "dataset": dataset, "num_tasks": num_tasks, "num_vms": num_vms, "seed": seed,
+            "solver_time": min(times), "peak_memory": peak_memory, "makespan": makespan,
+            "lower_bound": lower_bound, "quality": makespan / lower_bound if lower_bound > 0 else 1.0}
+
+def cell_key(result: dict) -> str:
+    return f"{result['algorithm']}/{result['dataset']}/{result['num_tasks']}/{result['num_vms']}"
+
+def environment_info() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {"timestamp": datetime.now().isoformat(timespec='seconds'), "commit": commit,
+            "python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine()}
+
+def append_results(results: list, env: dict, path: str = BENCH_RESULTS_FILE):
+    # Satu baris JSON per sel, lengkap dengan info lingkungan agar mudah di-plot dari waktu ke waktu.
+    with open(path, 'a') as f:
+        for result in results:
+            f.write(json.dumps({**env, **result}) + "\n")
+
+def save_baseline(results: list, env: dict, path: str = BENCH_BASELINE_FILE):
+    with open(path, 'w') as f:
+        json.dump({"environment": env, "cells": {cell_key(r): r for r in results}}, f, indent=2)
+
+def compare_to_baseline(results: list, path: str = BENCH_BASELINE_FILE) -> list:
+    # Mengembalikan daftar pesan regresi; sel yang tidak ada di baseline dilewati.
+    with open(path, 'r') as f:
+        baseline = json.load(f)["cells"]
+    regressions = []
+    for result in results:
+        base = baseline.get(cell_key(result))
+        if base is None: continue
+        if max(result['solver_time'], base['solver_time']) >= MIN_TIME and \
+                result['solver_time'] > base['solver_time'] * (1 + TIME_TOLERANCE):
+            regressions.append(f"{cell_key(result)}: solver_time {base['solver_time']:.4f}s -> {result['solver_time']:.4f}s")
+        if result['peak_memory'] is not None and base.get('peak_memory') and \
+                result['peak_memory'] > base['peak_memory'] * (1 + MEMORY_TOLERANCE):
+            regressions.append(f"{cell_key(result)}: peak_memory {base['peak_memory']} -> {result['peak_memory']} byte")
+        if result['quality'] > base['quality'] * (1 + QUALITY_TOLERANCE):
+            regressions.append(f"{cell_key(result)}: quality {base['quality']:.4f} -> {result['quality']:.4f}")
+    return regressions
+
+def main(args):
+    params = {'shc_iterations': args.shc_iterations, 'population': args.population, 'erwca_iterations': args.erwca_iterations}
+    tasks_grid = args.tasks or (FULL_TASKS if args.full else DEFAULT_TASKS)
+    vms_grid = args.vms or (FULL_VMS if args.full else DEFAULT_VMS)
+    env = environment_info(); results = []
+    print(f"{'algoritma':>9} {'dataset':>10} {'tugas':>8} {'vm':>6} {'waktu (s)':>10} {'memori (MB)':>11} {'makespan':>12} {'kualitas':>8}")
+    for algorithm in args.algorithms:
+        for dataset in args.datasets:
+            for num_tasks in tasks_grid:
+                for num_vms in vms_grid:
+                    result = bench_cell(algorithm, dataset, num_tasks, num_vms, args.seed, params, args.repeat,
+                                        not args.no_memory)
+                    results.append(result)
+                    memory = f"{result['peak_memory'] / 2**20:11.2f}" if result['peak_memory'] is not None else f"{'-':>11}"
+                    print(f"{algorithm:>9} {dataset:>10} {num_tasks:>8} {num_vms:>6} {result['solver_time']:>10.4f} "
+                          f"{memory} {result['makespan']:>12.4f} {result['quality']:>8.4f}", flush=True)
+    append_results(results, env, args.output)
+    print(f"\nHasil ditambahkan ke {args.output}")
+    if args.save_baseline:
+        save_baseline(results, env, args.baseline)
+        print(f"Baseline disimpan ke {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        # Tanpa baseline gerbang regresi tidak bisa lolos secara diam-diam.
+        print(f"Error: baseline {args.baseline} tidak ada; jalankan dengan --save-baseline untuk membuatnya.",
+              file=sys.stderr)
+        return 2
+    regressions = compare_to_baseline(results, args.baseline)
+    if regressions:
+        print(f"\nREGRESI terhadap {args.baseline}:", file=sys.stderr)
+        for message in regressions: print(f"  !! {message}", file=sys.stderr)
+        return 1
+    print(f"Tidak ada regresi terhadap {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark solver penjadwalan lintas skala task dan VM")
+    parser.add_argument('--algorithms', nargs='+', choices=ALGORITHMS, default=ALGORITHMS)
+    parser.add_argument('--datasets', nargs='+', choices=list(DATASET_FILES), default=list(DATASET_FILES))
+    parser.add_argument('--tasks', nargs='+', type=int, default=None, help="Jumlah task per sel (default 10^2-10^4).")
+    parser.add_argument('--vms', nargs='+', type=int, default=None, help="Jumlah VM per sel (default 4-1024).")
+    parser.add_argument('--full', action='store_true', help="Grid lengkap: 10^2-10^6 task, 4-10^4 VM.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help="Ulangi pengukuran waktu dan ambil yang tercepat.")
+    parser.add_argument('--no-memory', action='store_true', help="Lewati pengukuran memori puncak (tracemalloc).")
+    parser.add_argument('--shc-iterations', type=int, default=500)
+    parser.add_argument('--population', type=int, default=30, help="Ukuran populasi ErWCA.")
+    parser.add_argument('--erwca-iterations', type=int, default=100)
+    parser.add_argument('--output', default=BENCH_RESULTS_FILE, help="File JSON Lines untuk hasil.")
+    parser.add_argument('--baseline', default=BENCH_BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help="Simpan hasil sebagai baseline baru.")
+    sys.exit(main(parser.parse_args()))
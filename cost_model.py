@@ -0,0 +1,166 @@
+import csv
+import json
+import os
+import sys
+import numpy as np
+from taskset import DATASET_FILES
+
+COST_MODEL_CACHE = ".cost_model_cache.json"
+HISTORY_FILES = ["all_runs_results.csv", "all_runs_erwca.csv", "results_erwca.csv"]
+# Minimal jumlah sampel per (VM, task index) sebelum nilai terukur dipakai menggantikan rumus.
+MIN_SAMPLES = 3
+
+class CostModel:
+    # Model biaya per (VM, task index) yang dipelajari dari CSV hasil run sebelumnya.
+    # Statistik disimpan sebagai (count, mean, M2) Welford sehingga bisa diperbarui
+    # secara inkremental: hanya baris yang baru ditambahkan ke CSV yang dibaca ulang.
+    def __init__(self, cache_path: str = COST_MODEL_CACHE):
+        self.cache_path = cache_path
+        self.sources = {}
+        self.stats = {}
+        self.store_chunks = set()
+        self._dataset_indices = {}
+
+    @classmethod
+    def load_or_fit(cls, paths=HISTORY_FILES, cache_path: str = COST_MODEL_CACHE, store=None):
+        model = cls(cache_path)
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r') as f:
+                    cached = json.load(f)
+                model.sources = cached.get("sources", {})
+                model.stats = {vm: {int(k): v for k, v in per_vm.items()} for vm, per_vm in cached.get("stats", {}).items()}
+                model.store_chunks = set(cached.get("store_chunks", []))
+            except (OSError, ValueError) as e:
+                print(f"Peringatan: cache cost model '{cache_path}' diabaikan: {e}", file=sys.stderr)
+                model.sources = {}; model.stats = {}; model.store_chunks = set()
+        model.refresh(paths, store)
+        return model
+
+    def refresh(self, paths=HISTORY_FILES, store=None):
+        # Membaca baris baru dari setiap CSV sejak offset terakhir dan chunk baru dari ResultsStore.
+        # Jika file menyusut, header berubah, atau chunk yang sudah dibaca hilang (mis. dihapus
+        # dengan --clean), seluruh model dibangun ulang.
+        chunk_ids = {self._chunk_id(entry) for entry in store.chunks()} if store is not None else set()
+        if any(self._source_reset(path) for path in paths if path in self.sources) or \
+                (store is not None and not self.store_chunks <= chunk_ids):
+            self.sources = {}; self.stats = {}; self.store_chunks = set()
+        new_rows = 0
+        for path in paths:
+            if os.path.exists(path): new_rows += self._ingest(path)
+        if store is not None:
+            for entry in store.chunks():
+                # Chunk hasil impor CSV sudah terbaca dari file CSV-nya sendiri; chunk backend sim
+                # berisi durasi hasil model, bukan waktu terukur, sehingga tidak dipelajari.
+                if self._chunk_id(entry) in self.store_chunks: continue
+                if entry["source"] is None and entry.get("backend", "http") != "sim": new_rows += self._ingest_chunk(entry, store.load_chunk(entry))
+                self.store_chunks.add(self._chunk_id(entry))
+        if new_rows: self.save()
+        return new_rows
+
+    @staticmethod
+    def _chunk_id(entry):
+        # Nama chunk bisa dipakai ulang setelah store dikosongkan, jadi waktu tulis ikut menjadi kunci.
+        return f"{entry['chunk']}@{entry['written_at']}"
+
+    def _ingest_chunk(self, entry, columns):
+        # Statistik per (VM, task index) satu chunk digabung ke Welford dengan rumus paralel Chan.
+        exec_time = np.asarray(columns["exec_time"]); index = np.asarray(columns["task_index"]).astype(np.int64)
+        valid = (exec_time > 0) & (index >= 1) & (index <= 10)
+        keys = np.asarray(columns["vm"])[valid].astype(np.int64) * 11 + index[valid]; values = exec_time[valid]
+        unique_keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        means = np.bincount(inverse, weights=values) / counts
+        m2s = np.bincount(inverse, weights=(values - means[inverse]) ** 2)
+        for key, count_b, mean_b, m2_b in zip(unique_keys.tolist(), counts.tolist(), means.tolist(), m2s.tolist()):
+            vm_name = entry["vms"][key // 11]; task_index = key % 11
+            count_a, mean_a, m2_a = self.stats.setdefault(vm_name, {}).get(task_index, (0, 0.0, 0.0))
+            count = count_a + count_b; delta = mean_b - mean_a
+            self.stats[vm_name][task_index] = (count, mean_a + delta * count_b / count,
+                                               m2_a + m2_b + delta * delta * count_a * count_b / count)
+        return int(valid.sum())
+
+    def _source_reset(self, path):
+        source = self.sources[path]
+        if not os.path.exists(path) or os.path.getsize(path) < source["offset"]: return True
+        with open(path, 'rb') as f:
+            return f.readline().decode().strip() != source["header"]
+
+    def _ingest(self, path):
+        source = self.sources.get(path)
+        rows = 0
+        with open(path, 'rb') as f:
+            header_line = f.readline()
+            if not header_line.endswith(b'\n'): return 0
+            header = header_line.decode().strip()
+            columns = {name: i for i, name in enumerate(header.split(','))}
+            if source is not None: f.seek(source["offset"])
+            offset = f.tell()
+            for line in f:
+                if not line.endswith(b'\n'): break  # baris yang masih ditulis
+                offset += len(line)
+                row = next(csv.reader([line.decode()]), None)
+                if row and self._add_row(row, columns): rows += 1
+        self.sources[path] = {"offset": offset, "header": header}
+        return rows
+
+    def _task_index(self, row, columns):
+        if "task_name" in columns:
+            return int(row[columns["task_name"]].split('-')[1])
+        dataset_file = DATASET_FILES.get(row[columns["dataset"]])
+        if dataset_file is None: return None
+        if dataset_file not in self._dataset_indices:
+            with open(dataset_file, 'r') as f:
+                self._dataset_indices[dataset_file] = [line.strip() for line in f]
+        return int(self._dataset_indices[dataset_file][int(row[columns["task_id"]])])
+
+    def _add_row(self, row, columns):
+        try:
+            exec_time = float(row[columns["exec_time"]])
+            if exec_time <= 0: return False
+            index = self._task_index(row, columns)
+        except (KeyError, IndexError, ValueError, OSError):
+            return False
+        if index is None or not 1 <= index <= 10: return False
+        count, mean, m2 = self.stats.setdefault(row[columns["vm_assigned"]], {}).get(index, (0, 0.0, 0.0))
+        count += 1; delta = exec_time - mean; mean += delta / count; m2 += delta * (exec_time - mean)
+        self.stats[row[columns["vm_assigned"]]][index] = (count, mean, m2)
+        return True
+
+    def save(self):
+        with open(self.cache_path, 'w') as f:
+            json.dump({"sources": self.sources, "stats": self.stats, "store_chunks": sorted(self.store_chunks)}, f)
+
+    def exec_time_table(self, vms):
+        # (mean, variance, count) waktu eksekusi per task (bukan per slot), bentuk (11, m).
+        means = np.zeros((11, len(vms))); variances = np.zeros((11, len(vms))); counts = np.zeros((11, len(vms)), dtype=int)
+        for j, vm in enumerate(vms):
+            for index, (count, mean, m2) in self.stats.get(vm.name, {}).items():
+                means[index, j] = mean; counts[index, j] = count
+                variances[index, j] = m2 / (count - 1) if count > 1 else 0.0
+        return means, variances, counts
+
+    def cost_table(self, vms, analytic_table):
+        # Tabel biaya dalam satuan yang sama dengan vm_loads di SchedulerAlgorithms: VM dengan
+        # c core menjalankan c task bersamaan, jadi kontribusi satu task = exec_time / c.
+        # Sel yang sampelnya kurang diisi rumus analitik yang diskalakan ke data VM tersebut.
+        means, _, counts = self.exec_time_table(vms)
+        cores = np.array([vm.cpu_cores for vm in vms], dtype=float)
+        learned = means / cores[None, :]
+        known = (counts >= MIN_SAMPLES) & (analytic_table > 0)
+        ratios = np.where(known, learned / np.where(analytic_table > 0, analytic_table, 1.0), np.nan)
+        global_ratio = np.nanmedian(ratios) if known.any() else 1.0
+        vm_ratio = np.array([np.nanmedian(ratios[:, j]) if known[:, j].any() else global_ratio for j in range(len(vms))])
+        table = analytic_table * vm_ratio[None, :]
+        table[known] = learned[known]
+        return table
+
+if __name__ == "__main__":
+    from collections import namedtuple
+    VM = namedtuple('VM', ['name', 'cpu_cores'])
+    model = CostModel.load_or_fit()
+    vm_names = sorted(model.stats)
+    means, variances, counts = model.exec_time_table([VM(name, 1) for name in vm_names])
+    print("index " + " ".join(f"{name:>22}" for name in vm_names))
+    for index in range(1, 11):
+        cells = [f"{means[index, j]:8.3f} ±{np.sqrt(variances[index, j]):7.3f} (n={counts[index, j]:4d})" for j in range(len(vm_names))]
+        print(f"{index:>5} " + " ".join(cells))
@@ -0,0 +1,144 @@
+import asyncio
+import heapq
+import time
+from collections import deque
+import numpy as np
+
+# Bobot EWMA untuk faktor koreksi kecepatan VM (waktu terukur / prediksi model).
+SPEED_EWMA_ALPHA = 0.3
+
+class WorkStealingDispatcher:
+    # Dispatch online: rencana algoritma hanya mengisi antrean awal per VM. Setiap VM punya
+    # cpu_cores slot; slot yang kosong mengambil task dari antreannya sendiri, dan jika
+    # antreannya habis mencuri task terakhir dari VM yang paling tertinggal. Slot yang belum
+    # boleh mencuri diparkir dan hanya dibangunkan jika keadaan korban teratas berubah sehingga
+    # syarat curi VM-nya terpenuhi, atau semua antrean kosong (slot lalu berhenti).
+    def __init__(self, tasks, assignment, vms, cost_table, execute):
+        self.tasks = tasks
+        self.vms = vms
+        self.cost_table = cost_table
+        self.execute = execute
+        self.task_costs = cost_table[tasks.indices, assignment.vm_indices]
+        self.cores = np.array([vm.cpu_cores for vm in vms], dtype=float)
+        self.queues = [deque() for _ in vms]
+        for pos, vm_index in enumerate(assignment.vm_indices.tolist()):
+            self.queues[vm_index].append(pos)
+        self.nonempty = sum(1 for queue in self.queues if queue)
+        # Sisa beban prediksi di antrean tiap VM (satuan sama dengan vm_loads di algoritma).
+        self.queued_load = np.bincount(assignment.vm_indices, weights=self.task_costs, minlength=len(vms))
+        self.speed = np.ones(len(vms))
+        # Max-heap lazy (-drain time, VM) atas antrean yang tidak kosong; entri yang drain time-nya
+        # sudah berubah dibuang saat sampai di puncak, dan heap dibangun ulang jika terlalu besar.
+        self._victims = []; self._rebuild_victims()
+        # Slot parkir per VM (token milik pemanggil) dan keadaan korban saat terakhir diperiksa.
+        self.parked = {}
+        self._checked = None
+        self._recheck = set()
+        self.steals = 0
+        self._started = None
+
+    def _drain_time(self, vm_index):
+        return self.queued_load[vm_index] * self.speed[vm_index]
+
+    def _rebuild_victims(self):
+        self._victims = [(-self._drain_time(i), i) for i, queue in enumerate(self.queues) if queue]
+        heapq.heapify(self._victims)
+
+    def _touch(self, vm_index):
+        if not self.queues[vm_index]: return
+        heapq.heappush(self._victims, (-self._drain_time(vm_index), vm_index))
+        if len(self._victims) > 4 * len(self.vms) + 64: self._rebuild_victims()
+
+    def _victim(self):
+        while self._victims:
+            drain, vm_index = self._victims[0]
+            if self.queues[vm_index] and -drain == self._drain_time(vm_index): return vm_index
+            heapq.heappop(self._victims)
+        return None
+
+    def _pop(self, vm_index, from_back=False):
+        queue = self.queues[vm_index]
+        pos = queue.pop() if from_back else queue.popleft()
+        task_class = self.tasks.indices[pos]
+        self.queued_load[vm_index] -= self.cost_table[task_class, vm_index]
+        if queue: self._touch(vm_index)
+        else: self.nonempty -= 1
+        return pos
+
+    def _own_time(self, task_class, vm_indices):
+        return self.cost_table[task_class, vm_indices] * self.cores[vm_indices] * self.speed[vm_indices]
+
+    def may_have_work(self, vm_index):
+        return self.nonempty > 0
+
+    def next_task(self, vm_index):
+        if self.queues[vm_index]: return self._pop(vm_index)
+        # Antrean sendiri kosong sehingga VM ini tidak ada di heap korban.
+        victim = self._victim()
+        if victim is None: return None
+        # Curi hanya jika task terakhir korban selesai lebih cepat di VM ini
+        # dibanding menunggu antrean korban habis.
+        task_class = self.tasks.indices[self.queues[victim][-1]]
+        if self._own_time(task_class, vm_index) >= self._drain_time(victim): return None
+        self.steals += 1
+        return self._pop(victim, from_back=True)
+
+    def observe(self, vm_index, pos, record):
+        if record is None or record['exec_time'] <= 0: return
+        # Satu slot dari cpu_cores: kontribusi task terhadap waktu VM = exec_time / slot.
+        predicted = self.cost_table[self.tasks.indices[pos], vm_index]
+        measured = record['exec_time'] / self.vms[vm_index].cpu_cores
+        ratio = measured / predicted if predicted > 0 else 1.0
+        speed = (1 - SPEED_EWMA_ALPHA) * self.speed[vm_index] + SPEED_EWMA_ALPHA * ratio
+        # VM parkir yang melambat mungkin kini lolos syarat curi; VM lain cukup diperbarui di heap.
+        if speed < self.speed[vm_index] and vm_index in self.parked: self._recheck.add(vm_index)
+        self.speed[vm_index] = speed; self._touch(vm_index)
+
+    def park(self, vm_index, token):
+        self.parked.setdefault(vm_index, deque()).append(token)
+
+    def _wake(self, vm_index):
+        waiting = self.parked[vm_index]; token = waiting.popleft()
+        if not waiting: del self.parked[vm_index]
+        return token
+
+    def wakeups(self):
+        # Token slot parkir yang perlu memeriksa ulang: semuanya jika antrean habis. Selain itu
+        # satu slot per VM yang kini lolos syarat curi terhadap korban teratas; semua VM parkir
+        # hanya diperiksa jika korban atau task terakhirnya berganti atau drain time-nya naik
+        # (drain time yang turun tidak pernah membuka curian baru).
+        if not self.parked: return []
+        victim = self._victim()
+        if victim is None:
+            tokens = [token for waiting in self.parked.values() for token in waiting]
+            self.parked.clear(); self._recheck.clear(); return tokens
+        state = (victim, self.queues[victim][-1]); drain = self._drain_time(victim)
+        if self._checked is None or self._checked[0] != state or drain > self._checked[1]:
+            candidates = list(self.parked)
+        else:
+            candidates = [vm_index for vm_index in self._recheck if vm_index in self.parked]
+        self._checked = (state, drain); self._recheck.clear()
+        if not candidates: return []
+        candidates = np.array(candidates)
+        ready = candidates[self._own_time(self.tasks.indices[state[1]], candidates) < drain]
+        return [self._wake(vm_index) for vm_index in ready.tolist()]
+
+    async def _slot(self, vm_index):
+        vm = self.vms[vm_index]; loop = asyncio.get_running_loop()
+        while True:
+            pos = self.next_task(vm_index)
+            if pos is None:
+                if not self.may_have_work(vm_index): return
+                waiter = loop.create_future(); self.park(vm_index, waiter)
+                await waiter
+                continue
+            # Waktu tunggu diukur sejak dispatch dimulai sampai task diambil, seperti mode static.
+            record = await self.execute(self.tasks[pos], vm, time.monotonic() - self._started)
+            self.observe(vm_index, pos, record)
+            for waiter in self.wakeups(): waiter.set_result(None)
+
+    async def run(self):
+        self._started = time.monotonic()
+        slots = [self._slot(vm_index) for vm_index, vm in enumerate(self.vms) for _ in range(vm.cpu_cores)]
+        await asyncio.gather(*slots)
+        return self.steals
@@ -0,0 +1,222 @@
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import httpx
+import numpy as np
+import test_harness as th
+from algorithms import SchedulerAlgorithms
+from cost_model import CostModel, HISTORY_FILES
+from metrics import RunMetrics, StreamingResults, MetricsSummary
+from plan_cache import PlanCache, plan_key
+from results_store import ResultsStore
+from taskset import DATASET_FILES, Assignment
+
+# Runner grid eksperimen: algoritma x dataset x seed x parameter (k_best ErWCA, iterasi SHC).
+# Setiap sel memakai seed-nya sendiri untuk semua keacakan solver (dan model durasi simulasi),
+# sehingga sel yang sama selalu menghasilkan penugasan yang sama. Backend sim menjalankan sel
+# sepenuhnya di process pool; backend http menyelesaikan solver di process pool lalu men-dispatch
+# sel satu per satu pada satu event loop dan satu connection pool httpx yang dipakai ulang.
+# Hasil setiap sel langsung ditulis ke ResultsStore begitu sel selesai. Dengan --plan-cache, proses
+# utama mencari rencana setiap sel di PlanCache sebelum mengirimnya ke pool; sel yang hit tidak
+# menjalankan solver, dan rencana sel yang miss disimpan ke cache oleh proses utama.
+
+Cell = namedtuple('Cell', ['algorithm', 'dataset', 'seed', 'params'])
+
+def build_grid(algorithms, datasets, seeds, k_bests, shc_iterations) -> list:
+    cells = []
+    for algorithm in algorithms:
+        if algorithm == 'erwca': variants = [{'k_best': k} for k in k_bests]
+        elif algorithm == 'shc': variants = [{'shc_iterations': n} for n in shc_iterations]
+        else: variants = [{}]
+        for dataset in datasets:
+            for params in variants:
+                for seed in seeds:
+                    cells.append(Cell(algorithm, dataset, seed, params))
+    return cells
+
+def cell_label(cell: Cell, dispatch: str = 'static') -> str:
+    # Label algoritma di results store, mis. "erwca(k_best=3)" atau "shc(shc_iterations=1000)+dynamic".
+    label = cell.algorithm
+    if cell.params: label += "(" + ",".join(f"{key}={value}" for key, value in sorted(cell.params.items())) + ")"
+    return label if dispatch == 'static' else f"{label}+{dispatch}"
+
+def cell_config(cell: Cell, base_config: th.RunConfig) -> th.RunConfig:
+    return base_config._replace(seed=cell.seed, **cell.params)
+
+def make_vms() -> list:
+    return [th.VM(name, spec['ip'], spec['cpu']) for name, spec in th.VM_SPECS.items()]
+
+def solve_cell(cell: Cell, base_config: th.RunConfig, tasks, cost_model, warm=None):
+    # Dijalankan di proses worker: hanya solver, hasilnya vektor indeks VM dan laporan solver.
+    # `warm`: vektor indeks VM dari cache rencana sebagai titik awal shc/erwca.
+    config = cell_config(cell, base_config); params = th.algorithm_params(cell.algorithm, config)
+    if warm is not None: params['initial_assignment'] = warm
+    scheduler = SchedulerAlgorithms(make_vms(), cost_model if config.use_cost_model else None, seed=cell.seed)
+    assignment = scheduler.schedule(cell.algorithm, tasks, **params)
+    return assignment.vm_indices, assignment.search
+
+def run_sim_cell(cell: Cell, base_config: th.RunConfig, tasks, cost_model, plan=None, warm=None):
+    # Dijalankan di proses worker: solver (kecuali `plan` dari cache sudah ada) + simulasi untuk
+    # satu sel, output console dibuang. Mengembalikan juga rencananya untuk disimpan ke cache.
+    vms = make_vms(); config = cell_config(cell, base_config)
+    if plan is None: plan = solve_cell(cell, base_config, tasks, cost_model, warm)
+    vm_indices, search = plan
+    assignment = Assignment(tasks, vm_indices, vms); assignment.search = search
+    simulator = th.make_simulator(vms, config.sim_model, cost_model, seed=cell.seed)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        results, makespan = asyncio.run(th.run_single_test(0, cell.algorithm, DATASET_FILES[cell.dataset], vms, tasks,
+                                                           config, cost_model if config.use_cost_model else None,
+                                                           simulator, assignment))
+    return list(results or []), makespan, plan
+
+def lookup_plan(cache: PlanCache | None, cell: Cell, base_config: th.RunConfig, tasks, vms: list, cost_table):
+    # (kunci cache, rencana hit sebagai (vm_indices, search) atau None, vektor warm start atau None).
+    if cache is None: return None, None, None
+    config = cell_config(cell, base_config)
+    key = plan_key(tasks, vms, cost_table, cell.algorithm, th.algorithm_params(cell.algorithm, config), cell.seed)
+    cached = cache.get(key, tasks, vms)
+    if cached is not None: return key, (cached.vm_indices, cached.search), None
+    warm = cache.warm_start(key, tasks, vms) if config.warm_start and cell.algorithm in ('shc', 'erwca') else None
+    return key, None, warm.vm_indices if warm is not None else None
+
+def store_plan(cache: PlanCache | None, key, tasks, vms: list, plan):
+    if cache is None or key is None: return
+    vm_indices, search = plan
+    assignment = Assignment(tasks, vm_indices, vms); assignment.search = search
+    cache.put(key, assignment)
+
+class GridRecorder:
+    # Menulis hasil sel ke results store (satu penulis: proses utama) dan mengumpulkan metrik
+    # per (label, dataset) untuk rangkuman akhir.
+    def __init__(self, store: ResultsStore, vms: list, tasks_by_dataset: dict, dispatch: str, total_cells: int,
+                 backend: str = 'http'):
+        self.store = store
+        self.vms = vms
+        self.tasks_by_dataset = tasks_by_dataset
+        self.dispatch = dispatch
+        self.total_cells = total_cells
+        self.backend = backend
+        self.done = 0
+        self.summaries = {}
+
+    def record(self, cell: Cell, results: list, makespan: float, search=None):
+        self.done += 1; label = cell_label(cell, self.dispatch)
+        if not results:
+            print(f"[{self.done}/{self.total_cells}] {label} {cell.dataset} seed={cell.seed}: gagal"); return
+        tasks = self.tasks_by_dataset[cell.dataset]
+        self.store.append_run(results, cell.seed, label, cell.dataset, tasks, makespan,
+                              solver=search._asdict() if search is not None else None, backend=self.backend)
+        streaming = StreamingResults(RunMetrics(self.vms, len(tasks)), results)
+        metrics = streaming.metrics.result(makespan)
+        if metrics is not None and search is not None: metrics["Solver Gap"] = search.gap
+        if metrics is not None:
+            self.summaries.setdefault((label, cell.dataset), MetricsSummary()).add(streaming.metrics, metrics)
+        gap = f", gap solver {search.gap:.2%} ({search.stop_reason})" if search is not None else ""
+        print(f"[{self.done}/{self.total_cells}] {label} {cell.dataset} seed={cell.seed}: makespan {makespan:.4f} detik{gap}",
+              flush=True)
+
+    def print_summary(self):
+        print(f"\n{'algoritma':>28} {'dataset':>10} {'seed':>4} {'makespan':>20} {'imbalance':>9} {'exec p95':>9} {'wait p95':>9} {'gap':>7}")
+        for (label, dataset), summary in sorted(self.summaries.items()):
+            makespans = np.array([run['Makespan (Waktu Total)'] for run in summary.runs])
+            averages = summary.averages()
+            print(f"{label:>28} {dataset:>10} {len(summary.runs):>4} {makespans.mean():>11.4f} ± {makespans.std():>6.4f} "
+                  f"{averages['Imbalance Degree']:>9.4f} {summary.exec_hist.percentile(95):>9.4f} {summary.wait_hist.percentile(95):>9.4f} "
+                  f"{averages.get('Solver Gap', 0.0):>7.2%}")
+
+async def run_http_grid(cells: list, base_config: th.RunConfig, tasks_by_dataset: dict, cost_model, vms: list,
+                        recorder: GridRecorder, workers: int, cache: PlanCache | None, cost_table):
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Solver semua sel (yang tidak ada di cache) berjalan paralel di pool sementara sel
+        # sebelumnya sedang di-dispatch.
+        keys = []; plans = []
+        for cell in cells:
+            tasks = tasks_by_dataset[cell.dataset]
+            key, cached, warm = lookup_plan(cache, cell, base_config, tasks, vms, cost_table)
+            keys.append(None if cached is not None else key)
+            plans.append(asyncio.sleep(0, result=cached) if cached is not None else
+                         loop.run_in_executor(pool, solve_cell, cell, base_config, tasks, cost_model, warm))
+        async with httpx.AsyncClient() as client:
+            for i, (cell, key, plan) in enumerate(zip(cells, keys, plans)):
+                tasks = tasks_by_dataset[cell.dataset]
+                plan = await plan; store_plan(cache, key, tasks, vms, plan)
+                vm_indices, search = plan
+                assignment = Assignment(tasks, vm_indices, vms); assignment.search = search
+                results, makespan = await th.run_single_test(i, cell.algorithm, DATASET_FILES[cell.dataset], vms, tasks,
+                                                             cell_config(cell, base_config), cost_model, None,
+                                                             assignment, client)
+                recorder.record(cell, results, makespan, search)
+
+def main(args):
+    store = ResultsStore()
+    if args.clean and os.path.exists(store.root):
+        print(f"Menghapus results store lama: {store.root}"); store.clear()
+    vms = make_vms()
+    cells = build_grid(args.algorithms, args.datasets, args.seeds, args.k_best, args.shc_iterations)
+    erwca_params = {'population_size': args.population, 'iterations': args.iterations}
+    base_config = th.RunConfig(erwca_params=erwca_params, time_budget=args.time_budget, gap_tolerance=args.gap_tolerance,
+                               batch_size=args.batch_size, dispatch=args.dispatch,
+                               use_cost_model=args.cost_model, backend=args.backend, sim_model=args.sim_model,
+                               progress_interval=0 if args.backend == 'sim' else args.progress_interval,
+                               plan_cache=args.plan_cache or args.warm_start, warm_start=args.warm_start,
+                               shc_batch_size=args.shc_batch_size)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        tasks_by_dataset = {dataset: th.load_tasks(DATASET_FILES[dataset]) for dataset in args.datasets}
+    # Cost model dimuat sekali di proses utama lalu dikirim ke worker (worker tidak menulis cache).
+    needs_model = args.cost_model or (args.backend == 'sim' and args.sim_model == 'learned')
+    cost_model = CostModel.load_or_fit(HISTORY_FILES, store=store) if needs_model else None
+    recorder = GridRecorder(store, vms, tasks_by_dataset, args.dispatch, len(cells), args.backend)
+    cache = PlanCache() if base_config.plan_cache else None
+    cost_table = SchedulerAlgorithms(vms, cost_model if args.cost_model else None)._class_cost_table()
+    print(f"Menjalankan {len(cells)} sel ({args.backend}) dengan {args.workers} worker...")
+    if args.backend == 'sim':
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {}
+            for cell in cells:
+                tasks = tasks_by_dataset[cell.dataset]
+                key, cached, warm = lookup_plan(cache, cell, base_config, tasks, vms, cost_table)
+                future = pool.submit(run_sim_cell, cell, base_config, tasks, cost_model, cached, warm)
+                futures[future] = (cell, None if cached is not None else key)
+            for future in as_completed(futures):
+                cell, key = futures[future]; results, makespan, plan = future.result()
+                store_plan(cache, key, tasks_by_dataset[cell.dataset], vms, plan)
+                recorder.record(cell, results, makespan, plan[1])
+    else:
+        asyncio.run(run_http_grid(cells, base_config, tasks_by_dataset, cost_model, vms, recorder, args.workers,
+                                  cache, cost_table))
+    if cache is not None: print(f"Cache rencana: {cache.summary()}")
+    recorder.print_summary()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runner grid eksperimen paralel dengan seed deterministik")
+    parser.add_argument('--algorithms', nargs='+', choices=['rr', 'fcfs', 'shc', 'erwca'], default=['rr', 'fcfs', 'shc', 'erwca'])
+    parser.add_argument('--datasets', nargs='+', choices=list(DATASET_FILES), default=list(DATASET_FILES))
+    parser.add_argument('--seeds', nargs='+', type=int, default=list(range(10)), help="Seed per sel (default 0-9).")
+    parser.add_argument('--k-best', nargs='+', type=int, default=[2], help="Nilai k_best ErWCA yang diuji.")
+    parser.add_argument('--shc-iterations', nargs='+', type=int, default=[500], help="Nilai iterasi SHC yang diuji.")
+    parser.add_argument('--shc-batch-size', type=int, default=1, help="Kandidat perpindahan SHC per iterasi.")
+    parser.add_argument('--population', type=int, default=30, help="Ukuran populasi ErWCA.")
+    parser.add_argument('--iterations', type=int, default=100, help="Jumlah iterasi ErWCA.")
+    parser.add_argument('--time-budget', type=float, default=None, help="Batas waktu solver SHC/ErWCA (detik).")
+    parser.add_argument('--gap-tolerance', type=float, default=th.DEFAULT_GAP_TOLERANCE,
+                        help="Hentikan solver jika makespan prediksi <= batas bawah x (1 + toleransi).")
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--dispatch', type=str, choices=['static', 'dynamic'], default='static')
+    parser.add_argument('--cost-model', action='store_true')
+    parser.add_argument('--backend', type=str, choices=['http', 'sim'], default='sim')
+    parser.add_argument('--sim-model', type=str, choices=['analytic', 'learned'], default='analytic')
+    parser.add_argument('--progress-interval', type=float, default=5.0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Jumlah proses di pool.")
+    parser.add_argument('--plan-cache', action='store_true', help="Lewati solver untuk sel yang rencananya ada di cache.")
+    parser.add_argument('--warm-start', action='store_true',
+                        help="Dengan --plan-cache: mulai shc/erwca dari rencana terbaik di cache untuk masalah yang sama.")
+    parser.add_argument('--clean', action='store_true', help="Kosongkan results store sebelum memulai.")
+    args = parser.parse_args()
+    if args.backend == 'http' and not all(spec['ip'] for spec in th.VM_SPECS.values()):
+        print("Error: IP VM belum diatur di .env (VM1_IP ... VM4_IP).", file=sys.stderr); sys.exit(1)
+    main(args)
@@ -0,0 +1,152 @@
+import heapq
+import numpy as np
+
+# VM dikelompokkan ke bucket berdasarkan kolom biaya yang identik (mis. jumlah core sama).
+# Di dalam satu bucket VM terbaik selalu yang bebannya paling kecil, sehingga cukup
+# satu min-heap per bucket. Jika bucket terlalu banyak, dipakai np.argpartition.
+MAX_BUCKETS = 64
+# Untuk armada kecil pemilihan top-k memakai np.argsort penuh seperti versi lama, sehingga
+# urutan kandidat yang nilainya sama (dan hasil random.choice) tetap identik.
+ARGSORT_MAX_VMS = 256
+
+def greedy_assign(task_classes, order, cost_table, k_best=1, choice=None, initial_loads=None):
+    # Menempatkan task sesuai urutan `order` ke VM dengan finish time terkecil. Jika
+    # `choice` diberikan, VM dipilih dengan choice() dari k_best kandidat terbaik yang
+    # terurut menurut (finish time, indeks VM).
+    num_vms = cost_table.shape[1]
+    vm_loads = np.zeros(num_vms) if initial_loads is None else np.array(initial_loads, dtype=float)
+    vm_indices = np.zeros(len(task_classes), dtype=int)
+    num_choices = min(k_best, num_vms)
+    bucket_costs, bucket_of = np.unique(cost_table.T, axis=0, return_inverse=True)
+    if (choice is not None and num_vms <= ARGSORT_MAX_VMS) or len(bucket_costs) > MAX_BUCKETS:
+        _assign_with_argpartition(task_classes, order, cost_table, vm_loads, vm_indices, num_choices, choice)
+    else:
+        _assign_with_heaps(task_classes, order, bucket_costs, bucket_of.ravel(), vm_loads, vm_indices, num_choices, choice)
+    return vm_indices, vm_loads
+
+def _has_tie(heap, cost, load, finish):
+    # Beban yang sama sudah terurut menurut indeks VM di heap; yang perlu dicek hanya beban
+    # berbeda yang finish time-nya sama karena pembulatan float (cukup dua anak akar).
+    size = len(heap)
+    if size > 1:
+        child = heap[1][0]
+        if child != load and child + cost == finish: return True
+        if size > 2:
+            child = heap[2][0]
+            return child != load and child + cost == finish
+    return False
+
+def _pop_candidates(heap, cost, num_choices, popped, candidates, bucket):
+    # Ambil num_choices VM beban terkecil, ditambah VM dengan beban berbeda yang finish
+    # time-nya sama dengan kandidat terakhir (pembulatan float).
+    last_load = last_finish = None; start = len(popped)
+    while heap and (len(popped) - start < num_choices or
+                    heap[0][0] != last_load and heap[0][0] + cost == last_finish):
+        load, vm = heapq.heappop(heap)
+        last_load = load; last_finish = load + cost
+        popped.append((load, vm, bucket))
+        candidates.append((last_finish, vm))
+
+def _assign_best(heaps, costs, buckets):
+    # k = 1: VM dengan (finish time, indeks VM) terkecil. Finish time kembar karena pembulatan
+    # hanya perlu dicek pada bucket yang finish time-nya sama dengan yang terbaik.
+    tops = [heap[0] for heap in heaps]
+    finishes = [top[0] + cost for top, cost in zip(tops, costs)]
+    finish = min(finishes); best = None
+    for bucket in buckets:
+        if finishes[bucket] != finish: continue
+        load, vm = tops[bucket]
+        if _has_tie(heaps[bucket], costs[bucket], load, finish): break
+        if best is None or vm < best[0]: best = (vm, bucket)
+    else:
+        vm, bucket = best
+        heapq.heapreplace(heaps[bucket], (finish, vm))
+        return vm
+    # Ada finish time kembar di dalam bucket: kumpulkan semua kandidat yang kembar.
+    popped = []; candidates = []
+    for bucket in buckets:
+        _pop_candidates(heaps[bucket], costs[bucket], 1, popped, candidates, bucket)
+    vm = min(candidates)[1]
+    _push_back(heaps, costs, popped, vm)
+    return vm
+
+def _second(heap):
+    # Elemen terkecil kedua sebuah heap (anak akar yang lebih kecil), atau None.
+    if len(heap) < 3: return heap[1] if len(heap) == 2 else None
+    return heap[1] if heap[1] < heap[2] else heap[2]
+
+def _assign_top2(heaps, costs, buckets, choice):
+    # k = 2 (ErWCA): dua kandidat terkecil dibaca dari puncak heap dan anak akar tanpa pop/push,
+    # lalu hanya heap VM terpilih yang diperbarui. Hasilnya sama dengan turnamen _assign_top_k.
+    best = second = None
+    for bucket in buckets:
+        load, vm = heaps[bucket][0]
+        candidate = (load + costs[bucket], vm, bucket)
+        if best is None or candidate < best: best, second = candidate, best
+        elif second is None or candidate < second: second = candidate
+    runner_up = _second(heaps[best[2]])
+    if runner_up is not None:
+        candidate = (runner_up[0] + costs[best[2]], runner_up[1], best[2])
+        if second is None or candidate < second: second = candidate
+    vm = choice([best[1], second[1]])
+    finish, _, bucket = best if vm == best[1] else second
+    heap = heaps[bucket]
+    if vm == heap[0][1]:
+        heapq.heapreplace(heap, (finish, vm))
+    else:
+        # Kandidat kedua adalah anak akar bucket terbaik: akar dilepas sementara agar ia menjadi puncak.
+        root = heapq.heappop(heap); heapq.heapreplace(heap, (finish, vm)); heapq.heappush(heap, root)
+    return vm
+
+def _assign_top_k(heaps, costs, num_choices, choice):
+    # Turnamen antar puncak heap: ambil k kandidat terkecil tanpa mengurutkan semua VM.
+    popped = []; top_k = []
+    tops = {bucket: (heap[0][0] + costs[bucket], heap[0][1]) for bucket, heap in enumerate(heaps) if heap}
+    while len(top_k) < num_choices and tops:
+        bucket = min(tops, key=tops.get)
+        load, vm = heapq.heappop(heaps[bucket])
+        popped.append((load, vm, bucket)); top_k.append(vm)
+        heap = heaps[bucket]
+        if heap: tops[bucket] = (heap[0][0] + costs[bucket], heap[0][1])
+        else: del tops[bucket]
+    vm = choice(top_k) if choice is not None else top_k[0]
+    _push_back(heaps, costs, popped, vm)
+    return vm
+
+def _push_back(heaps, costs, popped, vm):
+    for load, popped_vm, bucket in popped:
+        if popped_vm == vm: load += costs[bucket]
+        heapq.heappush(heaps[bucket], (load, popped_vm))
+
+def _assign_with_heaps(task_classes, order, bucket_costs, bucket_of, vm_loads, vm_indices, num_choices, choice):
+    heaps = [[] for _ in range(len(bucket_costs))]
+    for vm, bucket in enumerate(bucket_of):
+        heaps[bucket].append((float(vm_loads[vm]), vm))
+    for heap in heaps: heapq.heapify(heap)
+    bucket_costs = bucket_costs.T.tolist()
+    classes = task_classes.tolist(); buckets = range(len(heaps))
+    for position in order.tolist():
+        costs = bucket_costs[classes[position]]
+        if num_choices == 1: vm = _assign_best(heaps, costs, buckets)
+        elif num_choices == 2 and choice is not None: vm = _assign_top2(heaps, costs, buckets, choice)
+        else: vm = _assign_top_k(heaps, costs, num_choices, choice)
+        vm_indices[position] = vm
+    for heap in heaps:
+        for load, vm in heap: vm_loads[vm] = load
+
+def _assign_with_argpartition(task_classes, order, cost_table, vm_loads, vm_indices, num_choices, choice):
+    num_vms = cost_table.shape[1]
+    for position in order:
+        estimated_times = cost_table[task_classes[position]]
+        potential_finish_times = vm_loads + estimated_times
+        if num_choices == 1 and choice is None:
+            top_k = [int(np.argmin(potential_finish_times))]
+        elif num_vms <= ARGSORT_MAX_VMS:
+            top_k = np.argsort(potential_finish_times)[:num_choices]
+        else:
+            kth_finish = np.partition(potential_finish_times, num_choices - 1)[num_choices - 1]
+            top_k = np.flatnonzero(potential_finish_times <= kth_finish)
+            top_k = top_k[np.lexsort((top_k, potential_finish_times[top_k]))][:num_choices]
+        vm = choice(top_k) if choice is not None else top_k[0]
+        vm_indices[position] = vm
+        vm_loads[vm] += estimated_times[vm]
@@ -0,0 +1,104 @@
+import asyncio
+import numpy as np
+from metrics import LatencyHistogram
+
+# Mitigasi straggler untuk dispatch HTTP per task. Setiap percobaan yang sudah berjalan lebih lama
+# dari persentil ke-p rasio (waktu terukur / prediksi) dikirim ulang sebagai hedge ke VM lain yang
+# paling sedikit bebannya dan masih punya slot kosong; hasil pertama yang berhasil dipakai dan
+# percobaan yang kalah dibatalkan (request HTTP ditutup; komputasi di server tetap berjalan).
+# Percobaan yang gagal diulang dengan backoff eksponensial berbatas.
+
+# Sebelum MIN_HEDGE_SAMPLES rasio terkumpul, ambang hedge = prediksi x HEDGE_FALLBACK_FACTOR.
+HEDGE_FALLBACK_FACTOR = 3.0
+MIN_HEDGE_SAMPLES = 20
+MIN_HEDGE_DELAY = 0.01
+# Paling banyak sebagian kecil task yang di-hedge, agar VM lain tidak dibanjiri duplikat.
+MAX_HEDGE_FRACTION = 0.1
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 8.0
+
+class HedgedExecutor:
+    def __init__(self, vms, cost_table, attempt, results_list, percentile: float = 95, max_retries: int = 2):
+        # attempt(task, vm, started) -> record: satu request tanpa menyimpan record; `started`
+        # (asyncio.Event) di-set saat request benar-benar dikirim (setelah slot VM didapat).
+        self.vms = vms
+        self.vm_cores = np.array([vm.cpu_cores for vm in vms])
+        self.vm_positions = {vm.name: i for i, vm in enumerate(vms)}
+        # Durasi prediksi satu task di VM (satuan sama dengan CostTableDurationModel).
+        self.predicted = cost_table * self.vm_cores[None, :]
+        self.attempt = attempt
+        self.results_list = results_list
+        self.metrics = results_list.metrics
+        self.percentile = percentile
+        self.max_retries = max_retries
+        self.in_flight = np.zeros(len(vms), dtype=int)
+        self.ratios = LatencyHistogram()
+        self.started = 0
+
+    def hedge_delay(self, task, vm_index: int) -> float:
+        factor = self.ratios.percentile(self.percentile) if self.ratios.count >= MIN_HEDGE_SAMPLES else HEDGE_FALLBACK_FACTOR
+        return max(MIN_HEDGE_DELAY, self.predicted[task.index, vm_index] * factor)
+
+    def least_loaded(self, exclude: int, spare_only: bool = False):
+        # VM lain dengan rasio percobaan aktif (termasuk yang menunggu slot) per core terkecil.
+        load = self.in_flight / self.vm_cores
+        candidates = [i for i in range(len(self.vms))
+                      if i != exclude and (not spare_only or self.in_flight[i] < self.vm_cores[i])]
+        return min(candidates, key=lambda i: load[i]) if candidates else None
+
+    async def _attempt(self, task, vm_index: int, started: asyncio.Event):
+        self.in_flight[vm_index] += 1
+        try:
+            record = await self.attempt(task, self.vms[vm_index], started)
+        finally:
+            self.in_flight[vm_index] -= 1
+        if record['exec_time'] > 0:
+            self.ratios.record(record['exec_time'] / max(self.predicted[task.index, vm_index], 1e-9))
+        return record
+
+    async def _hedged(self, task, vm_index: int):
+        started = asyncio.Event()
+        primary = asyncio.ensure_future(self._attempt(task, vm_index, started))
+        if self.percentile <= 0: return await primary
+        # Waktu berjalan dihitung sejak request dikirim, bukan sejak menunggu slot; ambang dihitung
+        # saat itu agar memakai rasio yang sudah terkumpul sampai saat itu.
+        waiter = asyncio.ensure_future(started.wait())
+        await asyncio.wait({primary, waiter}, return_when=asyncio.FIRST_COMPLETED); waiter.cancel()
+        delay = self.hedge_delay(task, vm_index)
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        backup = None
+        while not done:
+            alternative = self.least_loaded(vm_index, spare_only=True)
+            if alternative is not None and self.metrics.hedges < MAX_HEDGE_FRACTION * self.started:
+                backup = asyncio.ensure_future(self._attempt(task, alternative, asyncio.Event()))
+                self.metrics.hedges += 1
+                break
+            # Belum ada VM yang kosong: cek lagi nanti (di akhir run VM lain mulai menganggur).
+            done, _ = await asyncio.wait({primary}, timeout=max(MIN_HEDGE_DELAY, delay / 4))
+        if backup is None: return primary.result()
+        pending = {primary, backup}; record = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                record = finished.result()
+                if record['exec_time'] <= 0: continue
+                for loser in pending: loser.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                if finished is backup: self.metrics.hedge_wins += 1
+                return record
+        return record
+
+    async def execute(self, task, vm, queued: float = 0.0):
+        # queued: waktu task di antrean dispatcher sebelum diambil, ditambahkan ke wait_time.
+        vm_index = self.vm_positions[vm.name]; self.started += 1
+        for attempt in range(self.max_retries + 1):
+            record = await self._hedged(task, vm_index)
+            if record['exec_time'] > 0 or attempt == self.max_retries: break
+            self.metrics.retries += 1
+            await asyncio.sleep(min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+            # Percobaan ulang dikirim ke VM lain yang paling sedikit bebannya (jika ada).
+            other = self.least_loaded(vm_index)
+            if other is not None: vm_index = other
+        if record['wait_time'] >= 0: record['wait_time'] += queued
+        self.results_list.append(record)
+        return record
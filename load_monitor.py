@@ -0,0 +1,100 @@
+import asyncio
+import time
+from collections import namedtuple
+import httpx
+
+# Backpressure dispatcher berbasis telemetri beban worker (/load di server/server.py).
+# LoadMonitor mem-poll semua VM secara berkala, menyimpan tampilan terakhir per VM, dan mengatur
+# batas konkurensi AdaptiveLimiter tiap VM (pengganti asyncio.Semaphore(cpu_cores) yang tetap).
+
+# Tampilan dianggap basi setelah STALE_INTERVALS kali interval tanpa poll yang berhasil;
+# batas VM tersebut kembali ke cpu_cores.
+STALE_INTERVALS = 3
+POLL_TIMEOUT = 2.0
+
+VMLoad = namedtuple('VMLoad', ['in_flight', 'queue_depth', 'exec_time_ewma', 'slowdown', 'load_avg', 'cpu_cores',
+                               'own_active', 'fetched_at'])
+
+class AdaptiveLimiter:
+    # Semaphore dengan batas yang bisa diubah saat berjalan; dipakai dengan `async with` seperti
+    # asyncio.Semaphore. Menurunkan batas tidak membatalkan task yang sedang berjalan, hanya
+    # menahan task berikutnya sampai jumlah aktif turun di bawah batas baru.
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    async def set_limit(self, limit: int):
+        async with self._cond:
+            raised = limit > self.limit
+            self.limit = limit
+            if raised: self._cond.notify_all()
+
+class LoadMonitor:
+    def __init__(self, vms: list, client: httpx.AsyncClient, limiters: dict, port: int, interval: float = 1.0):
+        self.vms = vms
+        self.client = client
+        self.limiters = limiters
+        self.port = port
+        self.interval = interval
+        self.view = {}
+        self.limit_range = {vm.name: (vm.cpu_cores, vm.cpu_cores) for vm in vms}
+        self.polls = 0
+        self.adjustments = 0
+
+    async def _fetch(self, vm):
+        active_at_send = self.limiters[vm.name].active
+        try:
+            response = await self.client.get(f"http://{vm.ip}:{self.port}/load", timeout=POLL_TIMEOUT)
+            response.raise_for_status(); data = response.json()
+        except (httpx.HTTPError, ValueError):
+            return None
+        load_avg = data.get("load_avg")
+        # Task milik klien ini yang mungkin terhitung di snapshot server: jumlah aktif terbesar antara
+        # saat request dikirim dan saat respons diterima.
+        own_active = max(active_at_send, self.limiters[vm.name].active)
+        return VMLoad(data.get("in_flight", 0), data.get("queue_depth", 0), data.get("exec_time_ewma"),
+                      data.get("slowdown_ewma"), load_avg[0] if load_avg else None, data.get("cpu_cores") or vm.cpu_cores,
+                      own_active, time.monotonic())
+
+    def target_limit(self, vm, load: VMLoad | None) -> int:
+        # Batas = cpu_cores dibagi tekanan CPU host (slowdown worker atau load average per core,
+        # minimal 1), dikurangi task milik klien lain yang sedang berjalan/mengantre di server.
+        if load is None or time.monotonic() - load.fetched_at > STALE_INTERVALS * self.interval:
+            return vm.cpu_cores
+        pressure = max(1.0, load.slowdown or 1.0, (load.load_avg or 0.0) / load.cpu_cores)
+        external = max(0, load.in_flight + load.queue_depth - load.own_active)
+        return max(1, min(vm.cpu_cores, round(vm.cpu_cores / pressure) - external))
+
+    async def poll_once(self):
+        loads = await asyncio.gather(*(self._fetch(vm) for vm in self.vms))
+        self.polls += 1
+        for vm, load in zip(self.vms, loads):
+            if load is not None: self.view[vm.name] = load
+            limiter = self.limiters[vm.name]
+            limit = self.target_limit(vm, self.view.get(vm.name))
+            if limit != limiter.limit:
+                self.adjustments += 1
+                await limiter.set_limit(limit)
+            low, high = self.limit_range[vm.name]
+            self.limit_range[vm.name] = (min(low, limit), max(high, limit))
+
+    async def run(self):
+        # Dibatalkan oleh pemanggil setelah semua task selesai.
+        while True:
+            await self.poll_once()
+            await asyncio.sleep(self.interval)
+
+    def summary(self) -> str:
+        limits = ", ".join(f"{name} {low}-{high}" for name, (low, high) in self.limit_range.items())
+        return f"{self.polls} poll beban, {self.adjustments} penyesuaian batas (batas konkurensi: {limits})"
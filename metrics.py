@@ -0,0 +1,158 @@
+import math
+import numpy as np
+
+# Histogram log-linear ala HDR: bucket ke-i mencakup [LOWEST * (1+p)^(i-1), LOWEST * (1+p)^i),
+# sehingga setiap persentil memiliki galat relatif paling besar PRECISION.
+HISTOGRAM_LOWEST = 1e-6
+HISTOGRAM_HIGHEST = 1e5
+HISTOGRAM_PRECISION = 0.01
+PERCENTILES = (50, 95, 99)
+
+class LatencyHistogram:
+    def __init__(self, lowest: float = HISTOGRAM_LOWEST, highest: float = HISTOGRAM_HIGHEST,
+                 precision: float = HISTOGRAM_PRECISION):
+        self.lowest = lowest
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.counts = np.zeros(int(math.ceil(math.log(highest / lowest) / self._log_base)) + 2, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float):
+        bucket = 0 if value < self.lowest else min(len(self.counts) - 1, int(math.log(value / self.lowest) / self._log_base) + 1)
+        self.counts[bucket] += 1
+        self.count += 1; self.total += value
+        if value < self.min: self.min = value
+        if value > self.max: self.max = value
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts += other.counts
+        self.count += other.count; self.total += other.total
+        self.min = min(self.min, other.min); self.max = max(self.max, other.max)
+        return self
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        if self.count == 0: return 0.0
+        rank = max(1, math.ceil(p / 100 * self.count))
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+        # Nilai tengah geometris bucket, dibatasi min/max yang terukur persis.
+        value = self.lowest * (1 + self.precision) ** (bucket - 0.5) if bucket > 0 else self.lowest
+        return min(max(value, self.min), self.max)
+
+class RunMetrics:
+    # Agregator metrik online untuk satu run: setiap record execute_task_on_vm diproses O(1)
+    # saat tiba (beban per VM, jumlah waktu, histogram wait/exec), sehingga metrik bisa dibaca
+    # kapan saja selama run berjalan tanpa membangun DataFrame.
+    def __init__(self, vms: list, total_tasks: int | None = None):
+        self.vms = vms
+        self.total_tasks = total_tasks
+        # Hanya VM dengan minimal satu task sukses, seperti groupby('vm_assigned') pada versi DataFrame.
+        self.vm_loads = {}
+        self.total_cores = sum(vm.cpu_cores for vm in vms)
+        self.exec_hist = LatencyHistogram()
+        self.wait_hist = LatencyHistogram()
+        self.completed = 0
+        self.failed = 0
+        # Diisi HedgedExecutor (hedging.py): duplikat yang dikirim, duplikat yang menang, percobaan ulang.
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+        self.min_start = math.inf
+        self.sum_start = 0.0
+        self.sum_finish = 0.0
+
+    def observe(self, record: dict):
+        exec_time = record['exec_time']
+        if exec_time <= 0:
+            self.failed += 1; return
+        self.completed += 1
+        self.vm_loads[record['vm_assigned']] = self.vm_loads.get(record['vm_assigned'], 0.0) + exec_time
+        self.exec_hist.record(exec_time); self.wait_hist.record(record['wait_time'])
+        start = record['start_time'].timestamp()
+        if start < self.min_start: self.min_start = start
+        self.sum_start += start; self.sum_finish += record['finish_time'].timestamp()
+
+    def merge(self, other: "RunMetrics"):
+        # Menggabungkan metrik run lain atas VM yang berbeda (mis. shard pada mode hierarkis).
+        for name, load in other.vm_loads.items(): self.vm_loads[name] = self.vm_loads.get(name, 0.0) + load
+        self.exec_hist.merge(other.exec_hist); self.wait_hist.merge(other.wait_hist)
+        self.completed += other.completed; self.failed += other.failed
+        self.hedges += other.hedges; self.hedge_wins += other.hedge_wins; self.retries += other.retries
+        self.min_start = min(self.min_start, other.min_start)
+        self.sum_start += other.sum_start; self.sum_finish += other.sum_finish
+        return self
+
+    def imbalance_degree(self) -> float:
+        loads = list(self.vm_loads.values())
+        avg_load = sum(loads) / len(loads) if loads else 0.0
+        return (max(loads) - min(loads)) / avg_load if avg_load > 0 else 0.0
+
+    def utilization(self, elapsed: float) -> float:
+        available = elapsed * self.total_cores
+        return self.exec_hist.total / available if available > 0 else 0.0
+
+    def result(self, makespan: float):
+        # Kunci sama dengan calculate_run_metrics versi DataFrame, ditambah persentil wait/exec.
+        if self.completed == 0: return None
+        n = self.completed
+        metrics = {
+            "Total Tugas Selesai": n, "Makespan (Waktu Total)": makespan,
+            "Throughput": n / makespan if makespan > 0 else 0, "Total CPU Time": self.exec_hist.total,
+            "Total Wait Time": self.wait_hist.total, "Average Start Time (rel)": self.sum_start / n - self.min_start,
+            "Average Execution Time": self.exec_hist.mean(), "Average Finish Time (rel)": self.sum_finish / n - self.min_start,
+            "Imbalance Degree": self.imbalance_degree(), "Resource Utilization (CPU)": self.utilization(makespan) * 100,
+            "Hedged Tasks": self.hedges, "Hedge Wins": self.hedge_wins, "Retries": self.retries
+        }
+        for p in PERCENTILES:
+            metrics[f"Wait Time p{p}"] = self.wait_hist.percentile(p)
+            metrics[f"Execution Time p{p}"] = self.exec_hist.percentile(p)
+        return metrics
+
+    def progress_line(self, elapsed: float) -> str:
+        total = f"/{self.total_tasks}" if self.total_tasks is not None else ""
+        return (f"  [live {elapsed:7.1f}s] selesai {self.completed}{total}, gagal {self.failed} | exec p50/p95/p99 "
+                f"{self.exec_hist.percentile(50):.3f}/{self.exec_hist.percentile(95):.3f}/{self.exec_hist.percentile(99):.3f}s"
+                f" | wait p95 {self.wait_hist.percentile(95):.3f}s | imbalance {self.imbalance_degree():.3f}"
+                f" | util {self.utilization(elapsed):.1%} | hedge {self.hedge_wins}/{self.hedges}, retry {self.retries}")
+
+class StreamingResults(list):
+    # results_list yang meneruskan setiap record ke RunMetrics saat di-append, sehingga semua jalur
+    # eksekusi (per task, batch, dynamic, simulasi) ikut terhitung tanpa diubah.
+    def __init__(self, metrics: RunMetrics, records=()):
+        super().__init__()
+        self.metrics = metrics
+        # Laporan solver (algorithms.SearchReport) untuk rencana yang dijalankan, jika ada.
+        self.search = None
+        self.extend(records)
+
+    def append(self, record):
+        super().append(record)
+        self.metrics.observe(record)
+
+    def extend(self, records):
+        for record in records: self.append(record)
+
+    def merge(self, records, metrics: RunMetrics):
+        # Record yang sudah teragregasi di `metrics` (mis. hasil shard) ditambahkan tanpa diproses ulang.
+        super().extend(records)
+        self.metrics.merge(metrics)
+
+class MetricsSummary:
+    # Gabungan beberapa run: rata-rata metrik skalar dan histogram wait/exec yang di-merge,
+    # sehingga persentil akhir dihitung atas seluruh task dari semua run.
+    def __init__(self):
+        self.runs = []
+        self.exec_hist = LatencyHistogram()
+        self.wait_hist = LatencyHistogram()
+
+    def add(self, run_metrics: RunMetrics, result: dict):
+        self.runs.append(result)
+        self.exec_hist.merge(run_metrics.exec_hist); self.wait_hist.merge(run_metrics.wait_hist)
+
+    def averages(self) -> dict:
+        return {key: sum(run[key] for run in self.runs) / len(self.runs) for key in self.runs[0]} if self.runs else {}
@@ -0,0 +1,233 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+import httpx
+import numpy as np
+
+# Armada worker tiruan untuk benchmark dispatcher tanpa VM sungguhan. Setiap worker adalah
+# subprocess HTTP ringan di alamat loopback berbeda (127.0.0.2, 127.0.0.3, ...) pada port
+# yang sama, sehingga URL http://{vm.ip}:{VM_PORT}/task/<n> di test_harness tidak berubah.
+
+class LatencyModel:
+    # Durasi task = unit * index^2 dikali faktor acak sesuai distribusi (rata-rata faktor = 1).
+    def __init__(self, distribution: str = "fixed", unit: float = 0.001, spread: float = 0.5, seed: int | None = None):
+        self.distribution = distribution
+        self.unit = unit
+        self.spread = spread
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self, index: int) -> float:
+        base = self.unit * index * index
+        if self.distribution == "uniform":
+            return base * self.rng.uniform(1 - self.spread, 1 + self.spread)
+        if self.distribution == "lognormal":
+            return base * self.rng.lognormal(-self.spread ** 2 / 2, self.spread)
+        if self.distribution == "exponential":
+            return base * self.rng.exponential(1.0)
+        return base
+
+def burn_cpu(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+class MockWorker:
+    def __init__(self, latency: LatencyModel, mode: str, cpu_cores: int):
+        self.latency = latency
+        self.mode = mode
+        self.cpu_cores = cpu_cores
+        self.completed = 0
+        self.total_service_time = 0.0
+        self.exec_time_ewma = None
+        self.in_flight = 0
+
+    async def _task(self, task_size: str):
+        try:
+            index = int(task_size)
+        except ValueError:
+            return 400, {"status": False, "message": "Index must be a number between 1 - 10"}
+        if index < 1 or index > 10:
+            return 400, {"status": False, "message": "Index must be between 1 - 10"}
+        duration = self.latency.sample(index)
+        start_time = time.perf_counter(); self.in_flight += 1
+        try:
+            if self.mode == "burn":
+                await asyncio.get_running_loop().run_in_executor(None, burn_cpu, duration)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            self.in_flight -= 1
+        exec_time = time.perf_counter() - start_time
+        self.completed += 1; self.total_service_time += exec_time
+        self.exec_time_ewma = exec_time if self.exec_time_ewma is None else 0.8 * self.exec_time_ewma + 0.2 * exec_time
+        return 200, {"status": True, "message": f"task-{index} run successfully", "task": f"task-{index}",
+                     "requested_cpu_load": index * index * 10000, "execution_time": f"{exec_time:.4f}s",
+                     "timings": {"queue": 0.0, "compute": round(exec_time, 6)}}
+
+    async def route(self, method: str, path: str):
+        if method == "GET" and path == "/health":
+            now = f"{date.today().strftime('%d-%m-%Y')} {datetime.now().strftime('%H:%M:%S')}"
+            return 200, {"status": True, "message": "🌟 Server is healthy!", "date": now,
+                         "calibration": {"mode": "mock", "workers": self.cpu_cores, "capacity": self.cpu_cores}}
+        if method == "GET" and path == "/stats":
+            return 200, {"status": True, "cpu_cores": self.cpu_cores, "completed": self.completed,
+                         "in_flight": self.in_flight, "total_service_time": self.total_service_time}
+        if method == "GET" and path == "/load":
+            # load_avg host tidak mewakili VM tiruan ini, jadi tidak dilaporkan.
+            return 200, {"status": True, "cpu_cores": self.cpu_cores, "in_flight": self.in_flight, "queue_depth": 0,
+                         "exec_time_ewma": self.exec_time_ewma,
+                         "slowdown_ewma": None, "load_avg": None}
+        if method == "GET" and path.startswith("/task/"):
+            return await self._task(path[len("/task/"):])
+        return 404, {"status": False, "message": "Not found"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # HTTP/1.1 minimal dengan keep-alive agar connection pool httpx dipakai ulang.
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line: break
+                content_length = 0; keep_alive = True
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""): break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.lower() == "content-length": content_length = int(value.strip())
+                    if name.lower() == "connection" and value.strip().lower() == "close": keep_alive = False
+                if content_length: await reader.readexactly(content_length)
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                status, payload = await self.route(method, path)
+                body = json.dumps(payload).encode()
+                reason = {200: "OK", 400: "BAD REQUEST", 404: "NOT FOUND"}[status]
+                writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+                await writer.drain()
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(host: str, port: int, worker: MockWorker):
+    server = await asyncio.start_server(worker.handle, host, port, backlog=4096)
+    async with server:
+        await server.serve_forever()
+
+class MockFleet:
+    # Menjalankan N worker sebagai subprocess; dipakai sebagai context manager.
+    def __init__(self, num_workers: int, port: int, cpu_cores: list[int], distribution: str, unit: float,
+                 spread: float, mode: str, seed: int | None = None):
+        self.num_workers = num_workers
+        self.port = port
+        self.cpu_cores = cpu_cores
+        self.worker_args = ["--distribution", distribution, "--unit", str(unit), "--spread", str(spread), "--mode", mode]
+        self.seed = seed
+        self.processes = []
+
+    def host(self, i: int) -> str:
+        return f"127.0.0.{i + 2}"
+
+    def vm_specs(self) -> dict:
+        # Format yang sama dengan VM_SPECS di test_harness.
+        return {f"vm{i + 1}": {"ip": self.host(i), "cpu": self.cpu_cores[i % len(self.cpu_cores)]} for i in range(self.num_workers)}
+
+    def __enter__(self):
+        for i in range(self.num_workers):
+            args = [sys.executable, os.path.abspath(__file__), "serve", "--host", self.host(i), "--port", str(self.port),
+                    "--cores", str(self.cpu_cores[i % len(self.cpu_cores)]), *self.worker_args]
+            if self.seed is not None: args += ["--seed", str(self.seed + i)]
+            self.processes.append(subprocess.Popen(args))
+        self._wait_healthy()
+        return self
+
+    def _wait_healthy(self, timeout: float = 15.0):
+        deadline = time.monotonic() + timeout
+        for i in range(self.num_workers):
+            while True:
+                try:
+                    if httpx.get(f"http://{self.host(i)}:{self.port}/health", timeout=1.0).status_code == 200: break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline: raise RuntimeError(f"Worker tiruan {self.host(i)} tidak merespons")
+                time.sleep(0.05)
+
+    def stats(self) -> list[dict]:
+        return [httpx.get(f"http://{self.host(i)}:{self.port}/stats", timeout=5.0).json() for i in range(self.num_workers)]
+
+    def __exit__(self, *exc):
+        for process in self.processes: process.terminate()
+        for process in self.processes: process.wait()
+        self.processes = []
+
+async def monitor_loop_lag(samples: list, interval: float = 0.01):
+    # Lag event loop = keterlambatan bangun dari asyncio.sleep(interval).
+    while True:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - expected))
+
+async def run_benchmark(vms: list, tasks, algorithm: str):
+    import test_harness
+    lag_samples = []
+    monitor = asyncio.create_task(monitor_loop_lag(lag_samples))
+    wall_start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results, makespan = await test_harness.run_single_test(0, algorithm, "mock", vms, tasks)
+    wall_time = time.perf_counter() - wall_start
+    monitor.cancel()
+    return results, makespan, wall_time, lag_samples
+
+def bench(args):
+    import test_harness
+    from taskset import TaskSet
+    cores = [int(c) for c in args.cores.split(",")]
+    rng = np.random.default_rng(args.seed)
+    tasks = TaskSet(np.arange(args.tasks), rng.integers(1, 11, args.tasks))
+    with MockFleet(args.workers, args.port, cores, args.distribution, args.unit, args.spread, args.mode, args.seed) as fleet:
+        test_harness.VM_SPECS = fleet.vm_specs(); test_harness.VM_PORT = args.port
+        vms = [test_harness.VM(name, spec["ip"], spec["cpu"]) for name, spec in test_harness.VM_SPECS.items()]
+        results, makespan, wall_time, lag = asyncio.run(run_benchmark(vms, tasks, args.algorithm))
+        stats = fleet.stats()
+    ok = [r for r in results if r["exec_time"] > 0]
+    client_time = sum(r["exec_time"] for r in ok)
+    service_time = sum(s["total_service_time"] for s in stats)
+    lag = np.array(lag) if lag else np.zeros(1)
+    print(f"--- Benchmark dispatcher: {args.tasks} tugas, {args.workers} worker tiruan ({args.mode}, {args.distribution}) ---")
+    print(f"Tugas berhasil            : {len(ok)}/{len(results)}")
+    print(f"Makespan                  : {makespan:.4f} detik (wall {wall_time:.4f} detik)")
+    print(f"Requests/sec              : {len(ok) / makespan if makespan > 0 else 0:.1f}")
+    print(f"Overhead dispatcher/tugas : {(client_time - service_time) / max(1, len(ok)) * 1000:.3f} ms")
+    print(f"Event-loop lag            : mean {lag.mean() * 1000:.3f} ms, p99 {np.percentile(lag, 99) * 1000:.3f} ms, "
+          f"max {lag.max() * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Armada worker tiruan untuk benchmark dispatcher")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "bench"):
+        p = sub.add_parser(name)
+        p.add_argument("--port", type=int, default=5000)
+        p.add_argument("--distribution", choices=["fixed", "uniform", "lognormal", "exponential"], default="fixed")
+        p.add_argument("--unit", type=float, default=0.001, help="Detik per index^2.")
+        p.add_argument("--spread", type=float, default=0.5)
+        p.add_argument("--mode", choices=["sleep", "burn"], default="sleep")
+        p.add_argument("--seed", type=int, default=None)
+    serve_parser = sub.choices["serve"]
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--cores", type=int, default=1)
+    bench_parser = sub.choices["bench"]
+    bench_parser.add_argument("--workers", type=int, default=4)
+    bench_parser.add_argument("--cores", default="1,2,4,8", help="Jumlah core per worker (diulang bergiliran).")
+    bench_parser.add_argument("--tasks", type=int, default=10000)
+    bench_parser.add_argument("--algorithm", choices=["rr", "fcfs", "shc", "erwca"], default="fcfs")
+    args = parser.parse_args()
+    if args.command == "serve":
+        worker = MockWorker(LatencyModel(args.distribution, args.unit, args.spread, args.seed), args.mode, args.cores)
+        asyncio.run(serve(args.host, args.port, worker))
+    else:
+        bench(args)
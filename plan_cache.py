@@ -0,0 +1,155 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict, namedtuple
+import numpy as np
+from algorithms import SearchReport
+from taskset import Assignment
+
+# Cache rencana penjadwalan yang dialamatkan oleh isi masalahnya: histogram kelas task, konfigurasi
+# VM (nama, core) dan tabel biaya solver, ditambah algoritma, parameternya dan seed. Biaya task hanya
+# bergantung pada kelasnya, sehingga rencana disimpan sebagai vektor indeks VM yang diurutkan per
+# kelas (urutan task di dalam kelas dipertahankan) dan bisa dipasang ke dataset mana pun dengan
+# histogram yang sama. Lapisan memori berupa LRU; lapisan disk berupa satu file .npy per rencana
+# dan index.json, dengan eviksi LRU berdasarkan total ukuran file. Hanya satu proses penulis.
+
+PLAN_CACHE_DIR = ".plan_cache"
+INDEX_FILE = "index.json"
+PLAN_CACHE_MEMORY_ENTRIES = 64
+PLAN_CACHE_MAX_BYTES = 64 << 20
+
+# plan: kunci rencana lengkap; problem: kunci masalah saja (tanpa algoritma, parameter dan seed),
+# dipakai untuk mencari rencana terbaik sebagai warm start.
+PlanKey = namedtuple('PlanKey', ['plan', 'problem'])
+
+def plan_key(tasks, vms, cost_table, algorithm: str, params: dict, seed) -> PlanKey:
+    problem = hashlib.sha256()
+    problem.update(np.ascontiguousarray(tasks.class_counts(), dtype=np.int64).tobytes())
+    problem.update(json.dumps([[vm.name, vm.cpu_cores] for vm in vms]).encode())
+    problem.update(np.ascontiguousarray(cost_table, dtype=np.float64).tobytes())
+    plan = hashlib.sha256(problem.digest())
+    plan.update(json.dumps([algorithm, params, seed], sort_keys=True, default=str).encode())
+    return PlanKey(plan.hexdigest(), problem.hexdigest())
+
+def _class_order(tasks) -> np.ndarray:
+    return np.argsort(tasks.indices, kind='stable')
+
+class PlanCache:
+    def __init__(self, root: str = PLAN_CACHE_DIR, max_bytes: int = PLAN_CACHE_MAX_BYTES,
+                 memory_entries: int = PLAN_CACHE_MEMORY_ENTRIES):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self._index = None
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+        self.evictions = 0
+
+    @property
+    def index(self) -> dict:
+        # key rencana -> {problem, bytes, last_used, search}
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r') as f:
+                    self._index = json.load(f)
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _plan_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.npy")
+
+    def clear(self):
+        if os.path.exists(self.root): shutil.rmtree(self.root)
+        self.memory.clear(); self._index = None
+
+    def _remember(self, key: str, plan: np.ndarray, search: dict):
+        self.memory[key] = (plan, search); self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries: self.memory.popitem(last=False)
+
+    def _load(self, key: str):
+        # (vektor per kelas, laporan solver) dari memori atau disk; None jika tidak ada.
+        if key in self.memory:
+            self.memory.move_to_end(key); return self.memory[key]
+        entry = self.index.get(key)
+        if entry is None: return None
+        try:
+            plan = np.load(self._plan_path(key))
+        except (OSError, ValueError):
+            del self.index[key]; self._save_index(); return None
+        self._remember(key, plan, entry["search"])
+        return plan, entry["search"]
+
+    def _assignment(self, plan: np.ndarray, search: dict, tasks, vms) -> Assignment | None:
+        if len(plan) != len(tasks) or (len(plan) and plan.max() >= len(vms)): return None
+        vm_indices = np.empty(len(tasks), dtype=np.int32); vm_indices[_class_order(tasks)] = plan
+        assignment = Assignment(tasks, vm_indices, vms)
+        assignment.search = SearchReport(**search) if search is not None else None
+        return assignment
+
+    def get(self, key: PlanKey, tasks, vms) -> Assignment | None:
+        started = time.monotonic()
+        cached = self._load(key.plan)
+        assignment = self._assignment(*cached, tasks, vms) if cached is not None else None
+        if assignment is None:
+            self.misses += 1; return None
+        self.hits += 1
+        if key.plan in self.index:
+            self.index[key.plan]["last_used"] = time.time(); self._save_index()
+        # Laporan solver asli dipertahankan; waktu dan alasan berhenti mencerminkan pengambilan dari cache.
+        if assignment.search is not None:
+            assignment.search = assignment.search._replace(elapsed=time.monotonic() - started, stop_reason="cached")
+        return assignment
+
+    def warm_start(self, key: PlanKey, tasks, vms) -> Assignment | None:
+        # Rencana dengan makespan prediksi terkecil untuk masalah yang sama (algoritma/parameter apa pun).
+        candidates = [(entry["search"]["makespan"], plan) for plan, entry in self.index.items()
+                      if entry["problem"] == key.problem and entry["search"] is not None]
+        for _, plan in sorted(candidates):
+            cached = self._load(plan)
+            assignment = self._assignment(*cached, tasks, vms) if cached is not None else None
+            if assignment is not None:
+                self.warm_starts += 1; return assignment
+        return None
+
+    def put(self, key: PlanKey, assignment: Assignment):
+        plan = assignment.vm_indices[_class_order(assignment.tasks)]
+        plan = plan.astype(np.min_scalar_type(max(len(assignment.vms) - 1, 0)))
+        search = assignment.search._asdict() if assignment.search is not None else None
+        self._remember(key.plan, plan, search)
+        os.makedirs(self.root, exist_ok=True)
+        path = self._plan_path(key.plan); tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, plan)
+        os.replace(tmp_path, path)
+        self.index[key.plan] = {"problem": key.problem, "bytes": os.path.getsize(path), "last_used": time.time(),
+                                "search": search}
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        # Rencana yang paling lama tidak dipakai dihapus dari disk sampai total ukuran <= max_bytes.
+        total = sum(entry["bytes"] for entry in self.index.values())
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_used"]):
+            if total <= self.max_bytes: break
+            total -= self.index.pop(key)["bytes"]; self.evictions += 1
+            self.memory.pop(key, None)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._plan_path(key))
+
+    def summary(self) -> str:
+        total = sum(entry["bytes"] for entry in self.index.values())
+        return (f"{self.hits} hit, {self.misses} miss, {self.warm_starts} warm start, {self.evictions} eviksi "
+                f"({len(self.index)} rencana, {total / 1024:.1f} KiB di {self.root})")
@@ -0,0 +1,228 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import shutil
+import sys
+import time
+import numpy as np
+from taskset import DATASET_FILES
+
+RESULTS_STORE_DIR = "results_store"
+MANIFEST_FILE = "manifest.json"
+# Kolom per baris hasil; run_id, algorithm, dataset dan nama VM disimpan sekali per chunk di manifest.
+# Setiap kolom adalah satu file biner mentah (<nama>.bin) yang hanya ditambah di ujungnya.
+COLUMNS = {"task_id": np.int64, "task_index": np.int8, "vm": np.int32, "start_time_rel": np.float64,
+           "exec_time": np.float64, "finish_time_rel": np.float64, "wait_time": np.float64}
+CSV_IMPORTS = ["all_runs_results.csv", "all_runs_erwca.csv", "results_erwca.csv"]
+
+class ResultsStore:
+    # Penyimpanan hasil kolomnar append-only: setiap run ditulis sekaligus sebagai satu chunk, yaitu
+    # rentang baris [offset, offset + rows) di setiap file kolom, dan manifest.json mencatat
+    # metadata serta ringkasan per chunk. Pembacaan memakai np.memmap sehingga hanya chunk yang
+    # lolos filter disentuh, dan perbandingan antar-run cukup membaca ringkasan di manifest.
+    # Hanya satu proses penulis.
+    def __init__(self, root: str = RESULTS_STORE_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_FILE)
+        self._manifest = None
+
+    @property
+    def manifest(self) -> dict:
+        if self._manifest is None:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, 'r') as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {"next_chunk": 0, "rows": 0, "chunks": []}
+        return self._manifest
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def clear(self):
+        if os.path.exists(self.root): shutil.rmtree(self.root)
+        self._manifest = None
+
+    def append_run(self, results_list: list, run_id, algorithm: str, dataset: str, tasks=None,
+                   makespan: float | None = None, source: str | None = None, solver: dict | None = None,
+                   backend: str = "http"):
+        # Menulis semua record satu run (format execute_task_on_vm) sebagai satu chunk.
+        # `tasks` (TaskSet) dipakai untuk mengisi kolom task_index dari task_id; `makespan`
+        # (waktu total terukur harness) menggantikan makespan dari rentang start/finish;
+        # `solver` (laporan solver: batas bawah, gap, alasan berhenti) disimpan apa adanya;
+        # `backend` ("http" atau "sim") menandai apakah waktu berasal dari VM sungguhan atau simulasi.
+        if not results_list: return None
+        valid_start_times = [r['start_time'] for r in results_list if r['start_time']]
+        if not valid_start_times: return None
+        min_start = min(valid_start_times)
+        vm_names = sorted({r['vm_assigned'] for r in results_list})
+        vm_codes = {name: code for code, name in enumerate(vm_names)}
+        task_ids = np.array([r['task_id'] for r in results_list], dtype=np.int64)
+        if tasks is not None and len(tasks):
+            index_of = np.zeros(int(tasks.ids.max()) + 1, dtype=np.int8); index_of[tasks.ids] = tasks.indices
+            task_index = index_of[task_ids]
+        else:
+            task_index = np.zeros(len(task_ids), dtype=np.int8)
+        columns = {"task_id": task_ids, "task_index": task_index,
+                   "vm": np.array([vm_codes[r['vm_assigned']] for r in results_list]),
+                   "start_time_rel": np.array([(r['start_time'] - min_start).total_seconds() for r in results_list]),
+                   "exec_time": np.array([r['exec_time'] for r in results_list]),
+                   "finish_time_rel": np.array([(r['finish_time'] - min_start).total_seconds() for r in results_list]),
+                   "wait_time": np.array([r['wait_time'] for r in results_list])}
+        return self.append_columns(columns, vm_names, run_id, algorithm, dataset, makespan, source, solver, backend)
+
+    def append_columns(self, columns: dict, vm_names: list, run_id, algorithm: str, dataset: str,
+                       makespan: float | None = None, source: str | None = None, solver: dict | None = None,
+                       backend: str = "http"):
+        manifest = self.manifest
+        os.makedirs(self.root, exist_ok=True)
+        offset = manifest["rows"]; rows = int(len(columns["task_id"]))
+        # Data kolom ditulis dulu, manifest terakhir: sisa tulisan yang gagal di ujung file
+        # tidak pernah dirujuk manifest dan ditimpa oleh append berikutnya.
+        for name, dtype in COLUMNS.items():
+            with open(self._column_path(name), 'ab') as f:
+                f.truncate(offset * np.dtype(dtype).itemsize)
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+        entry = {"chunk": f"chunk-{manifest['next_chunk']:06d}", "run_id": run_id, "algorithm": algorithm,
+                 "dataset": dataset, "vms": list(vm_names), "offset": offset, "rows": rows, "source": source,
+                 "backend": backend, "written_at": time.time(), "summary": self._summarize(columns, len(vm_names))}
+        if makespan is not None: entry["summary"]["makespan"] = float(makespan)
+        if solver is not None: entry["solver"] = solver
+        manifest["chunks"].append(entry); manifest["next_chunk"] += 1; manifest["rows"] += rows
+        self._save_manifest()
+        return entry
+
+    @staticmethod
+    def _summarize(columns: dict, num_vms: int) -> dict:
+        # Ringkasan per run untuk perbandingan cepat tanpa membuka file kolom.
+        success = np.asarray(columns["exec_time"]) > 0
+        exec_time = np.asarray(columns["exec_time"], dtype=float)[success]
+        vm_exec = np.bincount(np.asarray(columns["vm"])[success], weights=exec_time, minlength=num_vms)
+        finish = np.asarray(columns["finish_time_rel"], dtype=float)[success]
+        start = np.asarray(columns["start_time_rel"], dtype=float)[success]
+        return {"completed": int(success.sum()), "makespan": float(finish.max() - start.min()) if success.any() else 0.0,
+                "total_exec_time": float(exec_time.sum()),
+                "total_wait_time": float(np.asarray(columns["wait_time"], dtype=float)[success].sum()),
+                "vm_exec_time": vm_exec.tolist()}
+
+    def chunks(self, algorithm=None, dataset=None, run_id=None) -> list:
+        return [entry for entry in self.manifest["chunks"]
+                if (algorithm is None or entry["algorithm"] == algorithm)
+                and (dataset is None or entry["dataset"] == dataset)
+                and (run_id is None or entry["run_id"] == run_id)]
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.root, f"{name}.bin")
+
+    def column(self, name: str) -> np.ndarray:
+        # Seluruh kolom sebagai memmap read-only (hanya baris yang tercatat di manifest).
+        rows = self.manifest["rows"]
+        if rows == 0: return np.zeros(0, dtype=COLUMNS[name])
+        return np.memmap(self._column_path(name), dtype=COLUMNS[name], mode='r', shape=(rows,))
+
+    def load_chunk(self, entry: dict, columns=None) -> dict:
+        return {name: self.column(name)[entry["offset"]:entry["offset"] + entry["rows"]] for name in (columns or COLUMNS)}
+
+    def read(self, algorithm=None, dataset=None, run_id=None, columns=None) -> dict:
+        # Menggabungkan kolom dari chunk yang lolos filter; kolom "chunk" berisi posisi chunk
+        # di daftar hasil filter agar baris bisa dipetakan balik ke run_id/nama VM.
+        entries = self.chunks(algorithm, dataset, run_id)
+        names = list(columns or COLUMNS)
+        result = {}
+        for name in names:
+            column = self.column(name)
+            result[name] = np.concatenate([column[e["offset"]:e["offset"] + e["rows"]] for e in entries]) \
+                if entries else np.zeros(0, dtype=COLUMNS[name])
+        result["chunk"] = np.repeat(np.arange(len(entries)), [entry["rows"] for entry in entries]).astype(np.int32)
+        return result
+
+    def summary(self, algorithm=None, dataset=None, run_id=None) -> list:
+        # Metrik per run dari ringkasan manifest (tanpa membaca kolom).
+        rows = []
+        for entry in self.chunks(algorithm, dataset, run_id):
+            s = entry["summary"]; vm_exec = np.array(s["vm_exec_time"]); makespan = s["makespan"]
+            # Hanya VM dengan minimal satu task sukses (exec_time > 0), seperti RunMetrics.
+            vm_exec = vm_exec[vm_exec > 0]
+            avg_load = vm_exec.mean() if len(vm_exec) else 0.0
+            rows.append({"chunk": entry["chunk"], "run_id": entry["run_id"], "algorithm": entry["algorithm"],
+                         "dataset": entry["dataset"], "backend": entry.get("backend", "http"), "completed": s["completed"], "makespan": makespan,
+                         "throughput": s["completed"] / makespan if makespan > 0 else 0.0,
+                         "total_exec_time": s["total_exec_time"], "total_wait_time": s["total_wait_time"],
+                         "imbalance_degree": (vm_exec.max() - vm_exec.min()) / avg_load if avg_load > 0 else 0.0})
+        return rows
+
+    def import_csv(self, path: str) -> int:
+        # Impor sekali jalan dari CSV lama. Baris berurutan dengan (run_id, algorithm, dataset)
+        # yang sama menjadi satu chunk; run_id yang berulang di pemanggilan harness berbeda tetap
+        # menjadi chunk terpisah. Format all_runs_erwca.csv/results_erwca.csv (scheduler.py)
+        # tidak punya kolom algorithm/dataset sehingga dicatat sebagai erwca pada dataset.txt.
+        source = f"csv:{os.path.basename(path)}"
+        if any(entry["source"] == source for entry in self.manifest["chunks"]):
+            print(f"{path} sudah pernah diimpor, dilewati."); return 0
+        dataset_indices = {}
+        with open(path, 'r', newline='') as f:
+            reader = csv.DictReader(f)
+            default_run = os.path.splitext(os.path.basename(path))[0]
+
+            def key(row):
+                run_id = row.get("run_id", default_run)
+                run_id = int(run_id) if run_id.isdigit() else run_id
+                return run_id, row.get("algorithm", "erwca"), row.get("dataset", "dataset.txt")
+
+            imported = 0
+            for (run_id, algorithm, dataset), rows in itertools.groupby(reader, key=key):
+                rows = list(rows)
+                task_ids = np.array([int(row.get("task_id", row.get("index"))) for row in rows])
+                if "task_name" in rows[0]:
+                    task_index = np.array([int(row["task_name"].split('-')[1]) for row in rows])
+                elif dataset in DATASET_FILES and os.path.exists(DATASET_FILES[dataset]):
+                    if dataset not in dataset_indices:
+                        with open(DATASET_FILES[dataset], 'r') as d:
+                            dataset_indices[dataset] = np.array([int(line.strip() or 0) for line in d])
+                    task_index = dataset_indices[dataset][task_ids]
+                else:
+                    task_index = np.zeros(len(rows))
+                vm_names = sorted({row["vm_assigned"] for row in rows})
+                vm_codes = {name: code for code, name in enumerate(vm_names)}
+                start_column = "start_time_rel" if "start_time_rel" in rows[0] else "start_time"
+                finish_column = "finish_time_rel" if "finish_time_rel" in rows[0] else "finish_time"
+                columns = {"task_id": task_ids, "task_index": task_index,
+                           "vm": np.array([vm_codes[row["vm_assigned"]] for row in rows]),
+                           "start_time_rel": np.array([float(row[start_column]) for row in rows]),
+                           "exec_time": np.array([float(row["exec_time"]) for row in rows]),
+                           "finish_time_rel": np.array([float(row[finish_column]) for row in rows]),
+                           "wait_time": np.array([float(row["wait_time"]) for row in rows])}
+                self.append_columns(columns, vm_names, run_id, algorithm, dataset, source=source)
+                imported += len(rows)
+        print(f"Mengimpor {imported} baris dari {path}")
+        return imported
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Penyimpanan hasil kolomnar (file kolom .bin + manifest.json)")
+    parser.add_argument('--root', default=RESULTS_STORE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_parser = sub.add_parser("import", help="Impor CSV hasil lama ke store.")
+    import_parser.add_argument('paths', nargs='*', default=CSV_IMPORTS)
+    summary_parser = sub.add_parser("summary", help="Bandingkan metrik antar run dari manifest.")
+    summary_parser.add_argument('--algorithm', default=None)
+    summary_parser.add_argument('--dataset', default=None)
+    args = parser.parse_args()
+    store = ResultsStore(args.root)
+    if args.command == "import":
+        for path in args.paths:
+            if os.path.exists(path): store.import_csv(path)
+            else: print(f"Peringatan: {path} tidak ditemukan.", file=sys.stderr)
+    else:
+        start = time.perf_counter()
+        rows = store.summary(args.algorithm, args.dataset)
+        elapsed = time.perf_counter() - start
+        print(f"{'chunk':>12} {'run':>16} {'algoritma':>14} {'dataset':>11} {'backend':>7} {'tugas':>6} {'makespan':>10} {'throughput':>10} {'imbalance':>9}")
+        for row in rows:
+            print(f"{row['chunk']:>12} {str(row['run_id']):>16} {row['algorithm']:>14} {row['dataset']:>11} {row['backend']:>7} {row['completed']:>6} "
+                  f"{row['makespan']:>10.4f} {row['throughput']:>10.4f} {row['imbalance_degree']:>9.4f}")
+        print(f"\n{len(rows)} run dibandingkan dalam {elapsed * 1000:.2f} ms")
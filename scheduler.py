@@ -1,15 +1,19 @@
+import argparse
 import asyncio
 import httpx
 import time
 from datetime import datetime
 import csv
-import pandas as pd
 import sys
 import os
 from dotenv import load_dotenv
 from collections import namedtuple
 
 from erwca_algorithm import SchedulerAlgorithm
+from taskset import Task, TaskSet
+from results_store import ResultsStore
+from metrics import RunMetrics, StreamingResults
+from load_monitor import AdaptiveLimiter, LoadMonitor
 
 load_dotenv()
 
@@ -23,14 +27,13 @@ VM_PORT = 5000
 DATASET_FILE = 'dataset.txt'
 
 VM = namedtuple('VM', ['name', 'ip', 'cpu_cores', 'ram_gb'])
-Task = namedtuple('Task', ['id', 'name', 'index', 'cpu_load'])
 
 # --- (Fungsi load_tasks dan execute_task_on_vm tetap sama) ---
-def load_tasks(dataset_path: str) -> list[Task]:
+def load_tasks(dataset_path: str) -> TaskSet:
     if not os.path.exists(dataset_path):
         print(f"Error: File dataset '{dataset_path}' tidak ditemukan.", file=sys.stderr)
         sys.exit(1)
-    tasks = []
+    ids = []; indices = []
     with open(dataset_path, 'r') as f:
         for i, line in enumerate(f):
             try:
@@ -38,11 +41,10 @@ def load_tasks(dataset_path: str) -> list[Task]:
                 if not 1 <= index <= 10:
                     print(f"Peringatan: Task index {index} di baris {i+1} di luar rentang (1-10).")
                     continue
-                cpu_load = (index ** 2) * 10000
-                task_name = f"task-{index}-{i}"
-                tasks.append(Task(id=i, name=task_name, index=index, cpu_load=cpu_load))
+                ids.append(i); indices.append(index)
             except ValueError:
                 print(f"Peringatan: Mengabaikan baris {i+1} yang tidak valid: '{line.strip()}'")
+    tasks = TaskSet(ids, indices)
     print(f"Berhasil memuat {len(tasks)} tugas dari {dataset_path}")
     return tasks
 
@@ -65,7 +67,7 @@ async def execute_task_on_vm(task: Task, vm: VM, client: httpx.AsyncClient,
         if task_start_time is None: task_start_time = datetime.now()
         if task_finish_time is None: task_finish_time = datetime.now()
         results_list.append({
-            "index": task.id, "task_name": task.name, "vm_assigned": vm.name,
+            "task_id": task.id, "task_name": task.name, "vm_assigned": vm.name,
             "start_time": task_start_time, "exec_time": task_exec_time,
             "finish_time": task_finish_time, "wait_time": task_wait_time
         })
@@ -83,8 +85,8 @@ def write_results_to_csv(results_list: list, run_id: str):
     
     formatted_results = []
     for r in results_list:
-        new_r = r.copy()
-        new_r['run_id'] = run_id
+        new_r = {key: value for key, value in r.items() if key in headers}
+        new_r['run_id'] = run_id; new_r['index'] = r['task_id']
         new_r['start_time'] = (r['start_time'] - min_start_time).total_seconds()
         new_r['finish_time'] = (r['finish_time'] - min_start_time).total_seconds()
         formatted_results.append(new_r)
@@ -101,65 +103,51 @@ def write_results_to_csv(results_list: list, run_id: str):
     except IOError as e:
         print(f"Error menulis ke CSV: {e}", file=sys.stderr)
 
-# --- (Fungsi calculate_and_print_metrics tetap sama) ---
+# --- Metrik dihitung oleh RunMetrics yang diperbarui setiap record tiba (lihat metrics.py) ---
 def calculate_and_print_metrics(results_list: list, vms: list[VM], total_schedule_time: float, run_id: str):
-    df = pd.DataFrame(results_list); success_df = df[df['exec_time'] > 0].copy()
-    if success_df.empty:
+    metrics = getattr(results_list, 'metrics', None)
+    if metrics is None: metrics = StreamingResults(RunMetrics(vms), results_list).metrics
+    result = metrics.result(total_schedule_time)
+    if result is None:
         print("Tidak ada tugas yang berhasil diselesaikan."); return
-    
-    num_tasks = len(success_df)
-    total_cpu_time = success_df['exec_time'].sum()
-    total_wait_time = success_df['wait_time'].sum()
-    avg_exec_time = success_df['exec_time'].mean()
-    
-    min_start = success_df['start_time'].min()
-    success_df['rel_start_time'] = (success_df['start_time'] - min_start).dt.total_seconds()
-    success_df['rel_finish_time'] = (success_df['finish_time'] - min_start).dt.total_seconds()
-    avg_start_time = success_df['rel_start_time'].mean()
-    avg_finish_time = success_df['rel_finish_time'].mean()
-    
-    makespan = total_schedule_time
-    throughput = num_tasks / makespan if makespan > 0 else 0
-    
-    vm_exec_times = success_df.groupby('vm_assigned')['exec_time'].sum()
-    max_load = vm_exec_times.max(); min_load = vm_exec_times.min(); avg_load = vm_exec_times.mean()
-    imbalance_degree = (max_load - min_load) / avg_load if avg_load > 0 else 0
-    
-    total_cores = sum(vm.cpu_cores for vm in vms)
-    total_available_cpu_time = makespan * total_cores
-    resource_utilization = total_cpu_time / total_available_cpu_time if total_available_cpu_time > 0 else 0
 
     print("\n--- Hasil ---")
-    print(f"Total Tugas Selesai       : {num_tasks}")
-    print(f"Makespan (Waktu Total)    : {makespan:.4f} detik")
-    print(f"Throughput                : {throughput:.4f} tugas/detik")
-    print(f"Total CPU Time            : {total_cpu_time:.4f} detik")
-    print(f"Total Wait Time           : {total_wait_time:.4f} detik")
-    print(f"Average Start Time (rel)  : {avg_start_time:.4f} detik")
-    print(f"Average Execution Time    : {avg_exec_time:.4f} detik")
-    print(f"Average Finish Time (rel) : {avg_finish_time:.4f} detik")
-    print(f"Imbalance Degree          : {imbalance_degree:.4f}")
-    print(f"Resource Utilization (CPU): {resource_utilization:.4%}")
+    print(f"Total Tugas Selesai       : {result['Total Tugas Selesai']}")
+    print(f"Makespan (Waktu Total)    : {result['Makespan (Waktu Total)']:.4f} detik")
+    print(f"Throughput                : {result['Throughput']:.4f} tugas/detik")
+    print(f"Total CPU Time            : {result['Total CPU Time']:.4f} detik")
+    print(f"Total Wait Time           : {result['Total Wait Time']:.4f} detik")
+    print(f"Average Start Time (rel)  : {result['Average Start Time (rel)']:.4f} detik")
+    print(f"Average Execution Time    : {result['Average Execution Time']:.4f} detik")
+    print(f"Average Finish Time (rel) : {result['Average Finish Time (rel)']:.4f} detik")
+    print(f"Imbalance Degree          : {result['Imbalance Degree']:.4f}")
+    print(f"Resource Utilization (CPU): {result['Resource Utilization (CPU)'] / 100:.4%}")
+    print(f"Execution Time p50/p95/p99: {result['Execution Time p50']:.4f} / {result['Execution Time p95']:.4f} / "
+          f"{result['Execution Time p99']:.4f} detik")
+    print(f"Wait Time p50/p95/p99     : {result['Wait Time p50']:.4f} / {result['Wait Time p95']:.4f} / "
+          f"{result['Wait Time p99']:.4f} detik")
 
-async def main():
+async def main(args):
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     print(f"--- Memulai Uji Coba: {run_id} ---")
 
     vms = [VM(name, spec['ip'], spec['cpu_cores'], spec['ram_gb']) for name, spec in VM_SPECS.items()]
     tasks = load_tasks(DATASET_FILE)
-    if not tasks: return
+    if len(tasks) == 0: return
 
     scheduler = SchedulerAlgorithm(vms)
     best_assignment = scheduler.schedule_erwca(tasks, k_best=2)
 
-    tasks_dict = {task.id: task for task in tasks}
-    vms_dict = {vm.name: vm for vm in vms}
-
-    results_list = []
-    vm_semaphores = {vm.name: asyncio.Semaphore(vm.cpu_cores) for vm in vms}
+    results_list = StreamingResults(RunMetrics(vms, len(tasks)))
+    # Batas konkurensi per VM: tetap cpu_cores, atau diatur dari telemetri /load dengan --load-interval > 0
+    # (lihat load_monitor.py).
+    adaptive = args.load_interval > 0
+    vm_semaphores = {vm.name: AdaptiveLimiter(vm.cpu_cores) if adaptive else asyncio.Semaphore(vm.cpu_cores) for vm in vms}
     async with httpx.AsyncClient() as client:
-        coroutines = [execute_task_on_vm(tasks_dict[task_id], vms_dict[vm_name], client, vm_semaphores[vm_name], results_list)
-                      for task_id, vm_name in best_assignment.items()]
+        monitor = LoadMonitor(vms, client, vm_semaphores, VM_PORT, args.load_interval) if adaptive else None
+        poll_task = asyncio.create_task(monitor.run()) if adaptive else None
+        coroutines = [execute_task_on_vm(tasks[pos], vms[vm_index], client, vm_semaphores[vms[vm_index].name], results_list)
+                      for pos, vm_index in enumerate(best_assignment.vm_indices.tolist())]
         
         print(f"\nMemulai eksekusi {len(coroutines)} tugas secara paralel...")
         schedule_start_time = time.monotonic()
@@ -167,9 +155,21 @@ async def main():
         total_schedule_time = time.monotonic() - schedule_start_time
         
         print(f"\nSemua eksekusi tugas selesai dalam {total_schedule_time:.4f} detik.")
+        if adaptive:
+            poll_task.cancel(); print(monitor.summary())
     
+    # Setiap run menjadi satu chunk di results store (lihat results_store.py).
+    store = ResultsStore()
+    # Baris yang sama juga ditulis ke all_runs_erwca.csv dan dibaca cost model dari sana; source
+    # menandai chunk ini agar tidak dipelajari dua kali.
+    store.append_run(results_list, run_id, 'erwca', DATASET_FILE, tasks, total_schedule_time,
+                     source="scheduler:all_runs_erwca.csv")
+    print(f"\nData hasil eksekusi ditambahkan ke {store.root}/")
     write_results_to_csv(results_list, run_id)
     calculate_and_print_metrics(results_list, vms, total_schedule_time, run_id)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Jalankan ErWCA pada dataset.txt ke VM di .env")
+    parser.add_argument('--load-interval', type=float, default=0.0,
+                        help="Interval (detik) poll /load untuk batas konkurensi adaptif per VM; 0 (default) = tetap cpu_cores.")
+    asyncio.run(main(parser.parse_args()))
\ No newline at end of file
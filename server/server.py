@@ -1,44 +1,344 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify, request, stream_with_context
+import json
+import statistics
+import queue
 import time
 import os
+import threading
+import multiprocessing
+import numpy as np
 from numpy.linalg import det
 from numpy.random import rand
 from datetime import date, datetime
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 app = Flask(__name__)
 
 CPU_CORES = os.cpu_count() or 1
+# Batas admission dalam potongan task: setiap request dibagi menjadi CPU_CORES potongan ke pool,
+# sehingga batas default CPU_CORES potongan = satu request berjalan dan pool tidak pernah diantrekan
+# lebih dari kapasitasnya. ADMISSION_QUEUE_SIZE: panjang maksimum antrean (request) sebelum 503.
+ADMISSION_LIMIT = int(os.getenv("ADMISSION_LIMIT", CPU_CORES))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", 4 * CPU_CORES))
+# Generator beban: "legacy" (default) menjalankan index^2 x 10000 iterasi det(rand(40, 40));
+# "calibrated" (opt-in lewat LOAD_MODE=calibrated) membakar anggaran CPU-detik per task
+# (index^2 x TASK_UNIT_CPU_SECONDS, dibagi rata ke semua worker pool).
+# Default 0.5 CPU-detik per unit kira-kira setara biaya mode legacy pada CPU x86 modern.
+LOAD_MODE = os.getenv("LOAD_MODE", "legacy")
+TASK_UNIT_CPU_SECONDS = float(os.getenv("TASK_UNIT_CPU_SECONDS", 0.5))
+LOAD_UNIT = 10000
+MATRIX_SIZE = 40
+# Satu batch det bertumpuk ditargetkan ~1 ms, sehingga anggaran terlampaui paling banyak satu batch.
+BATCH_TARGET_SECONDS = 0.001
+CALIBRATION_SECONDS = float(os.getenv("CALIBRATION_SECONDS", 0.25))
+# Batas waktu menunggu semua worker hadir di barrier kalibrasi, dan jumlah percobaan kalibrasi.
+CALIBRATION_BARRIER_TIMEOUT = 30.0
+CALIBRATION_ATTEMPTS = 3
+# Bobot EWMA untuk telemetri beban (/load).
+TELEMETRY_EWMA_ALPHA = 0.2
 
+# Buffer matriks per proses worker, dialokasikan sekali oleh init_load_worker, dan barrier
+# kalibrasi milik pool (lihat calibrate_worker).
+_load_buffer = None
+_calibration_barrier = None
+
+def init_load_worker(barrier=None):
+    # Initializer proses pool: probe singkat untuk memilih ukuran batch, lalu alokasi buffer.
+    global _load_buffer, _calibration_barrier
+    _calibration_barrier = barrier
+    rng = np.random.default_rng(os.getpid())
+    probe = rng.random((16, MATRIX_SIZE, MATRIX_SIZE)); det(probe)
+    start = time.perf_counter(); rounds = 0
+    while time.perf_counter() - start < 0.02:
+        det(probe); rounds += 1
+    seconds_per_det = (time.perf_counter() - start) / (rounds * len(probe))
+    _load_buffer = rng.random((max(1, int(BATCH_TARGET_SECONDS / seconds_per_det)), MATRIX_SIZE, MATRIX_SIZE))
 
 def cpu_heavy_task(iterations: int):
+    start_time = time.time(); start_cpu = time.process_time()
     for _ in range(iterations):
         det(rand(40, 40))
-    return True
+    return start_time, time.time(), time.process_time() - start_cpu
+
+def burn_cpu_seconds(budget: float):
+    # det bertumpuk pada buffer yang sudah dialokasikan sampai CPU time proses ini mencapai anggaran.
+    start_time = time.time(); start_cpu = time.process_time(); deadline = start_cpu + budget
+    while time.process_time() < deadline:
+        det(_load_buffer)
+    return start_time, time.time(), time.process_time() - start_cpu
+
+def calibrate_worker(start_at: float):
+    # Semua worker mulai mengukur pada start_at yang sama, sehingga rasio CPU time / wall time
+    # menunjukkan berapa core yang benar-benar tersedia saat pool berjalan penuh. Barrier menahan
+    # setiap proses sampai semua worker memegang satu sampel, sehingga tidak ada proses yang
+    # mengambil dua sampel; jika barrier rusak (timeout), _calibrate memeriksa dan mengulang.
+    if _calibration_barrier is not None:
+        try:
+            _calibration_barrier.wait(CALIBRATION_BARRIER_TIMEOUT)
+        except threading.BrokenBarrierError:
+            pass
+    while time.time() < start_at:
+        time.sleep(0.001)
+    start_wall = time.perf_counter(); start_cpu = time.process_time(); batches = 0
+    while time.perf_counter() - start_wall < CALIBRATION_SECONDS:
+        det(_load_buffer); batches += 1
+    return (os.getpid(), batches * len(_load_buffer), len(_load_buffer),
+            time.process_time() - start_cpu, time.perf_counter() - start_wall)
+
+def task_chunks(cpu_load: int):
+    # Fungsi dan argumen untuk setiap potongan task (satu per worker pool).
+    if LOAD_MODE == "legacy":
+        return cpu_heavy_task, max(1, cpu_load // CPU_CORES)
+    return burn_cpu_seconds, cpu_load / LOAD_UNIT * TASK_UNIT_CPU_SECONDS / CPU_CORES
+
+class WorkerPool:
+    # Satu ProcessPoolExecutor yang hidup selama server berjalan. Semua proses worker
+    # dibuat dan numpy di-load saat startup, sehingga request tidak membayar biaya spawn.
+    def __init__(self, num_workers: int):
+        self.num_workers = num_workers
+        self._lock = threading.Lock()
+        self._executor = None
+        self._barrier = None
+        self.warm_pids = []
+        self.calibration = {}
+
+    def start(self):
+        with self._lock:
+            if self._executor is None:
+                self._barrier = multiprocessing.Barrier(self.num_workers)
+                self._executor = ProcessPoolExecutor(max_workers=self.num_workers, initializer=init_load_worker,
+                                                     initargs=(self._barrier,))
+                self.calibration = self._calibrate()
+            return self._executor
+
+    def _calibrate(self) -> dict:
+        # Throughput det per CPU-detik (median antar worker) dan kapasitas efektif = jumlah
+        # CPU-detik per detik yang dihasilkan pool saat semua worker berjalan bersamaan.
+        # Setiap worker harus menyumbang tepat satu sampel; jika satu proses mendapat dua (barrier
+        # timeout), kalibrasi diulang agar kapasitas tidak dijumlahkan atas worker yang lebih sedikit.
+        for _ in range(CALIBRATION_ATTEMPTS):
+            self._barrier.reset()
+            start_at = time.time() + 0.2 + 0.01 * self.num_workers
+            results = list(self._executor.map(calibrate_worker, [start_at] * self.num_workers))
+            samples = {pid: sample for pid, *sample in results}
+            if len(samples) == self.num_workers: break
+        self.warm_pids = sorted(samples)
+        return {
+            "mode": LOAD_MODE,
+            "workers": len(samples),
+            "complete": len(samples) == self.num_workers,
+            "capacity": round(sum(cpu / wall for _, _, cpu, wall in samples.values()), 3),
+            "dets_per_cpu_second": round(statistics.median(dets / cpu for dets, _, cpu, _ in samples.values() if cpu > 0), 1),
+            "batch_size": statistics.median(batch for _, batch, _, _ in samples.values()),
+            "matrix_size": MATRIX_SIZE,
+            "task_unit_cpu_seconds": TASK_UNIT_CPU_SECONDS,
+            "calibrated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def restart(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        return self.start()
+
+    def map(self, fn, args):
+        try:
+            return list(self.start().map(fn, args))
+        except BrokenProcessPool:
+            self.restart()
+            raise
+
+    def submit(self, fn, *args):
+        try:
+            return self.start().submit(fn, *args)
+        except BrokenProcessPool:
+            return self.restart().submit(fn, *args)
+
+def chunk_slowdown(spans: list):
+    # Wall time per CPU-detik dari potongan task yang sudah berjalan di worker: ~1.0 jika setiap
+    # worker mendapat satu CPU penuh, naik jika CPU host diperebutkan. Antrean di pool tidak ikut
+    # terhitung karena wall time dihitung sejak potongan mulai dieksekusi.
+    cpu_seconds = sum(span[2] for span in spans)
+    return sum(span[1] - span[0] for span in spans) / cpu_seconds if cpu_seconds > 0 else None
+
+def _ewma(current, value: float) -> float:
+    return value if current is None else (1 - TELEMETRY_EWMA_ALPHA) * current + TELEMETRY_EWMA_ALPHA * value
+
+class AdmissionQueue:
+    # Antrean masuk berbatas: maksimal `limit` potongan task berjalan di pool, maksimal `max_waiting`
+    # request menunggu. Request yang lebih besar dari limit tetap diterima jika pool kosong.
+    def __init__(self, limit: int, max_waiting: int):
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.in_flight = 0
+        self.in_flight_chunks = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_queue_time = 0.0
+        self.total_compute_time = 0.0
+        # EWMA waktu eksekusi dan slowdown (lihat chunk_slowdown).
+        self.exec_time_ewma = None
+        self.slowdown_ewma = None
+        self._cond = threading.Condition()
+
+    def _full(self, chunks: int) -> bool:
+        return self.in_flight_chunks > 0 and self.in_flight_chunks + chunks > self.limit
+
+    def acquire(self, chunks: int = CPU_CORES, reject_when_full: bool = True) -> bool:
+        with self._cond:
+            if reject_when_full and self._full(chunks) and self.waiting >= self.max_waiting:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            while self._full(chunks):
+                self._cond.wait()
+            self.waiting -= 1
+            self.in_flight += 1
+            self.in_flight_chunks += chunks
+            return True
+
+    def release(self, queue_time: float, compute_time: float, slowdown: float | None = None, chunks: int = CPU_CORES):
+        with self._cond:
+            self.in_flight -= 1
+            self.in_flight_chunks -= chunks
+            self.completed += 1
+            self.total_queue_time += queue_time
+            self.total_compute_time += compute_time
+            if compute_time > 0:
+                self.exec_time_ewma = _ewma(self.exec_time_ewma, compute_time)
+            if slowdown is not None:
+                self.slowdown_ewma = _ewma(self.slowdown_ewma, slowdown)
+            self._cond.notify_all()
+
+    def load(self) -> dict:
+        with self._cond:
+            return {
+                "in_flight": self.in_flight,
+                "in_flight_chunks": self.in_flight_chunks,
+                "queue_depth": self.waiting,
+                "admission_limit": self.limit,
+                "completed": self.completed,
+                "exec_time_ewma": self.exec_time_ewma,
+                "slowdown_ewma": self.slowdown_ewma,
+            }
+
+    def stats(self) -> dict:
+        with self._cond:
+            completed = self.completed
+            return {
+                "admission_limit": self.limit,
+                "max_queue_size": self.max_waiting,
+                "queue_depth": self.waiting,
+                "in_flight": self.in_flight,
+                "in_flight_chunks": self.in_flight_chunks,
+                "completed": completed,
+                "rejected": self.rejected,
+                "avg_queue_time": self.total_queue_time / completed if completed else 0.0,
+                "avg_compute_time": self.total_compute_time / completed if completed else 0.0,
+            }
+
+worker_pool = WorkerPool(CPU_CORES)
+admission = AdmissionQueue(ADMISSION_LIMIT, ADMISSION_QUEUE_SIZE)
 
 def simulate_task(cpu_load: int):
     start_time = time.time()
 
     try:
-        # --- CPU LOAD (parallelized) ---
-        per_core_load = max(1, cpu_load // CPU_CORES)
-        with ProcessPoolExecutor(max_workers=CPU_CORES) as executor:
-            executor.map(cpu_heavy_task, [per_core_load] * CPU_CORES)
+        # --- CPU LOAD (parallelized pada pool persisten) ---
+        chunk_fn, chunk_arg = task_chunks(cpu_load)
+        spans = worker_pool.map(chunk_fn, [chunk_arg] * CPU_CORES)
     except Exception as e:
         exec_time = time.time() - start_time
-        return exec_time, f"CPU Task Error: {str(e)}"
+        return exec_time, f"CPU Task Error: {str(e)}", {}, []
 
-    exec_time = time.time() - start_time
-    return exec_time, None
+    finish_time = time.time()
+    exec_time = finish_time - start_time
+    # Rincian waktu di sisi server untuk tracing di harness: pool_dispatch = sampai potongan
+    # pertama mulai di worker, compute = potongan pertama mulai s/d terakhir selesai,
+    # collect = sampai semua hasil terkumpul kembali di proses server.
+    first_start = min(span[0] for span in spans); last_finish = max(span[1] for span in spans)
+    timings = {"pool_dispatch": round(max(0.0, first_start - start_time), 6),
+               "compute": round(max(0.0, last_finish - first_start), 6),
+               "collect": round(max(0.0, finish_time - last_finish), 6)}
+    return exec_time, None, timings, spans
+
+def submit_batch_task(position: int, index: int, batch_start: float, results: queue.Queue):
+    # Menunggu slot admission, lalu membagi task ke pool. Hasil dikirim ke `results`
+    # lewat callback ketika semua potongan task selesai, sehingga slot cepat dilepas.
+    admission.acquire(reject_when_full=False)
+    admitted_time = time.time()
+    chunk_fn, chunk_arg = task_chunks(index * index * LOAD_UNIT)
+    try:
+        futures = [worker_pool.submit(chunk_fn, chunk_arg) for _ in range(CPU_CORES)]
+    except Exception as e:
+        admission.release(admitted_time - batch_start, 0.0)
+        offset = round(admitted_time - batch_start, 6)
+        results.put({"position": position, "task": f"task-{index}", "index": index, "status": False,
+                     "message": f"CPU Task Error: {str(e)}", "queue_time": offset,
+                     "start_offset": offset, "finish_offset": offset, "exec_time": -1.0})
+        return
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] > 0: return
+        record = {"position": position, "task": f"task-{index}", "index": index,
+                  "queue_time": round(admitted_time - batch_start, 6)}
+        slowdown = None
+        try:
+            spans = [future.result() for future in futures]
+            start_time = min(span[0] for span in spans); finish_time = max(span[1] for span in spans)
+            record.update(status=True, start_offset=round(start_time - batch_start, 6),
+                          finish_offset=round(finish_time - batch_start, 6),
+                          exec_time=round(finish_time - start_time, 6))
+            slowdown = chunk_slowdown(spans)
+        except Exception as e:
+            finish_time = time.time()
+            record.update(status=False, message=f"CPU Task Error: {str(e)}",
+                          start_offset=round(admitted_time - batch_start, 6),
+                          finish_offset=round(finish_time - batch_start, 6), exec_time=-1.0)
+        admission.release(admitted_time - batch_start, max(0.0, time.time() - admitted_time), slowdown)
+        results.put(record)
+
+    for future in futures:
+        future.add_done_callback(on_done)
 
 @app.route("/health", methods=["GET"])
 def health_check():
+    worker_pool.start()  # menunggu kalibrasi startup selesai
     current_date = date.today().strftime("%d-%m-%Y")
     current_time = datetime.now().strftime("%H:%M:%S")
     return jsonify({
         "status": True,
         "message": "🌟 Server is healthy!",
-        "date": f"{current_date} {current_time}"
+        "date": f"{current_date} {current_time}",
+        "calibration": worker_pool.calibration
+    }), 200
+
+@app.route("/stats", methods=["GET"])
+def stats():
+    return jsonify({
+        "status": True,
+        "cpu_cores": CPU_CORES,
+        "pool_workers": len(worker_pool.warm_pids),
+        **admission.stats()
+    }), 200
+
+@app.route("/load", methods=["GET"])
+def load():
+    # Telemetri beban yang murah untuk di-poll dispatcher: tidak menunggu pool atau antrean.
+    return jsonify({
+        "status": True,
+        "cpu_cores": CPU_CORES,
+        "capacity": worker_pool.calibration.get("capacity"),
+        "load_avg": list(os.getloadavg()),
+        "timestamp": time.time(),
+        **admission.load()
     }), 200
 
 @app.route("/task/<task_size>", methods=["GET"])
@@ -58,7 +358,20 @@ def task_simulator_router(task_size):
         }), 400
     
     cpu_load = (index * index * 10000)
-    exec_time, error_msg = simulate_task(cpu_load)
+    arrival_time = time.time()
+    if not admission.acquire():
+        return jsonify({
+            "status": False,
+            "message": "Server queue is full, try again later",
+            "task": f"task-{index}",
+            **admission.stats()
+        }), 503
+    queue_time = time.time() - arrival_time
+    exec_time = 0.0; spans = []
+    try:
+        exec_time, error_msg, timings, spans = simulate_task(cpu_load)
+    finally:
+        admission.release(queue_time, exec_time, chunk_slowdown(spans))
 
     if error_msg:
         return jsonify({
@@ -66,7 +379,8 @@ def task_simulator_router(task_size):
             "message": error_msg,
             "task": f"task-{index}",
             "requested_cpu_load": cpu_load,
-            "execution_time": f"{exec_time:.4f}s"
+            "execution_time": f"{exec_time:.4f}s",
+            "queue_time": f"{queue_time:.4f}s"
         }), 500
 
     return jsonify({
@@ -74,9 +388,53 @@ def task_simulator_router(task_size):
         "message": f"task-{index} run successfully",
         "task": f"task-{index}",
         "requested_cpu_load": cpu_load,
-        "execution_time": f"{exec_time:.4f}s"
+        "execution_time": f"{exec_time:.4f}s",
+        "queue_time": f"{queue_time:.4f}s",
+        "compute_time": f"{exec_time:.4f}s",
+        "cpu_seconds": round(sum(span[2] for span in spans), 6),
+        "timings": {"queue": round(queue_time, 6), **timings}
     }), 200
 
+@app.route("/tasks/batch", methods=["POST"])
+def batch_task_router():
+    payload = request.get_json(silent=True) or {}
+    indices = payload.get("tasks")
+    if not isinstance(indices, list) or not indices:
+        return jsonify({
+            "status": False,
+            "message": "Body must be JSON: {\"tasks\": [index, ...]}"
+        }), 400
+    if not all(isinstance(index, int) and 1 <= index <= 10 for index in indices):
+        return jsonify({
+            "status": False,
+            "message": "Index must be between 1 - 10"
+        }), 400
+
+    batch_start = time.time()
+    results = queue.Queue()
+
+    def submit_all():
+        for position, index in enumerate(indices):
+            submit_batch_task(position, index, batch_start, results)
+
+    threading.Thread(target=submit_all, daemon=True).start()
+
+    # NDJSON: satu baris per task, dikirim segera setelah task tersebut selesai.
+    def stream():
+        for _ in range(len(indices)):
+            yield json.dumps(results.get()) + "\n"
+
+    return Response(stream_with_context(stream()), mimetype="application/x-ndjson")
+
+# Pool dibuat saat modul di-load (di dalam proses worker gunicorn), bukan saat request pertama.
+# Proses anak pool yang meng-import ulang modul ini tidak boleh membuat pool sendiri. Start
+# berjalan di thread terpisah: mengirim fungsi modul ini ke pool membutuhkan import lock modul
+# yang masih dipegang selama import berlangsung; request yang datang lebih awal menunggu _lock.
+if multiprocessing.parent_process() is None:
+    threading.Thread(target=worker_pool.start, daemon=True).start()
+
 if __name__ == "__main__":
-    print(f"Server menggunakan {CPU_CORES} core CPU")
-    app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
+    worker_pool.start()
+    print(f"Server menggunakan {CPU_CORES} core CPU ({len(worker_pool.warm_pids)} worker pool siap, "
+          f"kalibrasi: {worker_pool.calibration})")
+    app.run(host="0.0.0.0", port=5000, threaded=True)
\ No newline at end of file
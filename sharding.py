@@ -0,0 +1,56 @@
+import numpy as np
+from algorithms import SearchReport
+from taskset import cpu_load_for_index
+
+# Penjadwalan hierarkis untuk armada VM besar: partisi tingkat atas membagi VM menjadi kelompok
+# (shard) dengan kapasitas (jumlah core) yang kira-kira sama, lalu membagi task ke setiap shard
+# sebanding dengan kapasitasnya, per kelas task agar histogram setiap shard mirip histogram global.
+# Setiap shard dijadwalkan dan di-dispatch secara independen (lihat test_harness.run_sharded_test).
+
+def partition_vms(vms: list, num_shards: int) -> list:
+    # LPT: VM terbesar lebih dulu ke shard dengan total core terkecil. Mengembalikan daftar indeks VM
+    # per shard (urutan asli dipertahankan); shard kosong dibuang jika VM lebih sedikit dari shard.
+    num_shards = max(1, min(num_shards, len(vms)))
+    cores = np.array([vm.cpu_cores for vm in vms], dtype=float)
+    totals = np.zeros(num_shards); members = [[] for _ in range(num_shards)]
+    for vm_index in np.argsort(-cores, kind='stable').tolist():
+        shard = int(np.argmin(totals))
+        members[shard].append(vm_index); totals[shard] += cores[vm_index]
+    return [sorted(shard) for shard in members if shard]
+
+def partition_tasks(tasks, capacities) -> list:
+    # Kuota per kelas (terbesar lebih dulu) sebanding dengan kapasitas shard; sisa pembulatan jatuh
+    # ke shard dengan defisit kerja (target - kerja terkumpul) terbesar. Di dalam satu kelas, task
+    # dibagi berurutan. Mengembalikan posisi task (terurut) per shard.
+    capacities = np.asarray(capacities, dtype=float)
+    share = capacities / capacities.sum()
+    counts = tasks.class_counts()
+    load_per_class = cpu_load_for_index(np.arange(len(counts))).astype(float)
+    work = np.zeros(len(capacities)); total_work = 0.0
+    order = np.argsort(tasks.indices, kind='stable')
+    class_starts = np.r_[0, np.cumsum(counts)]
+    positions = [[] for _ in capacities]
+    for task_class in range(len(counts) - 1, 0, -1):
+        count = int(counts[task_class])
+        if count == 0: continue
+        quotas = np.floor(count * share).astype(int)
+        total_work += count * load_per_class[task_class]
+        for _ in range(count - quotas.sum()):
+            deficit = total_work * share - (work + quotas * load_per_class[task_class])
+            quotas[int(np.argmax(deficit))] += 1
+        work += quotas * load_per_class[task_class]
+        members = order[class_starts[task_class]:class_starts[task_class + 1]]
+        for shard, chunk in enumerate(np.split(members, np.cumsum(quotas)[:-1])):
+            positions[shard].append(chunk)
+    return [np.sort(np.concatenate(chunks)) if chunks else np.zeros(0, dtype=np.int64) for chunks in positions]
+
+def merge_search(reports: list, lower_bound: float) -> SearchReport | None:
+    # Laporan solver gabungan: makespan prediksi = shard terburuk, terhadap batas bawah global;
+    # iterasi dijumlahkan dan waktu solver = shard terlama (shard berjalan paralel).
+    reports = [report for report in reports if report is not None]
+    if not reports: return None
+    makespan = max(report.makespan for report in reports)
+    return SearchReport(reports[0].algorithm, makespan, lower_bound,
+                        makespan / lower_bound - 1.0 if lower_bound > 0 else 0.0,
+                        sum(report.iterations for report in reports), max(report.elapsed for report in reports),
+                        ",".join(sorted({report.stop_reason for report in reports})))
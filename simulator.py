@@ -0,0 +1,101 @@
+import heapq
+from collections import deque
+from datetime import datetime, timedelta
+import numpy as np
+
+class CostTableDurationModel:
+    # Durasi deterministik dari tabel biaya SchedulerAlgorithms: kontribusi per slot x jumlah core.
+    def __init__(self, cost_table, vms):
+        self.durations = cost_table * np.array([vm.cpu_cores for vm in vms], dtype=float)[None, :]
+
+    def sample(self, task_classes, vm_indices):
+        return self.durations[task_classes, vm_indices]
+
+class LearnedDurationModel:
+    # Durasi acak N(mean, var) per (VM, task index) dari CostModel; sel tanpa data memakai fallback.
+    def __init__(self, cost_model, vms, fallback_table, rng=None, min_duration=0.001):
+        means, variances, counts = cost_model.exec_time_table(vms)
+        fallback = CostTableDurationModel(fallback_table, vms).durations
+        known = counts > 0
+        self.means = np.where(known, means, fallback)
+        self.stds = np.sqrt(np.where(known, variances, 0.0))
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.min_duration = min_duration
+
+    def sample(self, task_classes, vm_indices):
+        means = self.means[task_classes, vm_indices]; stds = self.stds[task_classes, vm_indices]
+        return np.maximum(self.min_duration, self.rng.normal(means, stds))
+
+class StaticQueues:
+    # Kebijakan static: setiap VM menjalankan tugasnya sendiri dalam urutan rencana (FIFO
+    # seperti asyncio.Semaphore di execute_task_on_vm).
+    def __init__(self, assignment, num_vms):
+        self.queues = [deque() for _ in range(num_vms)]
+        for pos, vm_index in enumerate(assignment.vm_indices.tolist()):
+            self.queues[vm_index].append(pos)
+
+    def may_have_work(self, vm_index):
+        return bool(self.queues[vm_index])
+
+    def next_task(self, vm_index):
+        return self.queues[vm_index].popleft() if self.queues[vm_index] else None
+
+    def observe(self, vm_index, pos, record):
+        pass
+
+    # Slot static tidak pernah diparkir: next_task hanya None jika antrean VM-nya sendiri kosong.
+    def park(self, vm_index, token):
+        pass
+
+    def wakeups(self):
+        return []
+
+class Simulator:
+    # Simulasi event-driven pengganti HTTP: setiap VM punya cpu_cores slot, event berupa
+    # "slot bebas" pada waktu simulasi tertentu. Kebijakan (static atau WorkStealingDispatcher)
+    # menentukan task berikutnya, dan record yang dihasilkan sama dengan execute_task_on_vm.
+    # Slot yang tidak mendapat task tetapi kebijakannya masih punya antrean diparkir di kebijakan dan
+    # dijadwalkan ulang saat kebijakan membangunkannya setelah suatu penyelesaian task (seperti slot
+    # WorkStealingDispatcher yang menunggu).
+    def __init__(self, vms, duration_model):
+        self.vms = vms
+        self.duration_model = duration_model
+
+    def run(self, tasks, assignment, policy=None):
+        policy = policy if policy is not None else StaticQueues(assignment, len(self.vms))
+        num_tasks = len(tasks)
+        start = [-1.0] * num_tasks; finish = [-1.0] * num_tasks; ran_on = [-1] * num_tasks
+        # Durasi untuk VM rencana di-sample sekaligus; task yang dicuri di-sample saat itu juga.
+        planned = self.duration_model.sample(tasks.indices, assignment.vm_indices).tolist()
+        planned_vm = assignment.vm_indices.tolist()
+        events = [(0.0, vm_index, slot) for vm_index, vm in enumerate(self.vms) for slot in range(vm.cpu_cores)]
+        heapq.heapify(events)
+        running = {}
+        while events:
+            now, vm_index, slot = heapq.heappop(events)
+            finished = running.pop((vm_index, slot), None)
+            if finished is not None:
+                policy.observe(vm_index, finished, {"exec_time": finish[finished] - start[finished]})
+                for parked in policy.wakeups(): heapq.heappush(events, (now, *parked))
+            pos = policy.next_task(vm_index)
+            if pos is None:
+                if policy.may_have_work(vm_index): policy.park(vm_index, (vm_index, slot))
+                continue
+            if vm_index == planned_vm[pos]:
+                duration = planned[pos]
+            else:
+                duration = float(self.duration_model.sample(tasks.indices[pos:pos + 1], np.array([vm_index]))[0])
+            start[pos] = now; finish[pos] = now + duration; ran_on[pos] = vm_index
+            running[(vm_index, slot)] = pos
+            heapq.heappush(events, (now + duration, vm_index, slot))
+        makespan = max(finish) if num_tasks else 0.0
+        return self._records(tasks, start, finish, ran_on), makespan
+
+    def _records(self, tasks, start, finish, ran_on):
+        base = datetime.now()
+        vm_names = [vm.name for vm in self.vms]
+        return [{"task_id": task_id, "vm_assigned": vm_names[vm_index],
+                 "start_time": base + timedelta(seconds=task_start), "exec_time": task_finish - task_start,
+                 "finish_time": base + timedelta(seconds=task_finish), "wait_time": task_start}
+                for task_id, vm_index, task_start, task_finish
+                in zip(tasks.ids.tolist(), ran_on, start, finish)]
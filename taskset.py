@@ -0,0 +1,168 @@
+import numpy as np
+from collections import namedtuple
+
+Task = namedtuple('Task', ['id', 'name', 'index', 'cpu_load'])
+
+DATASET_FILES = {'simple': 'dataset_random_simple.txt', 'stratified': 'dataset_random_stratified.txt',
+                 'lowhigh': 'dataset_low_high.txt'}
+# Ukuran buffer baca dataset (byte) dan jumlah task valid per jendela pada mode streaming.
+READ_BUFFER_SIZE = 1 << 20
+DEFAULT_WINDOW_SIZE = 10000
+
+def cpu_load_for_index(index):
+    return (index ** 2) * 10000
+
+class TaskSet:
+    # Representasi kolomnar daftar tugas: id, index (1-10) dan cpu_load sebagai array NumPy.
+    # Objek Task hanya dibuat saat dibutuhkan (mis. ketika dispatch).
+    def __init__(self, ids, indices):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int8)
+        self.cpu_loads = cpu_load_for_index(self.indices.astype(np.int32))
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        if isinstance(tasks, TaskSet): return tasks
+        return cls([task.id for task in tasks], [task.index for task in tasks])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, position):
+        task_id = int(self.ids[position]); index = int(self.indices[position])
+        return Task(id=task_id, name=f"task-{index}-{task_id}", index=index, cpu_load=int(self.cpu_loads[position]))
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def take(self, positions):
+        return TaskSet(self.ids[positions], self.indices[positions])
+
+    def class_counts(self):
+        # Histogram jumlah tugas per index (0-10); indeks 0 selalu kosong.
+        return np.bincount(self.indices, minlength=11)
+
+    def class_runs(self):
+        # Run-length encoding urutan index: (index, panjang run) untuk blok task yang berurutan.
+        if len(self) == 0: return np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int64)
+        starts = np.flatnonzero(np.r_[True, self.indices[1:] != self.indices[:-1]])
+        return self.indices[starts], np.diff(np.r_[starts, len(self)])
+
+class Assignment:
+    # Hasil penjadwalan: indeks VM (int) untuk setiap posisi task di TaskSet.
+    def __init__(self, tasks: TaskSet, vm_indices, vms):
+        self.tasks = tasks
+        self.vm_indices = np.asarray(vm_indices, dtype=np.int32)
+        self.vms = vms
+        # Laporan solver (algorithms.SearchReport), diisi oleh SchedulerAlgorithms.
+        self.search = None
+
+    @classmethod
+    def from_dict(cls, mapping: dict, tasks, vms):
+        tasks = TaskSet.from_tasks(tasks)
+        vm_map = {vm.name: i for i, vm in enumerate(vms)}
+        return cls(tasks, [vm_map[mapping[task_id]] for task_id in tasks.ids.tolist()], vms)
+
+    def to_dict(self):
+        return {task_id: self.vms[vm_index].name
+                for task_id, vm_index in zip(self.tasks.ids.tolist(), self.vm_indices.tolist())}
+
+    def __len__(self):
+        return len(self.vm_indices)
+
+    def vm_loads(self, cost_table):
+        costs = cost_table[self.tasks.indices, self.vm_indices]
+        return np.bincount(self.vm_indices, weights=costs, minlength=len(self.vms))
+
+    def makespan(self, cost_table):
+        return float(self.vm_loads(cost_table).max()) if len(self) else 0.0
+
+
+def parse_task_lines(block: bytes, first_line: int):
+    # Parsing vektor satu blok baris utuh: baris yang bukan bilangan bulat atau di luar 1-10
+    # dilewati. Mengembalikan (ids, indices, jumlah baris); id = nomor baris di file.
+    buf = np.frombuffer(block, dtype=np.uint8)
+    is_digit = (buf >= ord('0')) & (buf <= ord('9'))
+    # Jalur cepat hanya jika setiap '\r' adalah akhir baris (diikuti '\n' atau akhir blok).
+    is_cr = buf == ord('\r')
+    stray_cr = is_cr[:-1] & (buf[1:] != ord('\n'))
+    if np.all(is_digit | (buf == ord('\n')) | is_cr) and not stray_cr.any():
+        return _parse_digit_lines(buf, first_line)
+    digits = np.char.strip(np.array(block.split(b'\n'), dtype=bytes))
+    # Paling banyak satu tanda '+' di depan, seperti int(); "++5" tetap tidak valid. Byte pertama
+    # baris bertanda digeser keluar langsung pada buffer array (tanpa loop per baris).
+    signed = np.char.startswith(digits, b'+')
+    if signed.any():
+        raw = digits.view(np.uint8).reshape(len(digits), digits.itemsize)
+        raw[signed, :-1] = raw[signed, 1:]; raw[signed, -1] = 0
+    valid = (np.char.str_len(digits) > 0) & np.char.isdigit(digits)
+    # Hanya nilai dengan paling banyak 2 digit signifikan yang dikonversi; bilangan yang lebih
+    # panjang pasti di luar 1-10 (dan bisa melebihi int64), jadi dibiarkan 0 lalu dilewati.
+    significant = np.char.lstrip(digits, b'0')
+    lengths = np.char.str_len(significant)
+    small = valid & (lengths > 0) & (lengths <= 2)
+    values = np.zeros(len(digits), dtype=np.int64)
+    values[small] = significant[small].astype(np.int64)
+    valid &= (values >= 1) & (values <= 10)
+    positions = np.flatnonzero(valid)
+    return positions + first_line, values[positions], len(digits)
+
+def _parse_digit_lines(buf, first_line: int):
+    # Jalur cepat untuk blok yang hanya berisi digit dan akhir baris: nilai 1-2 digit dihitung
+    # langsung dari byte; baris lebih panjang (mis. nol di depan) di-parse satu per satu, dan
+    # yang masih lebih dari 2 digit setelah nol di depan dibuang dianggap di luar rentang.
+    ends = np.r_[np.flatnonzero(buf == ord('\n')), len(buf)]
+    starts = np.r_[0, ends[:-1] + 1]
+    has_cr = np.zeros(len(ends), dtype=bool)
+    nonempty = ends > starts
+    has_cr[nonempty] = buf[ends[nonempty] - 1] == ord('\r')
+    lengths = ends - starts - has_cr
+    digits = buf.astype(np.int64) - ord('0')
+    values = np.zeros(len(ends), dtype=np.int64)
+    one = lengths == 1; two = lengths == 2
+    values[one] = digits[starts[one]]
+    values[two] = digits[starts[two]] * 10 + digits[starts[two] + 1]
+    for line in np.flatnonzero(lengths > 2).tolist():
+        significant = buf[starts[line]:starts[line] + lengths[line]].tobytes().lstrip(b'0')
+        if len(significant) <= 2: values[line] = int(significant or b'0')
+    positions = np.flatnonzero((values >= 1) & (values <= 10))
+    return positions + first_line, values[positions], len(ends)
+
+def iter_task_chunks(path: str, buffer_size: int = READ_BUFFER_SIZE):
+    # Membaca file per blok buffer_size byte; sisa baris yang terpotong dibawa ke blok berikutnya.
+    first_line = 0; carry = b''
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(buffer_size)
+            if not data:
+                if carry:
+                    ids, indices, _ = parse_task_lines(carry, first_line)
+                    if len(ids): yield TaskSet(ids, indices)
+                return
+            data = carry + data
+            cut = data.rfind(b'\n')
+            if cut < 0:
+                carry = data; continue
+            carry = data[cut + 1:]
+            ids, indices, num_lines = parse_task_lines(data[:cut], first_line)
+            first_line += num_lines
+            if len(ids): yield TaskSet(ids, indices)
+
+def iter_task_windows(path: str, window_size: int = DEFAULT_WINDOW_SIZE, buffer_size: int = READ_BUFFER_SIZE):
+    # Mengelompokkan hasil iter_task_chunks menjadi jendela berisi tepat window_size task
+    # (kecuali jendela terakhir), terlepas dari ukuran blok baca.
+    pending_ids = []; pending_indices = []; pending = 0
+    for chunk in iter_task_chunks(path, buffer_size):
+        pending_ids.append(chunk.ids); pending_indices.append(chunk.indices); pending += len(chunk)
+        while pending >= window_size:
+            ids = np.concatenate(pending_ids); indices = np.concatenate(pending_indices)
+            yield TaskSet(ids[:window_size], indices[:window_size])
+            pending_ids = [ids[window_size:]]; pending_indices = [indices[window_size:]]; pending -= window_size
+    if pending:
+        yield TaskSet(np.concatenate(pending_ids), np.concatenate(pending_indices))
+
+def concat_tasksets(tasksets) -> TaskSet:
+    tasksets = list(tasksets)
+    if not tasksets: return TaskSet([], [])
+    return TaskSet(np.concatenate([t.ids for t in tasksets]), np.concatenate([t.indices for t in tasksets]))
@@ -1,16 +1,30 @@
 import asyncio
 import httpx
 import time
-from datetime import datetime
+import json
+from datetime import datetime, timedelta
 import csv
-import pandas as pd
 import sys
 import os
 import argparse
+import contextlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dotenv import load_dotenv
 from collections import namedtuple
 import numpy as np
-from algorithms import SchedulerAlgorithms
+from algorithms import SchedulerAlgorithms, WindowedScheduler, DEFAULT_GAP_TOLERANCE
+from taskset import DATASET_FILES, Task, TaskSet, Assignment, iter_task_chunks, iter_task_windows, concat_tasksets
+from cost_model import CostModel, HISTORY_FILES
+from dispatcher import WorkStealingDispatcher
+from simulator import Simulator, CostTableDurationModel, LearnedDurationModel
+from results_store import ResultsStore
+from metrics import RunMetrics, StreamingResults, MetricsSummary
+from tracing import tracer
+from load_monitor import AdaptiveLimiter, LoadMonitor
+from hedging import HedgedExecutor
+from plan_cache import PlanCache, plan_key
+from sharding import partition_vms, partition_tasks, merge_search
 
 # --- Konfigurasi (Tidak ada perubahan) ---
 load_dotenv()
@@ -18,47 +32,135 @@ VM_SPECS = {
     'vm1': {'ip': os.getenv("VM1_IP"), 'cpu': 1}, 'vm2': {'ip': os.getenv("VM2_IP"), 'cpu': 2},
     'vm3': {'ip': os.getenv("VM3_IP"), 'cpu': 4}, 'vm4': {'ip': os.getenv("VM4_IP"), 'cpu': 8},
 }
+# VM tambahan untuk armada besar: VM5_IP/VM5_CPU, VM6_IP/VM6_CPU, ... selama VM<i>_IP diatur.
+for i in itertools.count(len(VM_SPECS) + 1):
+    if not os.getenv(f"VM{i}_IP"): break
+    VM_SPECS[f'vm{i}'] = {'ip': os.getenv(f"VM{i}_IP"), 'cpu': int(os.getenv(f"VM{i}_CPU", "1"))}
 VM_PORT = 5000
 RESULTS_FILE = "all_runs_results.csv"
 
 VM = namedtuple('VM', ['name', 'ip', 'cpu_cores'])
-Task = namedtuple('Task', ['id', 'name', 'index', 'cpu_load'])
+# Hasil satu shard pada mode hierarkis; finished_at = waktu wall (time.time) saat dispatch shard selesai.
+ShardOutcome = namedtuple('ShardOutcome', ['records', 'makespan', 'search', 'metrics', 'finished_at'])
+# Opsi eksekusi satu uji coba (lihat argumen CLI di bawah).
+RunConfig = namedtuple('RunConfig', ['erwca_params', 'batch_size', 'dispatch', 'use_cost_model', 'backend', 'sim_model',
+                                     'write_csv', 'progress_interval', 'stream_window', 'seed', 'k_best', 'shc_iterations',
+                                     'trace', 'calibrated_capacity', 'load_interval', 'hedge_percentile', 'max_retries',
+                                     'time_budget', 'gap_tolerance', 'plan_cache', 'warm_start', 'shards', 'shc_batch_size'],
+                       defaults=[None, 1, 'static', False, 'http', 'analytic', False, 5.0, 0, None, 2, 500, None, False, 0.0,
+                                 0.0, 0, None, DEFAULT_GAP_TOLERANCE, False, False, 0, 1])
 
-# --- (Fungsi load_tasks dan execute_task_on_vm tidak berubah) ---
-def load_tasks(dataset_path: str) -> list[Task]:
+# --- load_tasks dan execute_task_on_vm ---
+def load_tasks(dataset_path: str) -> TaskSet:
     if not os.path.exists(dataset_path):
         print(f"Error: File dataset '{dataset_path}' tidak ditemukan.", file=sys.stderr); sys.exit(1)
-    tasks = [];
-    with open(dataset_path, 'r') as f:
-        for i, line in enumerate(f):
-            try:
-                index = int(line.strip());
-                if not 1 <= index <= 10: continue
-                cpu_load = (index ** 2) * 10000
-                tasks.append(Task(id=i, name=f"task-{index}-{i}", index=index, cpu_load=cpu_load))
-            except ValueError: continue
+    # Parsing vektor per blok buffer (lihat taskset.iter_task_chunks); id task = nomor baris.
+    tasks = concat_tasksets(iter_task_chunks(dataset_path))
     print(f"Berhasil memuat {len(tasks)} tugas dari {dataset_path}"); return tasks
 
-async def execute_task_on_vm(task: Task, vm: VM, client: httpx.AsyncClient, 
-                            vm_semaphore: asyncio.Semaphore, results_list: list):
+async def attempt_task_on_vm(task: Task, vm: VM, client: httpx.AsyncClient, vm_semaphore: asyncio.Semaphore,
+                             started: asyncio.Event | None = None) -> dict:
+    # Satu request untuk satu task; record dikembalikan tanpa disimpan (lihat execute_task_on_vm).
     url = f"http://{vm.ip}:{VM_PORT}/task/{task.index}"; task_start_time = None; task_finish_time = None
     task_exec_time = -1.0; task_wait_time = -1.0; wait_start_mono = time.monotonic()
+    span = tracer.begin(f"task-{task.index}", vm.name, "dispatch", task_id=task.id)
+    wait_span = tracer.begin("semaphore_wait", vm.name, parent=span); http_span = None
     try:
         async with vm_semaphore:
-            task_wait_time = time.monotonic() - wait_start_mono
+            task_wait_time = time.monotonic() - wait_start_mono; tracer.end(wait_span)
+            if started is not None: started.set()
             print(f"  > Mengeksekusi task-{task.index} di {vm.name}...")
             task_start_mono = time.monotonic(); task_start_time = datetime.now()
-            response = await client.get(url, timeout=300.0); response.raise_for_status()
+            http_span = tracer.begin("http_request", vm.name, parent=span)
+            response = await client.get(url, timeout=300.0); tracer.end(http_span, status=response.status_code)
+            response.raise_for_status()
             task_finish_time = datetime.now(); task_exec_time = time.monotonic() - task_start_mono
+            if http_span is not None: tracer.add_server_timings(http_span, response.json().get("timings"))
     except Exception as e:
         print(f"  !! Error pada task-{task.index} di {vm.name}: {e}", file=sys.stderr)
     finally:
+        tracer.end(wait_span); tracer.end(http_span); tracer.end(span, ok=task_exec_time > 0)
         if task_start_time is None: task_start_time = datetime.now()
         if task_finish_time is None: task_finish_time = datetime.now()
-        results_list.append({"task_id": task.id, "vm_assigned": vm.name, "start_time": task_start_time, 
-                             "exec_time": task_exec_time, "finish_time": task_finish_time, "wait_time": task_wait_time})
+    return {"task_id": task.id, "vm_assigned": vm.name, "start_time": task_start_time,
+            "exec_time": task_exec_time, "finish_time": task_finish_time, "wait_time": task_wait_time}
+
+async def execute_task_on_vm(task: Task, vm: VM, client: httpx.AsyncClient, 
+                            vm_semaphore: asyncio.Semaphore, results_list: list, queued: float = 0.0):
+    # queued: waktu task menunggu di antrean dispatcher sebelum diambil (mode dynamic), ditambahkan
+    # ke wait_time agar sama artinya dengan mode static (sejak dispatch dimulai).
+    record = await attempt_task_on_vm(task, vm, client, vm_semaphore)
+    if record['wait_time'] >= 0: record['wait_time'] += queued
+    results_list.append(record)
+    return record
+
+# --- Mode batch: satu request /tasks/batch untuk beberapa task di VM yang sama ---
+async def execute_batch_on_vm(batch: list[Task], vm: VM, client: httpx.AsyncClient,
+                              vm_semaphore: asyncio.Semaphore, results_list: list):
+    url = f"http://{vm.ip}:{VM_PORT}/tasks/batch"; wait_start_mono = time.monotonic()
+    finished = set(); batch_wait_time = -1.0
+    span = tracer.begin(f"batch-{len(batch)}", vm.name, "dispatch", tasks=len(batch))
+    wait_span = tracer.begin("semaphore_wait", vm.name, parent=span)
+    try:
+        async with vm_semaphore:
+            batch_wait_time = time.monotonic() - wait_start_mono; tracer.end(wait_span)
+            print(f"  > Mengeksekusi batch {len(batch)} task di {vm.name}...")
+            sent_time = datetime.now(); sent_perf = tracer.now()
+            async with client.stream("POST", url, json={"tasks": [t.index for t in batch]}, timeout=300.0) as response:
+                response.raise_for_status()
+                # Server mengirim satu baris NDJSON per task segera setelah task selesai.
+                async for line in response.aiter_lines():
+                    if not line.strip(): continue
+                    record = json.loads(line); task = batch[record['position']]
+                    if not record['status']:
+                        print(f"  !! Error pada task-{task.index} di {vm.name}: {record.get('message')}", file=sys.stderr)
+                    finished.add(record['position'])
+                    # Task di dalam batch berjalan paralel di server: dicatat sebagai span akar terpisah
+                    # (offset relatif terhadap waktu kirim) agar mendapat slot sendiri di timeline.
+                    tracer.add_span(f"task-{task.index}", vm.name, sent_perf + record['start_offset'],
+                                    sent_perf + record['finish_offset'], "server", task_id=task.id,
+                                    queue_time=record['queue_time'])
+                    results_list.append({"task_id": task.id, "vm_assigned": vm.name,
+                                         "start_time": sent_time + timedelta(seconds=record['start_offset']),
+                                         "exec_time": record['exec_time'] if record['status'] else -1.0,
+                                         "finish_time": sent_time + timedelta(seconds=record['finish_offset']),
+                                         "wait_time": batch_wait_time + record['queue_time']})
+    except Exception as e:
+        print(f"  !! Error pada batch di {vm.name}: {e}", file=sys.stderr)
+    finally:
+        tracer.end(wait_span); tracer.end(span, completed=len(finished))
+        now = datetime.now()
+        for position, task in enumerate(batch):
+            if position in finished: continue
+            results_list.append({"task_id": task.id, "vm_assigned": vm.name, "start_time": now,
+                                 "exec_time": -1.0, "finish_time": now, "wait_time": batch_wait_time})
+
+def probe_vm_capacity(vms: list[VM]) -> list[VM]:
+    # Kapasitas terukur tiap VM dari kalibrasi startup server (/health): jumlah CPU-detik per detik
+    # yang dihasilkan worker pool. VM yang tidak merespons tetap memakai jumlah core di VM_SPECS.
+    calibrated = []
+    for vm in vms:
+        try:
+            calibration = httpx.get(f"http://{vm.ip}:{VM_PORT}/health", timeout=30.0).json().get("calibration") or {}
+            cores = max(1, round(calibration["capacity"]))
+            print(f"Kapasitas {vm.name}: {calibration['capacity']} (mode {calibration.get('mode')}, "
+                  f"dikonfigurasi {vm.cpu_cores} core) -> {cores}")
+            calibrated.append(vm._replace(cpu_cores=cores))
+        except Exception as e:
+            print(f"  !! Gagal membaca kalibrasi {vm.name}: {e}; memakai {vm.cpu_cores} core", file=sys.stderr)
+            calibrated.append(vm)
+    return calibrated
 
-# --- (Fungsi append_results_to_csv tidak berubah) ---
+def make_batches(tasks: TaskSet, assignment, vms: list, batch_size: int):
+    # Mengelompokkan task per VM (urutan penugasan dipertahankan) lalu memotongnya per batch_size.
+    batches = []
+    for vm_index, vm in enumerate(vms):
+        positions = np.flatnonzero(assignment.vm_indices == vm_index).tolist()
+        for i in range(0, len(positions), batch_size):
+            batches.append((vm, [tasks[pos] for pos in positions[i:i + batch_size]]))
+    return batches
+
+# --- Format lama (CSV), hanya ditulis dengan --csv; hasil utama disimpan di ResultsStore ---
 def append_results_to_csv(results_list: list, run_id: int, algorithm: str, dataset: str):
     if not results_list: return
     file_exists = os.path.exists(RESULTS_FILE)
@@ -79,45 +181,16 @@ def append_results_to_csv(results_list: list, run_id: int, algorithm: str, datas
         if not file_exists: writer.writeheader()
         writer.writerows(formatted_results)
 
-# --- FUNGSI BARU: Menghitung metrik untuk satu kali run ---
+# --- Metrik satu run: dibaca dari RunMetrics yang diperbarui setiap record tiba ---
 def calculate_run_metrics(results_list: list, vms: list[VM], total_schedule_time: float):
-    df = pd.DataFrame(results_list); success_df = df[df['exec_time'] > 0].copy()
-    if success_df.empty: return None
-    
-    num_tasks = len(success_df)
-    makespan = total_schedule_time
-    throughput = num_tasks / makespan if makespan > 0 else 0
-    total_cpu_time = success_df['exec_time'].sum()
-    total_wait_time = success_df['wait_time'].sum()
-    avg_exec_time = success_df['exec_time'].mean()
-    
-    min_start = success_df['start_time'].min()
-    success_df['rel_start_time'] = (success_df['start_time'] - min_start).dt.total_seconds()
-    success_df['rel_finish_time'] = (success_df['finish_time'] - min_start).dt.total_seconds()
-    avg_start_time = success_df['rel_start_time'].mean()
-    avg_finish_time = success_df['rel_finish_time'].mean()
-    
-    vm_exec_times = success_df.groupby('vm_assigned')['exec_time'].sum()
-    imbalance_degree = (vm_exec_times.max() - vm_exec_times.min()) / vm_exec_times.mean() if vm_exec_times.mean() > 0 else 0
-    
-    total_cores = sum(vm.cpu_cores for vm in vms)
-    total_available_cpu_time = makespan * total_cores
-    resource_utilization = total_cpu_time / total_available_cpu_time if total_available_cpu_time > 0 else 0
+    metrics = getattr(results_list, 'metrics', None)
+    if metrics is None: metrics = StreamingResults(RunMetrics(vms), results_list).metrics
+    return metrics.result(total_schedule_time)
 
-    return {
-        "Total Tugas Selesai": num_tasks, "Makespan (Waktu Total)": makespan,
-        "Throughput": throughput, "Total CPU Time": total_cpu_time,
-        "Total Wait Time": total_wait_time, "Average Start Time (rel)": avg_start_time,
-        "Average Execution Time": avg_exec_time, "Average Finish Time (rel)": avg_finish_time,
-        "Imbalance Degree": imbalance_degree, "Resource Utilization (CPU)": resource_utilization * 100
-    }
-
-# --- FUNGSI BARU: Menampilkan rangkuman akhir ---
-def print_final_summary(run_metrics_list: list):
-    if not run_metrics_list: return
-
-    df = pd.DataFrame(run_metrics_list)
-    avg_metrics = df.mean()
+# --- Rangkuman akhir: rata-rata antar run, persentil dari histogram gabungan semua run ---
+def print_final_summary(summary: MetricsSummary):
+    avg_metrics = summary.averages()
+    if not avg_metrics: return
 
     print("\n--- Hasil ---")
     print(f"Total Tugas Selesai       : {avg_metrics['Total Tugas Selesai']:.0f}")
@@ -130,57 +203,378 @@ def print_final_summary(run_metrics_list: list):
     print(f"Average Finish Time (rel) : {avg_metrics['Average Finish Time (rel)']:.4f} detik")
     print(f"Imbalance Degree          : {avg_metrics['Imbalance Degree']:.4f}")
     print(f"Resource Utilization (CPU): {avg_metrics['Resource Utilization (CPU)']:.4f}%")
+    print(f"Execution Time p50/p95/p99: {summary.exec_hist.percentile(50):.4f} / {summary.exec_hist.percentile(95):.4f} / "
+          f"{summary.exec_hist.percentile(99):.4f} detik")
+    print(f"Wait Time p50/p95/p99     : {summary.wait_hist.percentile(50):.4f} / {summary.wait_hist.percentile(95):.4f} / "
+          f"{summary.wait_hist.percentile(99):.4f} detik")
+    if 'Solver Gap' in avg_metrics:
+        print(f"Solver Gap                : {avg_metrics['Solver Gap']:.2%} di atas batas bawah makespan")
+    hedge_percentile = avg_metrics.get('Hedge Percentile', 0.0); max_retries = avg_metrics.get('Max Retries', 0)
+    if hedge_percentile <= 0 and max_retries <= 0:
+        print("Hedge/retry               : mati"); return
+    print(f"Hedge/retry               : aktif (persentil {hedge_percentile:g}, retry maks {max_retries:.0f})")
+    print(f"Hedge (menang/dikirim)    : {avg_metrics['Hedge Wins']:.1f} / {avg_metrics['Hedged Tasks']:.1f} per run, "
+          f"retry {avg_metrics['Retries']:.1f} per run")
+
+async def report_progress(metrics: RunMetrics, interval: float):
+    # Baris progres berkala selama run HTTP berjalan; dibatalkan setelah semua task selesai.
+    start = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        print(metrics.progress_line(time.monotonic() - start), flush=True)
+
+def report_search(search):
+    if search is None: return
+    print(f"  -> Solver {search.algorithm}: makespan prediksi {search.makespan:.4f}, batas bawah {search.lower_bound:.4f}, "
+          f"gap {search.gap:.2%} ({search.stop_reason}, {search.iterations} iterasi, {search.elapsed:.3f} s)")
 
-async def run_single_test(run_id: int, algorithm: str, dataset_path: str, vms: list, tasks: list):
-    # ... (Fungsi ini tidak berubah)
+def start_vm_limiters(vms: list, client: httpx.AsyncClient, config: RunConfig):
+    # Batas konkurensi per VM: tetap cpu_cores (load_interval 0) atau diatur LoadMonitor dari
+    # telemetri /load setiap VM. Mengembalikan (limiters, monitor, task poll).
+    if config.load_interval <= 0:
+        return {vm.name: asyncio.Semaphore(vm.cpu_cores) for vm in vms}, None, None
+    limiters = {vm.name: AdaptiveLimiter(vm.cpu_cores) for vm in vms}
+    monitor = LoadMonitor(vms, client, limiters, VM_PORT, config.load_interval)
+    return limiters, monitor, asyncio.create_task(monitor.run())
+
+def stop_vm_limiters(monitor: LoadMonitor | None, poll_task: asyncio.Task | None):
+    if poll_task is None: return
+    poll_task.cancel()
+    print(f"  -> {monitor.summary()}")
+
+def make_task_runner(vms: list, client: httpx.AsyncClient, vm_semaphores: dict, results_list: list,
+                     cost_table, config: RunConfig):
+    # Fungsi (task, vm) -> coroutine untuk dispatch per task: lewat HedgedExecutor (hedge dan
+    # percobaan ulang) atau langsung execute_task_on_vm jika keduanya dimatikan.
+    if config.hedge_percentile <= 0 and config.max_retries <= 0:
+        return lambda task, vm, queued=0.0: execute_task_on_vm(task, vm, client, vm_semaphores[vm.name], results_list, queued)
+    hedger = HedgedExecutor(vms, cost_table,
+                            lambda task, vm, started: attempt_task_on_vm(task, vm, client, vm_semaphores[vm.name], started),
+                            results_list, config.hedge_percentile, config.max_retries)
+    return hedger.execute
+
+def algorithm_params(algorithm: str, config: RunConfig) -> dict:
+    search = {'time_budget': config.time_budget, 'gap_tolerance': config.gap_tolerance}
+    if algorithm == 'shc': return {'iterations': config.shc_iterations, 'batch_size': config.shc_batch_size, **search}
+    if algorithm == 'erwca': return {'k_best': config.k_best, **(config.erwca_params or {}), **search}
+    return {}
+
+def solve_plan(scheduler: SchedulerAlgorithms, algorithm: str, tasks: TaskSet, config: RunConfig,
+               plan_cache: PlanCache | None = None) -> Assignment:
+    # Solver dengan cache rencana (opsional): hit melewati solver; pada miss dengan warm_start,
+    # rencana terbaik untuk masalah yang sama menjadi titik awal shc/erwca.
+    params = algorithm_params(algorithm, config)
+    if plan_cache is None: return scheduler.schedule(algorithm, tasks, **params)
+    key = plan_key(tasks, scheduler.vms, scheduler._class_cost_table(), algorithm, params, config.seed)
+    assignment = plan_cache.get(key, tasks, scheduler.vms)
+    if assignment is not None: return assignment
+    if config.warm_start and algorithm in ('shc', 'erwca'):
+        warm = plan_cache.warm_start(key, tasks, scheduler.vms)
+        if warm is not None: params = {**params, 'initial_assignment': warm.vm_indices}
+    assignment = scheduler.schedule(algorithm, tasks, **params)
+    plan_cache.put(key, assignment)
+    return assignment
+
+async def run_single_test(run_id: int, algorithm: str, dataset_path: str, vms: list, tasks: TaskSet,
+                          config: RunConfig = RunConfig(), cost_model: CostModel | None = None,
+                          simulator: Simulator | None = None, assignment: Assignment | None = None,
+                          client: httpx.AsyncClient | None = None, plan_cache: PlanCache | None = None):
+    # `client` opsional: connection pool milik pemanggil yang dipakai ulang lintas run.
     print(f"\n--- [UJI COBA #{run_id+1}/10] Algoritma: {algorithm.upper()}, Dataset: {dataset_path} ---")
-    scheduler = SchedulerAlgorithms(vms); assignment = None
-    if algorithm == 'rr': assignment = scheduler.schedule_round_robin(tasks)
-    elif algorithm == 'fcfs': assignment = scheduler.schedule_fcfs(tasks)
-    elif algorithm == 'shc': assignment = scheduler.schedule_stochastic_hill_climbing(tasks, iterations=500)
-    elif algorithm == 'erwca': assignment = scheduler.schedule_erwca(tasks, k_best=2)
+    scheduler = SchedulerAlgorithms(vms, cost_model, seed=config.seed)
+    if assignment is None:
+        with tracer.span("solve", algorithm=algorithm, tasks=len(tasks)):
+            assignment = solve_plan(scheduler, algorithm, tasks, config, plan_cache)
     if not assignment: return None, None
-    results_list = []; tasks_dict = {t.id: t for t in tasks}; vms_dict = {v.name: v for v in vms}
-    vm_semaphores = {vm.name: asyncio.Semaphore(vm.cpu_cores) for vm in vms}
-    async with httpx.AsyncClient() as client:
-        coroutines = [execute_task_on_vm(tasks_dict[tid], vms_dict[vname], client, vm_semaphores[vname], results_list)
-                      for tid, vname in assignment.items()]
+    report_search(assignment.search)
+    if simulator is not None:
+        # Backend simulasi: tidak ada request HTTP, waktu berasal dari model durasi.
+        policy = None
+        if config.dispatch == 'dynamic':
+            policy = WorkStealingDispatcher(tasks, assignment, vms, scheduler._class_cost_table(), None)
+        records, total_time = simulator.run(tasks, assignment, policy)
+        print(f"  -> Selesai dalam {total_time:.4f} detik simulasi (Makespan)")
+        results = StreamingResults(RunMetrics(vms, len(tasks)), records); results.search = assignment.search
+        return results, total_time
+    results_list = StreamingResults(RunMetrics(vms, len(tasks))); results_list.search = assignment.search
+    setup_span = tracer.begin("client_setup")
+    async with (contextlib.nullcontext(client) if client is not None else httpx.AsyncClient()) as client:
+        tracer.end(setup_span)
+        vm_semaphores, monitor, poll_task = start_vm_limiters(vms, client, config)
+        run_task = make_task_runner(vms, client, vm_semaphores, results_list, scheduler._class_cost_table(), config)
+        if config.dispatch == 'dynamic':
+            # Rencana algoritma hanya menjadi antrean awal; VM yang kosong mencuri task.
+            dispatcher = WorkStealingDispatcher(tasks, assignment, vms, scheduler._class_cost_table(), run_task)
+            coroutines = [dispatcher.run()]
+        elif config.batch_size > 1:
+            coroutines = [execute_batch_on_vm(batch, vm, client, vm_semaphores[vm.name], results_list)
+                          for vm, batch in make_batches(tasks, assignment, vms, config.batch_size)]
+        else:
+            coroutines = [run_task(tasks[pos], vms[vm_index]) for pos, vm_index in enumerate(assignment.vm_indices.tolist())]
+        progress = asyncio.create_task(report_progress(results_list.metrics, config.progress_interval)) \
+            if config.progress_interval > 0 else None
         start_time = time.monotonic()
-        await asyncio.gather(*coroutines)
+        with tracer.span("dispatch", tasks=len(tasks)):
+            await asyncio.gather(*coroutines)
         total_time = time.monotonic() - start_time
+        if progress is not None: progress.cancel()
+        stop_vm_limiters(monitor, poll_task)
     print(f"  -> Selesai dalam {total_time:.4f} detik (Makespan)")
     return results_list, total_time
 
-def main(algorithm: str, dataset_type: str, clean_start: bool):
-    if clean_start and os.path.exists(RESULTS_FILE):
-        print(f"Menghapus file hasil lama: {RESULTS_FILE}"); os.remove(RESULTS_FILE)
+def init_shard_worker():
+    # Initializer proses shard: proses hasil fork mewarisi tracer proses utama (aktif, berisi span
+    # yang sudah terkumpul). Trace hanya dikumpulkan di proses utama, jadi tracer di sini dimatikan.
+    tracer.reset(enabled=False)
+
+def run_shard(shard: int, algorithm: str, dataset_path: str, vms: list, tasks: TaskSet, config: RunConfig,
+              cost_model: CostModel | None):
+    # Dijalankan di proses shard: solver dan dispatch satu kelompok VM dengan event loop dan
+    # connection pool sendiri; output per task dibuang. Metrik shard ikut dikembalikan agar proses
+    # utama cukup menggabungkannya.
+    simulator = make_simulator(vms, config.sim_model, cost_model, seed=config.seed) if config.backend == 'sim' else None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        results, makespan = asyncio.run(run_single_test(shard, algorithm, dataset_path, vms, tasks, config,
+                                                        cost_model if config.use_cost_model else None, simulator))
+    if not results: return ShardOutcome([], makespan, None, None, time.time())
+    return ShardOutcome(list(results), makespan, results.search, results.metrics, time.time())
+
+def shard_config(config: RunConfig, shard: int) -> RunConfig:
+    # Seed per shard diturunkan dari seed run; trace, cache rencana dan progres hanya di proses utama.
+    seed = None if config.seed is None else int(np.random.SeedSequence([config.seed, shard]).generate_state(1)[0])
+    return config._replace(seed=seed, trace=None, plan_cache=False, warm_start=False, progress_interval=0, shards=0)
+
+def run_sharded_test(run_id: int, algorithm: str, dataset_path: str, vms: list, tasks: TaskSet, config: RunConfig,
+                     cost_model: CostModel | None, pool: ProcessPoolExecutor):
+    # Mode hierarkis: VM dibagi menjadi config.shards kelompok berkapasitas setara, task dibagi
+    # sebanding kapasitas kelompok, lalu setiap shard dijadwalkan dan di-dispatch di prosesnya sendiri.
+    # Record semua shard digabung menjadi satu hasil run.
+    groups = [[vms[i] for i in group] for group in partition_vms(vms, config.shards)]
+    print(f"\n--- [UJI COBA #{run_id+1}/10] Algoritma: {algorithm.upper()}, Dataset: {dataset_path} ({len(groups)} shard) ---")
+    with tracer.span("partition", shards=len(groups)):
+        parts = partition_tasks(tasks, [sum(vm.cpu_cores for vm in group) for group in groups])
+    futures = {}
+    for shard, (group, positions) in enumerate(zip(groups, parts)):
+        future = pool.submit(run_shard, shard, algorithm, dataset_path, group, tasks.take(positions),
+                             shard_config(config, shard), cost_model)
+        futures[future] = (shard, tracer.begin(f"shard{shard + 1}", f"shard{shard + 1}", "shard", tasks=len(positions)))
+    outcomes = [None] * len(groups)
+    for future in as_completed(futures):
+        shard, span = futures[future]; tracer.end(span)
+        outcomes[shard] = future.result()
+    for shard, (group, positions, outcome) in enumerate(zip(groups, parts, outcomes)):
+        gap = f", gap solver {outcome.search.gap:.2%}" if outcome.search is not None else ""
+        print(f"  -> Shard {shard + 1} ({', '.join(vm.name for vm in group)}): {len(positions)} task, "
+              f"makespan {outcome.makespan or 0.0:.4f} detik{gap}")
+    results = StreamingResults(RunMetrics(vms, len(tasks)))
+    for outcome in outcomes:
+        if outcome.metrics is not None: results.merge(outcome.records, outcome.metrics)
+    finished = [outcome for outcome in outcomes if outcome.makespan is not None]
+    if not results or not finished: return None, None
+    if config.backend == 'sim':
+        # Semua shard dimulai bersamaan pada waktu simulasi 0.
+        total_time = max(outcome.makespan for outcome in finished)
+    else:
+        # Gabungan jendela dispatch semua shard: awal paling dini sampai akhir paling lambat.
+        total_time = max(o.finished_at for o in finished) - min(o.finished_at - o.makespan for o in finished)
+    results.search = merge_search([outcome.search for outcome in outcomes],
+                                  SchedulerAlgorithms(vms, cost_model).makespan_lower_bound(tasks))
+    report_search(results.search)
+    print(f"  -> Selesai dalam {total_time:.4f} detik (Makespan), {len(groups)} shard")
+    return results, total_time
+
+def next_scheduled_window(windows, windowed: WindowedScheduler):
+    # Dijalankan di thread: membaca jendela berikutnya dari file lalu menjadwalkannya.
+    window = next(windows, None)
+    return None if window is None else (window, windowed.schedule(window))
+
+async def run_streaming_test(run_id: int, algorithm: str, dataset_path: str, vms: list,
+                             config: RunConfig = RunConfig(), cost_model: CostModel | None = None,
+                             simulator: Simulator | None = None):
+    # Mode streaming: dataset dibaca per jendela config.stream_window task dan setiap jendela
+    # dijadwalkan terhadap beban per VM dari jendela sebelumnya. Pada backend HTTP static,
+    # dispatch jendela dimulai selagi jendela berikutnya dibaca dan dijadwalkan di thread lain.
+    # Mengembalikan (results, makespan, tasks) karena task baru diketahui setelah file habis.
+    windowed = WindowedScheduler(SchedulerAlgorithms(vms, cost_model, seed=config.seed), algorithm, **algorithm_params(algorithm, config))
+    windows = iter_task_windows(dataset_path, config.stream_window)
+    if simulator is not None or config.dispatch == 'dynamic':
+        # Simulasi dan work stealing membutuhkan rencana lengkap: jendela digabung dulu.
+        scheduled = [(window, windowed.schedule(window)) for window in windows]
+        tasks = concat_tasksets(window for window, _ in scheduled)
+        assignment = Assignment(tasks, np.concatenate([a.vm_indices for _, a in scheduled]) if scheduled else [], vms)
+        assignment.search = windowed.last_search
+        results, total_time = await run_single_test(run_id, algorithm, dataset_path, vms, tasks, config, cost_model,
+                                                    simulator, assignment)
+        return results, total_time, tasks
+    print(f"\n--- [UJI COBA #{run_id+1}/10] Algoritma: {algorithm.upper()}, Dataset: {dataset_path} (streaming) ---")
+    results_list = StreamingResults(RunMetrics(vms, 0))
+    seen = []; pending = []
+    async with httpx.AsyncClient() as client:
+        vm_semaphores, monitor, poll_task = start_vm_limiters(vms, client, config)
+        run_task = make_task_runner(vms, client, vm_semaphores, results_list, windowed.scheduler._class_cost_table(), config)
+        progress = asyncio.create_task(report_progress(results_list.metrics, config.progress_interval)) \
+            if config.progress_interval > 0 else None
+        start_time = time.monotonic()
+        while True:
+            with tracer.span("schedule_window", window=len(seen)):
+                scheduled = await asyncio.to_thread(next_scheduled_window, windows, windowed)
+            if scheduled is None: break
+            window, assignment = scheduled
+            seen.append(window); results_list.metrics.total_tasks += len(window)
+            if config.batch_size > 1:
+                coroutines = [execute_batch_on_vm(batch, vm, client, vm_semaphores[vm.name], results_list)
+                              for vm, batch in make_batches(window, assignment, vms, config.batch_size)]
+            else:
+                coroutines = [run_task(window[pos], vms[vm_index]) for pos, vm_index in enumerate(assignment.vm_indices.tolist())]
+            pending.extend(asyncio.ensure_future(coroutine) for coroutine in coroutines)
+        with tracer.span("drain"):
+            await asyncio.gather(*pending)
+        total_time = time.monotonic() - start_time
+        if progress is not None: progress.cancel()
+        stop_vm_limiters(monitor, poll_task)
+    print(f"  -> Selesai dalam {total_time:.4f} detik (Makespan), {len(seen)} jendela")
+    report_search(windowed.last_search); results_list.search = windowed.last_search
+    return results_list, total_time, concat_tasksets(seen)
+
+def write_trace(trace_prefix: str, run_id: int, metadata: dict):
+    # Satu file Chrome trace per run (buka di ui.perfetto.dev) dan rincian waktu per jenis span.
+    path = f"{os.path.splitext(trace_prefix)[0]}_run{run_id}.json"
+    tracer.export_chrome_trace(path, metadata)
+    breakdown = ", ".join(f"{name} {total:.3f}s" for name, total in sorted(tracer.breakdown().items()))
+    print(f"  -> Trace ditulis ke {path} ({breakdown})")
+
+def make_simulator(vms: list, sim_model: str, cost_model: CostModel | None = None,
+                   store: ResultsStore | None = None, seed: int | None = None) -> Simulator:
+    cost_table = SchedulerAlgorithms(vms)._class_cost_table()
+    if sim_model == 'learned':
+        duration_model = LearnedDurationModel(cost_model or CostModel.load_or_fit(HISTORY_FILES, store=store), vms, cost_table,
+                                              rng=np.random.default_rng(seed))
+    else:
+        duration_model = CostTableDurationModel(cost_table, vms)
+    return Simulator(vms, duration_model)
+
+def main(algorithm: str, dataset_type: str, clean_start: bool, config: RunConfig = RunConfig()):
+    store = ResultsStore()
+    if clean_start:
+        if os.path.exists(RESULTS_FILE):
+            print(f"Menghapus file hasil lama: {RESULTS_FILE}"); os.remove(RESULTS_FILE)
+        if os.path.exists(store.root):
+            print(f"Menghapus results store lama: {store.root}"); store.clear()
         
-    dataset_map = {'simple': 'dataset_random_simple.txt', 'stratified': 'dataset_random_stratified.txt', 'lowhigh': 'dataset_low_high.txt'}
-    dataset_path = dataset_map.get(dataset_type)
+    dataset_path = DATASET_FILES.get(dataset_type)
     if not dataset_path:
         print(f"Error: Tipe dataset '{dataset_type}' tidak valid."); return
 
     vms = [VM(name, spec['ip'], spec['cpu']) for name, spec in VM_SPECS.items()]
-    tasks = load_tasks(dataset_path)
-    if not tasks: return
+    if config.calibrated_capacity and config.backend == 'http': vms = probe_vm_capacity(vms)
+    # Mode streaming tidak memuat dataset di depan; task dibaca per jendela di setiap run.
+    tasks = load_tasks(dataset_path) if config.stream_window <= 0 else None
+    if tasks is not None and not tasks: return
+    if config.shards > 1 and tasks is None:
+        print("Error: --shards tidak dapat digabung dengan --stream-window."); return
+
+    # Cost model dipelajari dari CSV histori dan results store, diperbarui setelah setiap run.
+    cost_model = CostModel.load_or_fit(HISTORY_FILES, store=store) if config.use_cost_model else None
+    simulator = make_simulator(vms, config.sim_model, cost_model, store, config.seed) if config.backend == 'sim' else None
 
-    run_metrics_list = []
+    # Cache rencana hanya untuk mode non-streaming (rencana per jendela bergantung pada beban sebelumnya).
+    plan_cache = PlanCache() if config.plan_cache else None
+    # Satu proses per shard, dipakai ulang oleh semua run.
+    shard_pool = ProcessPoolExecutor(max_workers=len(partition_vms(vms, config.shards)),
+                                     initializer=init_shard_worker) if config.shards > 1 else None
+    summary = MetricsSummary()
+    base_config = config
     for i in range(10):
-        results, makespan = asyncio.run(run_single_test(i, algorithm, dataset_path, vms, tasks))
+        # Dengan --seed, run ke-i memakai seed + i: setiap run berbeda tetapi dapat diulang.
+        if base_config.seed is not None: config = base_config._replace(seed=base_config.seed + i)
+        tracer.reset(enabled=config.trace is not None)
+        if config.stream_window > 0:
+            results, makespan, tasks = asyncio.run(run_streaming_test(i, algorithm, dataset_path, vms, config,
+                                                                      cost_model, simulator))
+        elif shard_pool is not None:
+            results, makespan = run_sharded_test(i, algorithm, dataset_path, vms, tasks, config, cost_model, shard_pool)
+        else:
+            results, makespan = asyncio.run(run_single_test(i, algorithm, dataset_path, vms, tasks, config,
+                                                            cost_model, simulator, plan_cache=plan_cache))
+        if config.trace is not None:
+            write_trace(config.trace, i+1, {"algorithm": algorithm, "dataset": dataset_type, "run_id": i+1,
+                                            "backend": config.backend, "dispatch": config.dispatch,
+                                            "batch_size": config.batch_size, "hedge_percentile": config.hedge_percentile,
+                                            "max_retries": config.max_retries, "makespan": makespan})
         if results:
-            append_results_to_csv(results, i+1, algorithm, dataset_type)
+            # Mode dynamic dicatat sebagai algoritma terpisah agar bisa dibandingkan dengan static.
+            algorithm_label = algorithm if config.dispatch == 'static' else f"{algorithm}+{config.dispatch}"
+            store.append_run(results, i+1, algorithm_label, dataset_type, tasks, makespan,
+                             solver=results.search._asdict() if results.search is not None else None,
+                             backend=config.backend)
+            # CSV histori hanya berisi waktu terukur: cost model membacanya tanpa penanda backend.
+            if config.write_csv and config.backend != 'sim': append_results_to_csv(results, i+1, algorithm_label, dataset_type)
+            if cost_model is not None: cost_model.refresh(HISTORY_FILES, store)
             metrics = calculate_run_metrics(results, vms, makespan)
             if metrics:
-                run_metrics_list.append(metrics)
+                if results.search is not None: metrics["Solver Gap"] = results.search.gap
+                # Konfigurasi hedge/retry ikut dicatat: hasil dengan hedging tidak sebanding dengan tanpa hedging.
+                metrics["Hedge Percentile"] = config.hedge_percentile; metrics["Max Retries"] = config.max_retries
+                summary.add(results.metrics, metrics)
     
-    if run_metrics_list:
-        print_final_summary(run_metrics_list)
+    if shard_pool is not None: shard_pool.shutdown()
+    if plan_cache is not None: print(f"Cache rencana: {plan_cache.summary()}")
+    print_final_summary(summary)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Task Scheduler Test Harness")
     parser.add_argument('algorithm', type=str, choices=['rr', 'fcfs', 'shc', 'erwca'], help="Pilih algoritma")
     parser.add_argument('dataset', type=str, choices=['simple', 'stratified', 'lowhigh'], help="Pilih tipe dataset")
     parser.add_argument('--clean', action='store_true', help="Hapus file hasil lama sebelum memulai.")
+    parser.add_argument('--population', type=int, default=30, help="Ukuran populasi ErWCA.")
+    parser.add_argument('--iterations', type=int, default=100, help="Jumlah iterasi ErWCA.")
+    parser.add_argument('--time-budget', type=float, default=None, help="Batas waktu solver SHC/ErWCA (detik).")
+    parser.add_argument('--gap-tolerance', type=float, default=DEFAULT_GAP_TOLERANCE,
+                        help="Hentikan solver SHC/ErWCA jika makespan prediksi <= batas bawah x (1 + toleransi).")
+    parser.add_argument('--batch-size', type=int, default=1, help="Kirim task per VM dalam batch ke /tasks/batch (1 = satu request per task).")
+    parser.add_argument('--shc-batch-size', type=int, default=1,
+                        help="Kandidat perpindahan SHC yang dinilai per iterasi (terbaik diterima); 1 = satu kandidat acak.")
+    parser.add_argument('--dispatch', type=str, choices=['static', 'dynamic'], default='static',
+                        help="static: jalankan rencana apa adanya; dynamic: antrean per VM dengan work stealing.")
+    parser.add_argument('--cost-model', action='store_true',
+                        help="Gunakan waktu eksekusi terukur dari CSV histori sebagai pengganti rumus analitik.")
+    parser.add_argument('--backend', type=str, choices=['http', 'sim'], default='http',
+                        help="http: kirim ke VM sungguhan; sim: simulasi event-driven tanpa jaringan.")
+    parser.add_argument('--sim-model', type=str, choices=['analytic', 'learned'], default='analytic',
+                        help="Model durasi untuk backend sim (rumus analitik atau statistik CSV histori).")
+    parser.add_argument('--csv', action='store_true', help=f"Tulis juga hasil ke {RESULTS_FILE} (format lama; diabaikan pada backend sim).")
+    parser.add_argument('--progress-interval', type=float, default=5.0,
+                        help="Interval (detik) baris progres live selama run HTTP; 0 untuk mematikan.")
+    parser.add_argument('--seed', type=int, default=None, help="Seed solver (run ke-i memakai seed + i).")
+    parser.add_argument('--stream-window', type=int, default=0,
+                        help="Baca dataset per jendela N task dan jadwalkan inkremental (0 = muat semua di depan).")
+    parser.add_argument('--calibrated-capacity', action='store_true',
+                        help="Pakai kapasitas CPU terukur dari /health setiap VM sebagai pengganti jumlah core di .env.")
+    parser.add_argument('--load-interval', type=float, default=0.0,
+                        help="Interval (detik) poll /load untuk batas konkurensi adaptif per VM; 0 (default) = tetap cpu_cores.")
+    parser.add_argument('--hedge-percentile', type=float, default=0.0,
+                        help="Kirim duplikat ke VM lain jika task berjalan melewati persentil ini dari rasio waktu terukur/prediksi "
+                             "(mis. 95); 0 (default) = mati agar perbandingan antar algoritma tidak terpengaruh.")
+    parser.add_argument('--max-retries', type=int, default=0,
+                        help="Percobaan ulang task yang gagal (backoff eksponensial); 0 (default) = mati.")
+    parser.add_argument('--plan-cache', action='store_true',
+                        help="Pakai ulang rencana dari cache (.plan_cache) untuk dataset, VM, algoritma, parameter dan seed yang sama.")
+    parser.add_argument('--warm-start', action='store_true',
+                        help="Dengan --plan-cache: mulai shc/erwca dari rencana terbaik di cache untuk masalah yang sama.")
+    parser.add_argument('--shards', type=int, default=0,
+                        help="Mode hierarkis: bagi VM dan task menjadi N shard, masing-masing dijadwalkan dan di-dispatch di proses sendiri.")
+    parser.add_argument('--trace', type=str, default=None, metavar='PREFIX',
+                        help="Rekam span per task dan tulis Chrome trace per run ke PREFIX_run<N>.json (Perfetto).")
     args = parser.parse_args()
     
-    main(args.algorithm, args.dataset, args.clean)
\ No newline at end of file
+    erwca_params = {'population_size': args.population, 'iterations': args.iterations}
+    config = RunConfig(erwca_params=erwca_params, batch_size=args.batch_size, dispatch=args.dispatch,
+                       use_cost_model=args.cost_model, backend=args.backend, sim_model=args.sim_model,
+                       write_csv=args.csv, progress_interval=args.progress_interval, stream_window=args.stream_window,
+                       seed=args.seed, trace=args.trace,
+                       calibrated_capacity=args.calibrated_capacity, load_interval=args.load_interval,
+                       hedge_percentile=args.hedge_percentile, max_retries=args.max_retries,
+                       time_budget=args.time_budget, gap_tolerance=args.gap_tolerance,
+                       plan_cache=args.plan_cache or args.warm_start, warm_start=args.warm_start, shards=args.shards,
+                       shc_batch_size=args.shc_batch_size)
+    main(args.algorithm, args.dataset, args.clean, config)
\ No newline at end of file
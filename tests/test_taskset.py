@@ -0,0 +1,23 @@
+from taskset import parse_task_lines
+
+def parse(block: bytes):
+    ids, indices, num_lines = parse_task_lines(block, 0)
+    return list(zip(ids.tolist(), indices.tolist())), num_lines
+
+def reference(block: bytes):
+    # Perilaku load_tasks versi awal: int(line.strip()), di luar 1-10 atau tidak valid dilewati.
+    parsed = []
+    for i, line in enumerate(block.split(b'\n')):
+        try:
+            index = int(line.strip())
+        except ValueError:
+            continue
+        if 1 <= index <= 10: parsed.append((i, index))
+    return parsed
+
+def test_single_plus_sign_only():
+    assert parse(b'++5\n+5\n5\n+\n+10') == ([(1, 5), (2, 5), (4, 10)], 5)
+
+def test_matches_int_parsing():
+    block = b'++5\n+5\n 7 \n-3\n00000000000000000000009\n99999999999999999999\nx\n\r5\n10\r\n11\n'
+    assert parse(block)[0] == reference(block)
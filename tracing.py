@@ -0,0 +1,122 @@
+import contextlib
+import json
+import time
+
+# Tracing berbasis span untuk satu run: fase penjadwalan, setiap dispatch task, tunggu semaphore,
+# request HTTP dan waktu di sisi server. Span diekspor ke format Chrome trace (JSON) yang bisa
+# dibuka di Perfetto / chrome://tracing; setiap lane (scheduler, vm1, vm2, ...) menjadi satu
+# "process" dan task yang berjalan bersamaan disebar ke beberapa "thread" (slot).
+# Saat tidak aktif, begin/end/add_span tidak melakukan apa-apa.
+
+SCHEDULER_LANE = "scheduler"
+
+class Span:
+    __slots__ = ("id", "parent", "name", "cat", "lane", "start", "end", "args")
+
+    def __init__(self, span_id, parent, name, cat, lane, start, end=None, args=None):
+        self.id = span_id
+        self.parent = parent
+        self.name = name
+        self.cat = cat
+        self.lane = lane
+        self.start = start
+        self.end = end
+        self.args = args or {}
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.spans = []
+
+    def reset(self, enabled: bool = True):
+        self.enabled = enabled
+        self.spans = []
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def begin(self, name: str, lane: str = SCHEDULER_LANE, cat: str = "harness", parent: Span | None = None, **args):
+        if not self.enabled: return None
+        span = Span(len(self.spans), parent.id if parent is not None else None, name, cat, lane, self.now(), args=args)
+        self.spans.append(span)
+        return span
+
+    def end(self, span: Span | None, **args):
+        # Span yang sudah ditutup diabaikan, sehingga aman dipanggil lagi di blok finally.
+        if span is None or span.end is not None: return
+        span.end = self.now(); span.args.update(args)
+
+    def add_span(self, name: str, lane: str, start: float, end: float, cat: str = "harness",
+                 parent: Span | None = None, **args):
+        # Span yang waktunya sudah diukur (mis. timing dari server), dalam detik perf_counter.
+        if not self.enabled: return None
+        span = Span(len(self.spans), parent.id if parent is not None else None, name, cat, lane, start, end, args)
+        self.spans.append(span)
+        return span
+
+    def add_server_timings(self, parent: Span | None, timings: dict):
+        # Timing dari server berupa durasi (jam server dan klien tidak sinkron). Span ditempatkan
+        # berurutan di tengah span request HTTP induknya; sisanya dianggap waktu jaringan
+        # dan dibagi rata di kedua sisi.
+        if parent is None or parent.end is None or not timings: return
+        network = max(0.0, (parent.end - parent.start) - sum(timings.values()))
+        start = parent.start + network / 2
+        for name, duration in timings.items():
+            self.add_span(f"server_{name}", parent.lane, start, start + duration, "server", parent)
+            start += duration
+
+    @contextlib.contextmanager
+    def span(self, name: str, lane: str = SCHEDULER_LANE, cat: str = "harness", parent: Span | None = None, **args):
+        span = self.begin(name, lane, cat, parent, **args)
+        try:
+            yield span
+        finally:
+            self.end(span)
+
+    def breakdown(self) -> dict:
+        # Total durasi per nama span (nama task digabung menjadi "task").
+        totals = {}
+        for span in self.spans:
+            if span.end is None: continue
+            key = "task" if span.cat == "dispatch" else span.name
+            totals[key] = totals.get(key, 0.0) + span.end - span.start
+        return totals
+
+    def _thread_ids(self) -> dict:
+        # Pembagian interval: span akar di setiap lane ditempatkan di slot pertama yang sudah
+        # kosong; span anak mewarisi slot akarnya sehingga nesting tetap valid di viewer.
+        tids = {}; slot_ends = {}
+        for span in sorted((s for s in self.spans if s.parent is None), key=lambda s: s.start):
+            ends = slot_ends.setdefault(span.lane, [])
+            end = span.end if span.end is not None else span.start
+            for slot, slot_end in enumerate(ends):
+                if slot_end <= span.start:
+                    ends[slot] = end; tids[span.id] = slot; break
+            else:
+                ends.append(end); tids[span.id] = len(ends) - 1
+        for span in self.spans:
+            if span.parent is not None: tids[span.id] = tids.get(span.parent, 0)
+        return tids
+
+    def export_chrome_trace(self, path: str, metadata: dict | None = None):
+        spans = [s for s in self.spans if s.end is not None]
+        if not spans: return
+        origin = min(s.start for s in spans)
+        lanes = [SCHEDULER_LANE] + sorted({s.lane for s in spans} - {SCHEDULER_LANE})
+        pids = {lane: i + 1 for i, lane in enumerate(lanes)}
+        tids = self._thread_ids()
+        events = []
+        for lane, pid in pids.items():
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": lane}})
+            events.append({"name": "process_sort_index", "ph": "M", "pid": pid, "args": {"sort_index": pid}})
+        for span in spans:
+            # Span anak digambar di lane akarnya.
+            lane = span.lane
+            if span.parent is not None: lane = self.spans[span.parent].lane
+            events.append({"name": span.name, "cat": span.cat, "ph": "X", "pid": pids[lane], "tid": tids[span.id],
+                           "ts": round((span.start - origin) * 1e6, 3), "dur": round((span.end - span.start) * 1e6, 3),
+                           "args": span.args})
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": metadata or {}}, f)
+
+tracer = Tracer()